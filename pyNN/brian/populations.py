@@ -26,7 +26,7 @@ class PopulationView(common.PopulationView):
         for name in names:
             value = simplify(getattr(self.brian_group, name))
             if isinstance(value, numpy.ndarray):
-                value = value[self.mask]
+                value = value[self._index_in_grandparent]
             parameter_dict[name] = value
         return ParameterSpace(parameter_dict, shape=(self.size,))
 
@@ -35,9 +35,9 @@ class PopulationView(common.PopulationView):
         parameter_space.evaluate(simplify=False)
         for name, value in parameter_space.items():
             if name == "spike_times":
-                self.brian_group._set_spike_times(value, self.mask)    
+                self.brian_group._set_spike_times(value, self._index_in_grandparent)
             else:
-                getattr(self.brian_group, name)[self.mask] = value
+                getattr(self.brian_group, name)[self._index_in_grandparent] = value
 
     def _set_initial_value_array(self, variable, initial_values):
         raise NotImplementedError
@@ -47,7 +47,7 @@ class PopulationView(common.PopulationView):
     
     @property
     def brian_group(self):
-        return self.parent.brian_group
+        return self.grandparent.brian_group
 
 
 class Population(common.Population):
@@ -57,10 +57,8 @@ class Population(common.Population):
     _assembly_class = Assembly
 
     def _create_cells(self):
-        id_range = numpy.arange(simulator.state.id_counter,
-                                simulator.state.id_counter + self.size)
-        self.all_cells = numpy.array([simulator.ID(id) for id in id_range],
-                                     dtype=simulator.ID)
+        self._all_ids = numpy.arange(simulator.state.id_counter,
+                                     simulator.state.id_counter + self.size)
         self._mask_local = numpy.ones((self.size,), bool)  # all cells are local. This doesn't seem very efficient.
         
         if isinstance(self.celltype, StandardCellType):
@@ -73,8 +71,6 @@ class Population(common.Population):
         self.brian_group = self.celltype.brian_model(self.size,
                                                      self.celltype.eqs,
                                                      **parameter_space)
-        for id in self.all_cells:
-            id.parent = self
         simulator.state.id_counter += self.size
         simulator.state.network.add(self.brian_group)
     
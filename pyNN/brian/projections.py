@@ -10,7 +10,6 @@ import brian
 from brian import uS, nA, mV, ms
 from pyNN import common
 from pyNN.standardmodels.synapses import TsodyksMarkramSynapse
-from pyNN.core import is_listlike
 from pyNN.parameters import ParameterSpace
 from pyNN.space import Space
 from . import simulator
@@ -155,44 +154,88 @@ class Projection(common.Projection):
         else:
             return 0, index
 
+    def _localize_indices(self, population, indices):
+        """
+        Vectorized version of `_localize_index()`: for each index, determine
+        the group (population of an Assembly) to which it belongs, and the
+        index within the Brian group of that population.
+        """
+        if isinstance(population, common.Assembly):
+            boundaries = numpy.cumsum([0] + [p.size for p in population.populations])
+            groups = numpy.searchsorted(boundaries, indices, side='right') - 1
+            local_indices = indices - boundaries[groups]
+            for group, p in enumerate(population.populations):
+                if isinstance(p, common.PopulationView):
+                    mask = groups == group
+                    local_indices[mask] = p.index_in_grandparent(local_indices[mask])
+        else:
+            groups = numpy.zeros(indices.shape, dtype=int)
+            if isinstance(population, common.PopulationView):
+                local_indices = population.index_in_grandparent(indices)
+            else:
+                local_indices = indices
+        return groups, local_indices
+
     def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
                             **connection_parameters):
+        self._connect_batch(presynaptic_indices,
+                            numpy.repeat(postsynaptic_index, presynaptic_indices.size),
+                            **connection_parameters)
+
+    def _connect_batch(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Create a block of connections with one `create_synapses()` call for
+        each pair of pre- and post-synaptic Brian groups, then set the synaptic
+        variables of the new synapses by array assignment.
+        """
         connection_parameters.pop("dendritic_delay_fraction", None)  # TODO: need to to handle this
-        presynaptic_index_partitions = self._partition(presynaptic_indices)
-        j_group, j = self._localize_index(postsynaptic_index)
-        # specify which connections exist
-        for i_group, i in enumerate(presynaptic_index_partitions):
-            if i.size > 0:
-                self._brian_synapses[i_group][j_group][i, j] = True
-                self._n_connections += i.size
-        # set connection parameters
-        for name, value in chain(connection_parameters.items(),
-                                 self.synapse_type.initial_conditions.items()):
-            if name == 'delay':
-                scale = self._simulator.state.dt * ms
-                value /= scale                         # ensure delays are rounded to the
-                value = numpy.round(value) * scale     # nearest time step, rather than truncated
-            for i_group, i in enumerate(presynaptic_index_partitions):
-                if i.size > 0:
-                    brian_var = getattr(self._brian_synapses[i_group][j_group], name)
-                    if is_listlike(value):
-                        for ii, v in zip(i, value):
-                            brian_var[ii, j] = v
-                    else:
-                        for ii in i:
-                            brian_var[ii, j] = value
-                    ##brian_var[i, j] = value  # doesn't work with multiple connections between a given neuron pair. Need to understand the internals of Synapses and SynapticVariable better
+        presynaptic_indices = numpy.asarray(presynaptic_indices, dtype=int)
+        postsynaptic_indices = numpy.asarray(postsynaptic_indices, dtype=int)
+        i_groups, i_local = self._localize_indices(self.pre, presynaptic_indices)
+        j_groups, j_local = self._localize_indices(self.post, postsynaptic_indices)
+        parameters = list(chain(connection_parameters.items(),
+                                self.synapse_type.initial_conditions.items()))
+        for i_group in numpy.unique(i_groups):
+            for j_group in numpy.unique(j_groups):
+                mask = (i_groups == i_group) & (j_groups == j_group)
+                n = numpy.count_nonzero(mask)
+                if n == 0:
+                    continue
+                syn_obj = self._brian_synapses[i_group][j_group]
+                # specify which connections exist. Unlike `syn_obj[i, j] = True`,
+                # which connects every i to every j, this creates one synapse
+                # per (i, j) pair, so handles multiple connections between a
+                # given neuron pair. New synapses are appended, so we can then
+                # address them by their flat synapse indices.
+                first = len(syn_obj)
+                syn_obj.create_synapses(i_local[mask], j_local[mask])
+                new_synapses = numpy.arange(first, first + n)
+                self._n_connections += n
+                # set connection parameters
+                for name, value in parameters:
+                    if isinstance(value, numpy.ndarray) and value.shape == mask.shape:
+                        value = value[mask]
+                    if name == 'delay':
+                        scale = self._simulator.state.dt * ms
+                        value = numpy.round(value / scale) * scale  # ensure delays are rounded to the
+                                                                    # nearest time step, rather than truncated
+                    getattr(syn_obj, name)[new_synapses] = value
 
     def _set_attributes(self, connection_parameters):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
             raise NotImplementedError
         syn_obj = self._brian_synapses[0][0]
-        connection_parameters.evaluate()  # inefficient: would be better to evaluate using mask
+        # evaluate the parameters only for the connections which exist
+        presynaptic_indices = numpy.asarray(syn_obj.presynaptic)
+        postsynaptic_indices = numpy.asarray(syn_obj.postsynaptic)
         for name, value in connection_parameters.items():
-            value = value.T
-            filtered_value = value[syn_obj.postsynaptic, syn_obj.presynaptic]
-            setattr(syn_obj, name, filtered_value)
-    
+            if value.is_homogeneous:
+                value = value.evaluate(simplify=True)
+            else:
+                value = value[presynaptic_indices, postsynaptic_indices]
+            setattr(syn_obj, name, value)
+
     def _get_attributes_as_arrays(self, attribute_names, multiple_synapses='sum'):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
             raise NotImplementedError
@@ -75,6 +75,17 @@ class Recorder(recording.Recorder):
         i = id - self.population.first_id
         return self._devices['spikes'].spiketimes[i] / ms
 
+    def _get_spike_arrays(self, ids):
+        spike_indices, spike_times = self._devices['spikes'].it
+        spike_indices = numpy.asarray(spike_indices, dtype=int)
+        order = numpy.argsort(spike_indices, kind='mergesort')
+        spike_indices = spike_indices[order]
+        spike_times = numpy.asarray(spike_times)[order] / ms
+        indices = numpy.array(ids, dtype=int) - self.population.first_id
+        starts = numpy.searchsorted(spike_indices, indices, side='left')
+        stops = numpy.searchsorted(spike_indices, indices, side='right')
+        return stops - starts, spike_times[numpy.in1d(spike_indices, indices)]
+
     def _get_all_signals(self, variable, ids, clear=False):
         # need to filter according to ids
         device = self._devices[variable]
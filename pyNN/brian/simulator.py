@@ -58,6 +58,7 @@ class State(common.control.BaseState):
         
     def clear(self):
         self.recorders = set([])
+        self.stream_handlers = []
         self.id_counter = 0
         self.segment_counter = -1
         if self.network:
@@ -28,6 +28,8 @@ class BaseState(object):
         self.t_start = 0
         self.write_on_end = []  # a list of (population, variable, filename) combinations that should be written to file on end()
         self.recorders = set([])
+        self.stream_handlers = []  # objects which process recorded data in chunks during the run, see pyNN.recording.streaming
+        self.cache_memory_limit = None  # memory (in bytes) for recorded segments stored at reset(), beyond which they are written to disk
 
 
 def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
@@ -39,7 +41,10 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
     `timestep`, `min_delay` and `max_delay` should all be in milliseconds.
 
     `extra_params` contains any keyword arguments that are required by a given
-    simulator but not by others.
+    simulator but not by others. For all simulators, `cache_memory_limit` may
+    be given, in bytes: the recorded data stored at each `reset()` are then
+    written to a temporary file once the stored data of a population exceed
+    this amount, and are read back when needed.
     """
     max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
     invalid_extra_params = ('mindelay', 'maxdelay', 'dt', 'time_step')
@@ -71,6 +76,7 @@ def build_run(simulator):
         documentation of the ``run()`` function for further information.
         """
         now = simulator.state.t
+        callbacks = list(callbacks or []) + simulator.state.stream_handlers
         if time_point - now < -simulator.state.dt / 2.0:  # allow for floating point error
             raise ValueError("Time %g is in the past (current time %g)" % (time_point, now))
         if callbacks:
@@ -119,6 +125,8 @@ def build_reset(simulator):
         their initial values, and delete any recorded data. The network structure
         is not changed, nor is the specification of which neurons to record from.
         """
+        for handler in simulator.state.stream_handlers:
+            handler.new_segment()
         for recorder in simulator.state.recorders:
             recorder.store_to_cache(annotations)
         simulator.state.reset()
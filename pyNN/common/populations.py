@@ -23,6 +23,8 @@ from pyNN import random, recording, errors, standardmodels, core, space, descrip
 from pyNN.models import BaseCellType
 from pyNN.parameters import ParameterSpace, LazyArray, simplify as simplify_parameter_array
 from pyNN.recording import files
+from pyNN.recording.streaming import StreamWriter
+from pyNN.recording.reducers import StreamReducer
 
 deprecated = core.deprecated
 logger = logging.getLogger("PyNN")
@@ -146,6 +148,30 @@ class IDMixin(object):
         return self.parent[index:index + 1]
 
 
+def lookup_indices(all_ids, sorter, id, container="View"):
+    """
+    Return the index (or indices) of the ID (or IDs) `id` in the array
+    `all_ids`, raising an IndexError if any are not present.
+
+    `sorter` is the permutation which sorts `all_ids` (as returned by
+    `numpy.argsort()`), or None if `all_ids` is already sorted. The lookup is
+    then a binary search, taking O(log N) time per ID.
+    """
+    ids = numpy.asarray(id, dtype=int)
+    if all_ids.size == 0 and ids.size > 0:
+        raise IndexError("ID %s not present in the %s" % (ids.flat[0], container))
+    positions = numpy.searchsorted(all_ids, ids, sorter=sorter)
+    positions = numpy.minimum(positions, max(all_ids.size - 1, 0))
+    if sorter is not None:
+        positions = sorter[positions]
+    missing = all_ids[positions] != ids
+    if numpy.any(missing):
+        raise IndexError("ID %s not present in the %s" % (ids[missing].flat[0], container))
+    if ids.ndim == 0:
+        return int(positions)
+    return positions
+
+
 class BasePopulation(object):
     _record_filter = None
 
@@ -161,7 +187,7 @@ class BasePopulation(object):
             p[3:6] is equivalent to p.__getitem__(slice(3, 6))
         """
         if isinstance(index, (int, numpy.integer)):
-            return self.all_cells[index]
+            return self._get_cell(index)
         elif isinstance(index, (slice, list, numpy.ndarray)):
             return self._get_view(index)
         elif isinstance(index, tuple):
@@ -176,11 +202,18 @@ class BasePopulation(object):
     @property
     def local_size(self):
         """Return the number of cells in the population on the local MPI node"""
-        return len(self.local_cells)  # would self._mask_local.sum() be faster?
+        return int(numpy.count_nonzero(self._mask_local))
+
+    @property
+    def local_cells(self):
+        """
+        An array containing cell ids for the local node.
+        """
+        return self.all_cells[self._mask_local]
 
     def __iter__(self):
         """Iterator over cell ids on the local node."""
-        return iter(self.local_cells)
+        return (self._get_cell(index) for index in numpy.flatnonzero(self._mask_local))
 
     @property
     def conductance_based(self):
@@ -204,7 +237,7 @@ class BasePopulation(object):
 
     def all(self):
         """Iterator over cell ids on all MPI nodes."""
-        return iter(self.all_cells)
+        return (self._get_cell(index) for index in range(self.size))
 
     def __add__(self, other):
         """
@@ -290,10 +323,26 @@ class BasePopulation(object):
                                                      # this also causes problems if the population size matches the number of MPI nodes
         parameters = dict(parameter_space.items())
         if gather == True and self._simulator.state.num_processes > 1:
-            # seems inefficient to do it in a loop - should do as single operation
+            # numeric arrays are gathered together, as a single structured array
+            numeric_names = [name for name in parameter_names
+                             if isinstance(parameters.get(name), numpy.ndarray)
+                             and not parameters[name].dtype.hasobject]
+            if numeric_names:
+                local_values = numpy.empty((self._mask_local.sum(),),
+                                           dtype=[("index", int)] + [(str(name), parameters[name].dtype)
+                                                                     for name in numeric_names])
+                local_values["index"] = numpy.arange(self.size)[self._mask_local]
+                for name in numeric_names:
+                    local_values[name] = parameters[name]
+                all_values = recording.gather_structured(local_values)
+                if self._simulator.state.mpi_rank == 0:
+                    idx = numpy.argsort(all_values["index"])
+                    for name in numeric_names:
+                        parameters[name] = all_values[name][idx]
+            # other arrays, e.g. of Sequences, have to be pickled
             for name in parameter_names:
-                values = parameters[name]
-                if isinstance(values, numpy.ndarray):
+                values = parameters.get(name)
+                if isinstance(values, numpy.ndarray) and name not in numeric_names:
                     all_values = {self._simulator.state.mpi_rank: values.tolist()}
                     local_indices = numpy.arange(self.size)[self._mask_local].tolist()
                     all_indices = {self._simulator.state.mpi_rank: local_indices}
@@ -304,7 +353,7 @@ class BasePopulation(object):
                         indices = reduce(operator.add, all_indices.values())
                         idx = numpy.argsort(indices)
                         values = numpy.array(values)[idx]
-                parameters[name] = values
+                    parameters[name] = values
         try:
             values = [parameters[name] for name in parameter_names]
         except KeyError as err:
@@ -418,7 +467,8 @@ class BasePopulation(object):
         """Determine whether `variable` can be recorded from this population."""
         return self.celltype.can_record(variable)
 
-    def record(self, variables, to_file=None, sampling_interval=None):
+    def record(self, variables, to_file=None, sampling_interval=None, flush_interval=None,
+               reduce=None, dtype=None, downsample=None):
         """
         Record the specified variable or variables for all cells in the
         Population or view.
@@ -432,21 +482,81 @@ class BasePopulation(object):
         
         `sampling_interval` should be a value in milliseconds, and an integer
         multiple of the simulation timestep.
-        """
+
+        If `flush_interval` (in ms) is given, `to_file` must be a filename. The
+        data recorded from the population are then written to disk in chunks
+        of this duration during the run, and deleted from the simulator after
+        each chunk, so that memory use does not grow with the simulation time.
+        `to_file` is created as a directory; use
+        :class:`pyNN.recording.streaming.StreamReader` to read the data back.
+        Only the data recorded since the last chunk was written are returned
+        by `get_data()`.
+
+        If `reduce` is given, the recorded data are not kept, but are used to
+        update statistics, which can be retrieved with `get_statistics()`.
+        For spikes, `reduce` may be "count", "rate" (in spikes/s) or
+        ``("psth", bin_width)``, with `bin_width` in ms; for other variables
+        it may be "mean" or "var". The data are retrieved from the simulator
+        and reduced every `flush_interval` ms, if given, otherwise at the end
+        of each run. All the variables recorded from a population must be
+        reduced, or none of them.
+
+        `dtype` is the floating-point type in which signals are stored once
+        retrieved from the simulator, e.g. "float32" or "float16" to reduce
+        memory use and file sizes. If `downsample` is an integer `k`, only
+        every `k`-th sample is kept; if it is ``("mean", k)``, each block of
+        `k` samples is replaced by its mean. Both options apply to all the
+        signals recorded from a population.
+        """
+        handler = self._get_stream_handler()
+        if variables is not None:
+            recorded = set(variable for variable, ids in self.recorder.recorded.items() if ids)
+            if reduce is None and isinstance(handler, StreamReducer):
+                raise ValueError("The recordings from %s are reduced. All recorded variables must be reduced." % self.label)
+            if reduce is not None and (isinstance(handler, StreamWriter) or
+                                       (handler is None and recorded)):
+                raise ValueError("The recordings from %s are not reduced. Reduced recordings cannot be combined "
+                                 "with other recordings from the same population." % self.label)
         if variables is None:  # reset the list of things to record
                               # note that if record(None) is called on a view of a population
                               # recording will be reset for the entire population, not just the view
+            if handler is not None:
+                handler.close()
+                self._simulator.state.stream_handlers.remove(handler)
             self.recorder.reset()
         else:
             logger.debug("%s.record('%s')", self.label, variables)
             if self._record_filter is None:
-                self.recorder.record(variables, self.all_cells, sampling_interval)
+                cells = self.all_cells
             else:
-                self.recorder.record(variables, self._record_filter, sampling_interval)
-        if isinstance(to_file, basestring):
+                cells = self._record_filter
+            if reduce is not None:
+                if handler is None:
+                    handler = StreamReducer(self.recorder, flush_interval)
+                    self._simulator.state.stream_handlers.append(handler)
+                mask = numpy.zeros((self.recorder.population.size,), dtype=bool)
+                mask[self.recorder.population.id_to_index(numpy.array(cells, dtype=int))] = True
+                for variable in recording.normalize_variables_arg(variables):
+                    handler.add(variable, reduce, mask)
+            self.recorder.record(variables, cells, sampling_interval, dtype, downsample)
+        if reduce is not None:
+            return
+        if flush_interval is not None:
+            if not isinstance(to_file, basestring):
+                raise ValueError("Streaming recorded data to disk requires `to_file` to be a filename")
+            if handler is None:
+                self._simulator.state.stream_handlers.append(
+                    StreamWriter(self.recorder, to_file, flush_interval))
+        elif isinstance(to_file, basestring):
             self.recorder.file = to_file
             self._simulator.state.write_on_end.append((self, variables, self.recorder.file))
 
+    def _get_stream_handler(self):
+        for handler in self._simulator.state.stream_handlers:
+            if handler.recorder is self.recorder:
+                return handler
+        return None
+
     @deprecated("record('v')")
     def record_v(self, to_file=True):
         """
@@ -476,7 +586,14 @@ class BasePopulation(object):
         For parallel simulators, if `gather` is True, all data will be gathered
         to the master node and a single output file created there. Otherwise, a
         file will be written on each node, containing only data from the cells
-        simulated on that node.
+        simulated on that node. If `gather` is "by_rank", `io` should be the
+        name of a directory: the data are then sent to the master node one node
+        at a time and written in the format read by
+        :class:`pyNN.recording.streaming.StreamReader`, so that the master node
+        never has to hold all the data. If `gather` is "shards", each node
+        writes its own data into the directory `io`, in parallel, and the
+        master node writes a manifest; `StreamReader` presents the shards as
+        a single data set.
 
         If `clear` is True, recorded data will be deleted from the `Population`.
         
@@ -488,7 +605,7 @@ class BasePopulation(object):
         self.recorder.write(variables, io, gather, self._record_filter, clear=clear,
                             annotations=annotations)
 
-    def get_data(self, variables='all', gather=True, clear=False):
+    def get_data(self, variables='all', gather=True, clear=False, format='neo'):
         """
         Return a Neo `Block` containing the data (spikes, state variables)
         recorded from the Population.
@@ -503,8 +620,13 @@ class BasePopulation(object):
         simulated on the local node.
 
         If `clear` is True, recorded data will be deleted from the `Population`.
+
+        If `format` is "arrays", the data are returned as plain NumPy arrays
+        rather than as Neo objects, which is much faster for large
+        populations. See :meth:`pyNN.recording.Recorder.get` for a description
+        of this format.
         """
-        return self.recorder.get(variables, gather, self._record_filter, clear)
+        return self.recorder.get(variables, gather, self._record_filter, clear, format=format)
 
     @deprecated("write_data(file, 'spikes')")
     def printSpikes(self, file, gather=True, compatible_output=True):
@@ -530,6 +652,23 @@ class BasePopulation(object):
     def get_gsyn(self, gather=True, compatible_output=True):
         return self.get_data(['gsyn_exc', 'gsyn_inh'], gather)
 
+    def get_statistics(self, gather=True):
+        """
+        Return the statistics of the recordings made with the `reduce`
+        argument of `record()`.
+
+        The statistics are returned as a list containing, for each segment,
+        a dict of dicts, so that for example the mean membrane potentials in
+        the first segment are in ``data[0]['v']['mean']``. Per-cell statistics
+        are arrays, in the order of the cells of the Population or view. PSTHs
+        include the spikes of all the cells recorded with that reduction.
+        """
+        handler = self._get_stream_handler()
+        if not isinstance(handler, StreamReducer):
+            raise ValueError("No reduced recordings have been made from %s" % self.label)
+        index = self.recorder.population.id_to_index(self._all_ids)
+        return handler.get(index, gather)
+
     def get_spike_counts(self, gather=True):
         """
         Returns a dict containing the number of spikes for each neuron.
@@ -572,9 +711,8 @@ class BasePopulation(object):
         """
         if isinstance(file, basestring):
             file = recording.files.StandardTextFile(file, mode='w')
-        cells = self.all_cells
-        result = numpy.empty((len(cells), 4))
-        result[:, 0] = numpy.array([self.id_to_index(id) for id in cells])
+        result = numpy.empty((self.size, 4))
+        result[:, 0] = self.id_to_index(self._all_ids)
         result[:, 1:4] = self.positions.T
         if self._simulator.state.mpi_rank == 0:
             file.write(result, {'population': self.label})
@@ -656,13 +794,14 @@ class Population(BasePopulation):
             raise TypeError("cellclass must be an instance or subclass of BaseCellType, not a %s" % type(cellclass))
         self.annotations = {}
         self.recorder = self._recorder_class(self)
-        # Build the arrays of cell ids
-        # Cells on the local node are represented as ID objects, other cells by integers
-        # All are stored in a single numpy array for easy lookup by address
-        # The local cells are also stored in a list, for easy iteration
+        # Build the array of cell ids
+        # The ids are stored as integers, in `_all_ids`. ID objects are only
+        # created when they are requested (see `all_cells`).
+        self._all_cells = None
+        self._local_index = None
         self._create_cells()
-        self.first_id = self.all_cells[0]
-        self.last_id = self.all_cells[-1]
+        self.first_id = int(self._all_ids[0])
+        self.last_id = int(self._all_ids[-1])
         self.initial_values = {}
         all_initial_values = self.celltype.default_initial_values.copy()
         all_initial_values.update(initial_values)
@@ -672,12 +811,33 @@ class Population(BasePopulation):
     def __repr__(self):
         return "Population(%d, %r, structure=%r, label=%r)" % (self.size, self.celltype, self.structure, self.label)
 
-    @property
-    def local_cells(self):
+    def _get_all_cells(self):
         """
-        An array containing cell ids for the local node.
+        An array containing the ID objects of all the cells in the Population,
+        on all MPI nodes. The ID objects are created the first time the array
+        is requested; internally, the ids are stored as integers.
         """
-        return self.all_cells[self._mask_local]
+        if self._all_cells is None:
+            self._all_cells = numpy.array([self._make_id(index) for index in range(self.size)],
+                                          dtype=self._simulator.ID)
+        return self._all_cells
+
+    def _set_all_cells(self, all_cells):
+        self._all_cells = all_cells
+        self._all_ids = numpy.array(all_cells, dtype=int)
+    all_cells = property(fget=_get_all_cells, fset=_set_all_cells)
+
+    def _make_id(self, index):
+        """Create an ID object for the cell with the given index."""
+        id = self._simulator.ID(self._all_ids[index])
+        id.parent = self
+        return id
+
+    def _get_cell(self, index):
+        if self._all_cells is None:
+            return self._make_id(index)
+        else:
+            return self._all_cells[index]
 
     def id_to_index(self, id):
         """
@@ -692,9 +852,9 @@ class Population(BasePopulation):
             return int(id - self.first_id)  # this assumes ids are consecutive
         else:
             if isinstance(id, PopulationView):
-                id = id.all_cells
+                id = id._all_ids
             id = numpy.array(id)
-            if (self.first_id > id.min()) or (self.last_id < id.max()):
+            if id.size > 0 and ((self.first_id > id.min()) or (self.last_id < id.max())):
                 raise ValueError("ids should be in the range [%d,%d], actually [%d, %d]" % (self.first_id, self.last_id, id.min(), id.max()))
             return (id - self.first_id).astype(numpy.int)  # this assumes ids are consecutive
 
@@ -704,9 +864,13 @@ class Population(BasePopulation):
         (order in the Population), counting only cells on the local MPI node.
         """
         if self._simulator.state.num_processes > 1:
-            return self.local_cells.tolist().index(id)          # probably very slow
-            #return numpy.nonzero(self.local_cells == id)[0][0] # possibly faster?
-            # another idea - get global index, use idx-sum(mask_local[:idx])?
+            if self._local_index is None:
+                # the position of each cell among the local cells
+                self._local_index = numpy.cumsum(self._mask_local) - 1
+            index = self.id_to_index(id)
+            if not numpy.all(self._mask_local[index]):
+                raise ValueError("id %s is not on the local MPI node" % id)
+            return self._local_index[index]
         else:
             return self.id_to_index(id)
 
@@ -758,13 +922,13 @@ class Population(BasePopulation):
             "celltype": self.celltype.describe(template=None),
             "structure": None,
             "size": self.size,
-            "size_local": len(self.local_cells),
+            "size_local": self.local_size,
             "first_id": self.first_id,
             "last_id": self.last_id,
         }
         context.update(self.annotations)
-        if len(self.local_cells) > 0:
-            first_id = self.local_cells[0]
+        if self.local_size > 0:
+            first_id = self._all_ids[self._mask_local][0]
             context.update({
                 "local_first_id": first_id,
                 "cell_parameters": {}  # first_id.get_parameters(),
@@ -824,22 +988,45 @@ class PopulationView(BasePopulation):
             if len(numpy.unique(self.mask)) != len(self.mask):
                 logging.warning("PopulationView can contain only once each ID, duplicated IDs are remove")
                 self.mask = numpy.unique(self.mask)
-        self.all_cells = self.parent.all_cells[self.mask]  # do we need to ensure this is ordered?
-        idx = numpy.argsort(self.all_cells)
-        self._is_sorted = numpy.all(idx == numpy.arange(len(self.all_cells)))
-        self.size = len(self.all_cells)
+        # flatten the chain of views: store the indices of the cells in the
+        # Population at the root of the tree, so that lookups do not need to
+        # go through all the intermediate views
+        if isinstance(self.parent, PopulationView):
+            self._grandparent = self.parent.grandparent
+            self._index_in_grandparent = self.parent._index_in_grandparent[self.mask]
+        else:
+            self._grandparent = self.parent
+            self._index_in_grandparent = numpy.arange(self.parent.size)[self.mask]
+        self._all_ids = self._grandparent._all_ids[self._index_in_grandparent]  # do we need to ensure this is ordered?
+        idx = numpy.argsort(self._all_ids)
+        self._is_sorted = numpy.all(idx == numpy.arange(len(self._all_ids)))
+        self._id_sorter = None if self._is_sorted else idx  # used for reverse lookups in id_to_index()
+        self.size = len(self._all_ids)
         self.label = label or "view of '%s' with size %s" % (parent.label, self.size)
-        self._mask_local = self.parent._mask_local[self.mask]
-        self.local_cells = self.all_cells[self._mask_local]
-        self.first_id = numpy.min(self.all_cells)  # only works if we assume all_cells is sorted, otherwise could use min()
-        self.last_id = numpy.max(self.all_cells)
+        self._mask_local = self._grandparent._mask_local[self._index_in_grandparent]
+        self.first_id = numpy.min(self._all_ids)  # only works if we assume all_cells is sorted, otherwise could use min()
+        self.last_id = numpy.max(self._all_ids)
         self.annotations = {}
         self.recorder = self.parent.recorder
-        self._record_filter = self.all_cells
 
     def __repr__(self):
         return "PopulationView(parent=%r, selector=%r, label=%r)" % (self.parent, self.mask, self.label)
 
+    @property
+    def all_cells(self):
+        """
+        An array containing the ID objects of all the cells in the view, on
+        all MPI nodes.
+        """
+        return self._grandparent.all_cells[self._index_in_grandparent]
+
+    @property
+    def _record_filter(self):
+        return self.all_cells
+
+    def _get_cell(self, index):
+        return self._grandparent._get_cell(self._index_in_grandparent[index])
+
     @property
     def initial_values(self):
         # this is going to be complex - if we keep initial_values as a dict,
@@ -855,7 +1042,7 @@ class PopulationView(BasePopulation):
 
     @property
     def positions(self):
-        return self.parent.positions.T[self.mask].T  # make positions N,3 instead of 3,N to avoid all this transposing?
+        return self._grandparent.positions[:, self._index_in_grandparent]
 
     def id_to_index(self, id):
         """
@@ -864,31 +1051,9 @@ class PopulationView(BasePopulation):
 
             >>> assert pv.id_to_index(pv[3]) == 3
         """
-        if not numpy.iterable(id):
-            if self._is_sorted:
-                if id not in self.all_cells:
-                    raise IndexError("ID %s not present in the View" % id)
-                return numpy.searchsorted(self.all_cells, id)
-            else:
-                result = numpy.where(self.all_cells == id)[0]
-            if len(result) == 0:
-                raise IndexError("ID %s not present in the View" % id)
-            else:
-                return result
-        else:
-            if self._is_sorted:
-                return numpy.searchsorted(self.all_cells, id)
-            else:
-                result = numpy.array([], dtype=numpy.int)
-                for item in id:
-                    data = numpy.where(self.all_cells == item)[0]
-                    if len(data) == 0:
-                        raise IndexError("ID %s not present in the View" % item)
-                    elif len(data) > 1:
-                        raise Exception("ID %s is duplicated in the View" % item)
-                    else:
-                        result = numpy.append(result, data)
-                return result
+        if isinstance(id, PopulationView):
+            id = id._all_ids
+        return lookup_indices(self._all_ids, self._id_sorter, id, "View")
 
     @property
     def grandparent(self):
@@ -899,21 +1064,14 @@ class PopulationView(BasePopulation):
         The name "grandparent" is of course a little misleading, as it could
         be just the parent, or the great, great, great, ..., grandparent.
         """
-        if hasattr(self.parent, "parent"):
-            return self.parent.grandparent
-        else:
-            return self.parent
+        return self._grandparent
 
     def index_in_grandparent(self, indices):
         """
         Given an array of indices, return the indices in the parent population
         at the root of the tree.
         """
-        indices_in_parent = numpy.arange(self.parent.size)[self.mask][indices]
-        if hasattr(self.parent, "parent"):
-            return self.parent.index_in_grandparent(indices_in_parent)
-        else:
-            return indices_in_parent
+        return self._index_in_grandparent[indices]
 
     def describe(self, template='populationview_default.txt', engine='default'):
         """
@@ -958,6 +1116,7 @@ class Assembly(object):
         if kwargs:
             assert list(kwargs.keys()) == ['label']
         self.populations = []
+        self._id_index = None
         for p in populations:
             self._insert(p)
         self.label = kwargs.get('label', 'assembly%d' % Assembly._count)
@@ -970,12 +1129,13 @@ class Assembly(object):
     def _insert(self, element):
         if not isinstance(element, BasePopulation):
             raise TypeError("argument is a %s, not a Population." % type(element).__name__)
+        self._id_index = None  # invalidate the cached reverse index
         if isinstance(element, PopulationView):
             if not element.parent in self.populations:
                 double = False
                 for p in self.populations:
-                    data = numpy.concatenate((p.all_cells, element.all_cells))
-                    if len(numpy.unique(data)) != len(p.all_cells) + len(element.all_cells):
+                    data = numpy.concatenate((p._all_ids, element._all_ids))
+                    if len(numpy.unique(data)) != p.size + element.size:
                         logging.warning('Adding a PopulationView to an Assembly containing elements already present is not posible')
                         double = True  # Should we automatically remove duplicated IDs ?
                         break
@@ -1003,14 +1163,28 @@ class Assembly(object):
             result = numpy.concatenate((result, p.all_cells))
         return result
 
+    @property
+    def _all_ids(self):
+        return numpy.concatenate([p._all_ids for p in self.populations])
+
     def all(self):
         """Iterator over cell ids on all nodes."""
-        return iter(self.all_cells)
+        return chain(*[p.all() for p in self.populations])
+
+    def _get_id_index(self):
+        """
+        Return the IDs of all cells in the Assembly, and the permutation which
+        sorts them. These are cached, until another population is added.
+        """
+        if self._id_index is None:
+            all_ids = self._all_ids
+            self._id_index = (all_ids, numpy.argsort(all_ids))
+        return self._id_index
 
     @property
     def _is_sorted(self):
-        idx = numpy.argsort(self.all_cells)
-        return numpy.all(idx == numpy.arange(len(self.all_cells)))
+        all_ids, idx = self._get_id_index()
+        return numpy.all(idx == numpy.arange(len(idx)))
 
     @property
     def _homogeneous_synapses(self):
@@ -1056,11 +1230,11 @@ class Assembly(object):
 
     @property
     def first_id(self):
-        return numpy.min(self.all_cells)
+        return numpy.min(self._all_ids)
 
     @property
     def last_id(self):
-        return numpy.max(self.all_cells)
+        return numpy.max(self._all_ids)
 
     def id_to_index(self, id):
         """
@@ -1070,30 +1244,10 @@ class Assembly(object):
             >>> assert p.id_to_index(p[5]) == 5
             >>> assert p.id_to_index(p.index([1, 2, 3])) == [1, 2, 3]
         """
-        all_cells = self.all_cells
-        if not numpy.iterable(id):
-            if self._is_sorted:
-                return numpy.searchsorted(all_cells, id)
-            else:
-                result = numpy.where(all_cells == id)[0]
-            if len(result) == 0:
-                raise IndexError("ID %s not present in the View" % id)
-            else:
-                return result
-        else:
-            if self._is_sorted:
-                return numpy.searchsorted(all_cells, id)
-            else:
-                result = numpy.array([], dtype=numpy.int)
-                for item in id:
-                    data = numpy.where(all_cells == item)[0]
-                    if len(data) == 0:
-                        raise IndexError("ID %s not present in the Assembly" % item)
-                    elif len(data) > 1:
-                        raise Exception("ID %s is duplicated in the Assembly" % item)
-                    else:
-                        result = numpy.append(result, data)
-                return result
+        all_ids, sorter = self._get_id_index()
+        if isinstance(id, (PopulationView, Assembly)):
+            id = id._all_ids
+        return lookup_indices(all_ids, sorter, id, "Assembly")
 
     @property
     def positions(self):
@@ -1283,9 +1437,8 @@ class Assembly(object):
         """
         if isinstance(file, basestring):
             file = files.StandardTextFile(file, mode='w')
-        cells = self.all_cells
-        result = numpy.empty((len(cells), 4))
-        result[:, 0] = numpy.array([self.id_to_index(id) for id in cells])
+        result = numpy.empty((self.size, 4))
+        result[:, 0] = self.id_to_index(self._all_ids)
         result[:, 1:4] = self.positions.T
         if self._simulator.state.mpi_rank == 0:
             file.write(result, {'assembly': self.label})
@@ -1297,7 +1450,8 @@ class Assembly(object):
             return self.positions[:, i]
         return gen
 
-    def get_data(self, variables='all', gather=True, clear=False, annotations=None):
+    def get_data(self, variables='all', gather=True, clear=False, annotations=None,
+                 format='neo'):
         """
         Return a Neo `Block` containing the data (spikes, state variables)
         recorded from the Assembly.
@@ -1312,7 +1466,17 @@ class Assembly(object):
         simulated on the local node.
 
         If `clear` is True, recorded data will be deleted from the `Assembly`.
+
+        If `format` is "arrays", the data are returned as plain NumPy arrays,
+        with cell indices relative to the Assembly. See
+        :meth:`pyNN.recording.Recorder.get` for a description of this format.
         """
+        if format == 'arrays':
+            all_segments = [p.get_data(variables, gather, clear, format=format)
+                            for p in self.populations]
+            offsets = numpy.hstack(([0], numpy.cumsum([p.size for p in self.populations])[:-1]))
+            return [recording.merge_arrays(list(segments), offsets)
+                    for segments in zip(*all_segments)]
         name = self.label
         description = self.describe()
         blocks = [p.get_data(variables, gather, clear) for p in self.populations]
@@ -139,6 +139,47 @@ class Projection(object):
         for i in range(len(self)):
             yield self[i]
 
+    # --- Methods for creating connections ------------------------------------
+
+    def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
+                            **connection_parameters):
+        """
+        Connect one or more pre-synaptic neurons to a single post-synaptic neuron.
+
+        `presynaptic_indices` is a 1D array of indices into the pre-synaptic
+        population. Each connection parameter is either a single value or a 1D
+        array with one value per pre-synaptic neuron.
+        """
+        raise NotImplementedError
+
+    def _connect_batch(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Create a block of connections, given as flat arrays of pre- and
+        post-synaptic indices, one element per connection. Connections to the
+        same post-synaptic neuron must be contiguous.
+
+        Each connection parameter is either a single value, shared by all the
+        connections, or a 1D array with one value per connection.
+
+        Backends which can create many connections at once should override
+        this method. The default implementation calls `_convergent_connect()`
+        once per post-synaptic neuron.
+        """
+        boundaries = numpy.flatnonzero(numpy.diff(postsynaptic_indices)) + 1
+        starts = numpy.hstack(([0], boundaries))
+        stops = numpy.hstack((boundaries, [postsynaptic_indices.size]))
+        for start, stop in zip(starts, stops):
+            column_parameters = {}
+            for name, value in connection_parameters.items():
+                if isinstance(value, numpy.ndarray):
+                    column_parameters[name] = value[start:stop]
+                else:
+                    column_parameters[name] = value
+            self._convergent_connect(presynaptic_indices[start:stop],
+                                     postsynaptic_indices[start],
+                                     **column_parameters)
+
     # --- Methods for setting connection parameters ---------------------------
 
     def set(self, **attributes):
@@ -265,7 +306,7 @@ class Projection(object):
             name of the attributes whose values are wanted, or a list of such
             names.
         `format`:
-            "list" or "array".
+            "list", "array", "structured" or "sparse".
         `gather`:
             if True, get connection information from all MPI nodes, otherwise
             only from connections that exist in this node.
@@ -302,6 +343,23 @@ class Projection(object):
         controlled by the `multiple_synapses` argument, which must be one of
         {'last', 'first', 'sum', 'min', 'max'}.
 
+        With structured format, returns a NumPy structured array with one
+        record per connection and one field per name in `attribute_names`,
+        preceded by "presynaptic_index" and "postsynaptic_index" fields if
+        `with_address` is True. This avoids creating a Python tuple for each
+        connection. Example::
+
+            >>> connections = prj.get(["weight", "delay"], format="structured")
+            >>> connections["weight"][:3]
+            array([ 0.34018925,  0.79907132,  0.61808418])
+
+        With sparse format, returns a tuple of :class:`scipy.sparse.csr_matrix`
+        objects, one for each name in `attribute_names`, which contain entries
+        only for the connections that exist. Multiple connections between the
+        same pair of neurons are combined as for the array format. This
+        requires SciPy, but uses much less memory than the array format for
+        large, sparsely-connected projections.
+
         Values will be expressed in the standard PyNN units (i.e. millivolts,
         nanoamps, milliseconds, microsiemens, nanofarads, event per second).
         """
@@ -310,39 +368,46 @@ class Projection(object):
             return_single = True
         else:
             return_single = False
+        field_names = list(attribute_names)
         if isinstance(self.synapse_type, StandardSynapseType):
             attribute_names = self.synapse_type.get_native_names(*attribute_names)
         if format == 'list':
             names = list(attribute_names)
             if with_address:
                 names = ["presynaptic_index", "postsynaptic_index"] + names
-            values = self._get_attributes_as_list(names)
             if gather and self._simulator.state.num_processes > 1:
-                all_values = {self._simulator.state.mpi_rank: values}
-                all_values = recording.gather_dict(all_values, all=(gather == 'all'))
-                if gather == 'all' or self._simulator.state.mpi_rank == 0:
-                    values = reduce(operator.add, all_values.values())
+                values = self._get_attributes_as_structured(names, names)
+                values = self._gather_structured(values, all=(gather == 'all')).tolist()
+            else:
+                values = self._get_attributes_as_list(names)
             if not with_address and return_single:
                 values = [val[0] for val in values]
             return values
+        elif format == 'structured':
+            names = list(attribute_names)
+            if with_address:
+                names = ["presynaptic_index", "postsynaptic_index"] + names
+                field_names = ["presynaptic_index", "postsynaptic_index"] + field_names
+            values = self._get_attributes_as_structured(names, field_names)
+            if gather and self._simulator.state.num_processes > 1:
+                values = self._gather_structured(values, all=(gather == 'all'))
+            return values
         elif format == 'array':
             if multiple_synapses not in Projection.MULTI_SYNAPSE_OPERATIONS:
                 raise ValueError("`multiple_synapses` argument must be one of {}".format(list(Projection.MULTI_SYNAPSE_OPERATIONS)))
             if gather and self._simulator.state.num_processes > 1:
                 # Node 0 is the only one creating a full connection matrix, and returning it (saving memory)
-                # Slaves nodes are returning list of connections, so this may be inconsistent...
-                names = list(attribute_names)
-                names = ["presynaptic_index", "postsynaptic_index"] + names
-                values = self._get_attributes_as_list(names)
-                all_values = {self._simulator.state.mpi_rank: values}
-                all_values = recording.gather_dict(all_values, all=(gather == 'all'))
+                names = ["presynaptic_index", "postsynaptic_index"] + list(attribute_names)
+                local_values = self._get_attributes_as_structured(names, names)
+                all_values = self._gather_structured(local_values, all=(gather == 'all'))
                 if gather == 'all' or self._simulator.state.mpi_rank == 0:
-                    tmp_values = reduce(operator.add, all_values.values())
-                    values = self._get_attributes_as_arrays(attribute_names,
-                                                            multiple_synapses=multiple_synapses)
-                    tmp_values = numpy.array(tmp_values)
-                    for i in xrange(len(values)):
-                        values[i][tmp_values[:, 0].astype(int), tmp_values[:, 1].astype(int)] = tmp_values[:, 2 + i]
+                    values = [connection_matrix(all_values["presynaptic_index"],
+                                                all_values["postsynaptic_index"],
+                                                all_values[name], self.shape,
+                                                multiple_synapses)
+                              for name in attribute_names]
+                else:
+                    values = [local_values]
             else:
                 values = self._get_attributes_as_arrays(attribute_names,
                                                         multiple_synapses=multiple_synapses)
@@ -352,28 +417,72 @@ class Projection(object):
                 return values[0]
             else:
                 return values
+        elif format == 'sparse':
+            if multiple_synapses not in Projection.MULTI_SYNAPSE_OPERATIONS:
+                raise ValueError("`multiple_synapses` argument must be one of {}".format(list(Projection.MULTI_SYNAPSE_OPERATIONS)))
+            names = ["presynaptic_index", "postsynaptic_index"] + list(attribute_names)
+            values = self._get_attributes_as_structured(names, names)
+            if gather and self._simulator.state.num_processes > 1:
+                values = self._gather_structured(values, all=(gather == 'all'))
+            values = [sparse_connection_matrix(values["presynaptic_index"],
+                                               values["postsynaptic_index"],
+                                               values[name], self.shape,
+                                               multiple_synapses)
+                      for name in attribute_names]
+            if return_single:
+                if gather == 'all' or self._simulator.state.mpi_rank == 0:
+                    assert len(values) == 1, values
+                return values[0]
+            else:
+                return values
         else:
-            raise Exception("format must be 'list' or 'array'")
+            raise Exception("format must be 'list', 'array', 'structured' or 'sparse'")
 
     def _get_attributes_as_list(self, names):
         return [c.as_tuple(*names) for c in self.connections]
 
+    def _get_attributes_as_columns(self, names):
+        """
+        Return a list containing one 1D array for each attribute in `names`,
+        with one element per local connection.
+
+        Backends which can retrieve connection attributes in bulk should
+        override this method.
+        """
+        values = numpy.array(self._get_attributes_as_list(names), dtype=float)
+        values = values.reshape((-1, len(names)))
+        return [values[:, i] for i in range(len(names))]
+
+    def _get_attributes_as_structured(self, names, field_names):
+        """
+        Return a NumPy structured array with one record per local connection
+        and one field per attribute in `names`, labelled with `field_names`.
+        """
+        columns = self._get_attributes_as_columns(names)
+        dtype = [(str(field_name), int if name in ("presynaptic_index", "postsynaptic_index") else float)
+                 for name, field_name in zip(names, field_names)]
+        size = columns[0].size if columns else len(self)
+        values = numpy.empty((size,), dtype=dtype)
+        for (field_name, _), column in zip(dtype, columns):
+            values[field_name] = column
+        return values
+
+    def _gather_structured(self, values, all=False):
+        gathered_values = recording.gather_structured(values, all=all)
+        if all or self._simulator.state.mpi_rank == 0:
+            return gathered_values
+        else:
+            return values
+
     def _get_attributes_as_arrays(self, names, multiple_synapses='sum'):
-        multi_synapse_operation = Projection.MULTI_SYNAPSE_OPERATIONS[multiple_synapses]
-        all_values = []
-        for attribute_name in names:
-            values = numpy.nan * numpy.ones((self.pre.size, self.post.size))
-            if attribute_name[-1] == "s":  # weights --> weight, delays --> delay
-                attribute_name = attribute_name[:-1]
-            for c in self.connections:
-                value = getattr(c, attribute_name)
-                addr = (c.presynaptic_index, c.postsynaptic_index)
-                if numpy.isnan(values[addr]):
-                    values[addr] = value
-                else:
-                    values[addr] = multi_synapse_operation(values[addr], value)
-            all_values.append(values)
-        return all_values
+        names = [name[:-1] if name[-1] == "s" else name  # weights --> weight, delays --> delay
+                 for name in names]
+        columns = self._get_attributes_as_columns(["presynaptic_index", "postsynaptic_index"] + names)
+        presynaptic_indices = columns[0].astype(int)
+        postsynaptic_indices = columns[1].astype(int)
+        return [connection_matrix(presynaptic_indices, postsynaptic_indices, values,
+                                  self.shape, multiple_synapses)
+                for values in columns[2:]]
 
     @deprecated("get('weight', format, gather)")
     def getWeights(self, format='list', gather=True):
@@ -392,6 +501,13 @@ class Projection(object):
         Print synaptic attributes (weights, delays, etc.) to file. In the array
         format, zeros are printed for non-existent connections.
 
+        In the sparse format, one row is written per connection, containing
+        the pre- and post-synaptic indices followed by the attribute values,
+        sorted by presynaptic and then postsynaptic index. Multiple connections
+        between the same pair of neurons are written separately. The shape of
+        the connection matrix is stored in the metadata. Such files can be read
+        by :class:`FromFileConnector`.
+
         Values will be expressed in the standard PyNN units (i.e. millivolts,
         nanoamps, milliseconds, microsiemens, nanofarads, event per second).
         """
@@ -399,7 +515,18 @@ class Projection(object):
             attribute_names = self.synapse_type.get_parameter_names()
         if isinstance(file, basestring):
             file = recording.files.StandardTextFile(file, mode='wb')
-        all_values = self.get(attribute_names, format=format, gather=gather, with_address=with_address)
+        if format == 'sparse':
+            if isinstance(attribute_names, basestring):
+                attribute_names = [attribute_names]
+            # the connections are not merged into a sparse matrix, which would
+            # combine multiple connections between the same pair of neurons
+            values = self.get(attribute_names, format='structured', gather=gather, with_address=True)
+            names = values.dtype.names
+            order = numpy.lexsort((values["postsynaptic_index"], values["presynaptic_index"]))
+            all_values = numpy.column_stack([values[name][order] for name in names])
+            with_address = True
+        else:
+            all_values = self.get(attribute_names, format=format, gather=gather, with_address=with_address)
         if format == 'array':
             all_values = [numpy.where(numpy.isnan(values), 0.0, values)
                           for values in all_values]
@@ -407,6 +534,8 @@ class Projection(object):
             metadata = {"columns": attribute_names}
             if with_address:
                 metadata["columns"] = ["i", "j"] + list(metadata["columns"])
+            if format == 'sparse':
+                metadata["shape"] = self.shape
             file.write(all_values, metadata)
             file.close()
 
@@ -474,3 +603,69 @@ class Connection(object):
     attributes.
     """
     pass
+
+
+def _reduce_multiple_synapses(addresses, values, multiple_synapses):
+    """
+    Given the flat matrix addresses and values of a set of connections, return
+    the unique addresses, in ascending order, and one value per address,
+    combining the values of connections with the same address according to
+    `multiple_synapses`.
+    """
+    if multiple_synapses in ('first', 'last'):
+        if multiple_synapses == 'last':
+            addresses = addresses[::-1]
+            values = values[::-1]
+        unique_addresses, first = numpy.unique(addresses, return_index=True)
+        return unique_addresses, values[first]
+    else:
+        ufunc, initial = {'sum': (numpy.add, 0.0),
+                          'min': (numpy.minimum, numpy.inf),
+                          'max': (numpy.maximum, -numpy.inf)}[multiple_synapses]
+        unique_addresses, inverse = numpy.unique(addresses, return_inverse=True)
+        reduced_values = initial * numpy.ones(unique_addresses.shape)
+        ufunc.at(reduced_values, inverse, values)
+        return unique_addresses, reduced_values
+
+
+def connection_matrix(presynaptic_indices, postsynaptic_indices, values, shape,
+                      multiple_synapses='sum'):
+    """
+    Return a 2D array of the given shape containing `values` at the addresses
+    given by the index arrays and NaN elsewhere.
+
+    Where there are several connections between the same pair of neurons, their
+    values are combined according to `multiple_synapses`, which must be one of
+    {'last', 'first', 'sum', 'min', 'max'}.
+    """
+    matrix = numpy.nan * numpy.ones(shape)
+    if values.size == 0:
+        return matrix
+    addresses = numpy.ravel_multi_index((presynaptic_indices, postsynaptic_indices), shape)
+    addresses, values = _reduce_multiple_synapses(addresses, values, multiple_synapses)
+    matrix.flat[addresses] = values
+    return matrix
+
+
+def sparse_connection_matrix(presynaptic_indices, postsynaptic_indices, values, shape,
+                             multiple_synapses='sum'):
+    """
+    Return a :class:`scipy.sparse.csr_matrix` of the given shape containing
+    `values` at the addresses given by the index arrays. Unlike
+    `connection_matrix()`, only existing connections are stored, as explicit
+    entries (even when their value is zero).
+
+    Where there are several connections between the same pair of neurons, their
+    values are combined according to `multiple_synapses`, which must be one of
+    {'last', 'first', 'sum', 'min', 'max'}.
+    """
+    from scipy import sparse
+    addresses = numpy.ravel_multi_index((presynaptic_indices.astype(int),
+                                         postsynaptic_indices.astype(int)), shape)
+    addresses, values = _reduce_multiple_synapses(addresses, values.astype(float),
+                                                  multiple_synapses)
+    rows, columns = numpy.unravel_index(addresses, shape)
+    # since the addresses are unique and sorted, we can build the CSR
+    # structure directly, without scipy summing duplicates
+    indptr = numpy.hstack(([0], numpy.cumsum(numpy.bincount(rows, minlength=shape[0]))))
+    return sparse.csr_matrix((values, columns, indptr), shape=shape)
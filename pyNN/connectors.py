@@ -13,7 +13,7 @@ from pyNN.random import RandomDistribution, AbstractRNG, NumpyRNG, get_mpi_confi
 from pyNN.core import IndexBasedExpression
 from pyNN import errors, descriptions
 from pyNN.recording import files
-from pyNN.parameters import LazyArray
+from pyNN.parameters import LazyArray, ParameterSpace
 from pyNN.standardmodels import StandardSynapseType
 import numpy
 try:
@@ -28,6 +28,7 @@ from itertools import repeat
 import logging
 from copy import copy, deepcopy
 
+from lazyarray import larray
 from lazyarray import arccos, arcsin, arctan, arctan2, ceil, cos, cosh, exp, \
                       fabs, floor, fmod, hypot, ldexp, log, log10, modf, power, \
                       sin, sinh, sqrt, tan, tanh, maximum, minimum
@@ -51,6 +52,23 @@ def _get_rng(rng):
         raise Exception("rng must be either None, or a subclass of pyNN.random.AbstractRNG")
 
 
+def _get_rngs(obj):
+    """
+    Return a list of the random number generators used by a lazy array or by
+    the lazy arrays contained in a parameter space.
+    """
+    rngs = []
+    if isinstance(obj, ParameterSpace):
+        for name, value in obj.items():
+            rngs.extend(_get_rngs(value))
+    elif isinstance(obj, larray):
+        if isinstance(obj.base_value, RandomDistribution):
+            rngs.append(obj.base_value.rng)
+        for f, arg in obj.operations:
+            rngs.extend(_get_rngs(arg))
+    return rngs
+
+
 class Connector(object):
     """
     Base class for connectors.
@@ -139,7 +157,98 @@ class MapConnector(Connector):
     Abstract base class for Connectors based on connection maps, where a map is a 2D lazy array
     containing either the (boolean) connectivity matrix (aka adjacency matrix, connection set mask, etc.)
     or the values of a synaptic connection parameter.
+
+    Connections are created block-wise: the columns of the connection map (i.e. the post-synaptic
+    neurons) are processed in tiles, and all the connections of a tile are passed to the
+    projection's `_connect_batch()` method in one go. The `tile_size` attribute gives the
+    maximum number of elements of the connection map (pre-post pairs) evaluated at once, and
+    may be changed to trade off speed against peak memory use.
     """
+    tile_size = 1000000
+
+    def _is_parallel_safe(self, projection, rngs=None):
+        """
+        Return True if random numbers have to be drawn for all post-synaptic neurons, including
+        those on other MPI nodes, so as to obtain the same values whatever the number of nodes.
+
+        `rngs` is a list of the RNGs used to determine which connections are made, which draw the
+        numbers for each post-synaptic neuron from a separate substream if they are splittable
+        (see :class:`~pyNN.random.PhiloxRNG`). By default, the connector's `rng` is assumed to be
+        used sequentially. Splittable RNGs used for the synaptic parameters never require
+        iterating over all neurons.
+        """
+        column_rngs = _get_rngs(projection.synapse_type.native_parameters)
+        if rngs is None:
+            sequential_rngs = [self.rng] if hasattr(self, "rng") else []
+        else:
+            sequential_rngs = []
+            column_rngs += rngs
+        return (any(rng.parallel_safe for rng in sequential_rngs)
+                or any(rng.parallel_safe and not rng.splittable for rng in column_rngs))
+
+    def _column_streams(self, parameter_space):
+        """
+        Reserve a family of random number substreams for each synaptic parameter whose values are
+        drawn from a splittable RNG. Returns a dict containing the stream identifiers.
+        """
+        return dict((name, map.base_value.rng.split())
+                    for name, map in parameter_space.items()
+                    if isinstance(map.base_value, RandomDistribution) and map.base_value.rng.splittable)
+
+    def _columns_per_tile(self, projection, rngs):
+        """
+        Return the number of post-synaptic neurons to be handled in each tile.
+
+        `rngs` is a list of the RNGs that will be used while creating connections. Random numbers
+        are drawn tile by tile, so if two or more of the lazy arrays share an RNG we handle one
+        column at a time, which preserves the order in which the numbers are consumed.
+        """
+        if len(set(id(rng) for rng in rngs)) < len(rngs):
+            return 1
+        return max(1, self.tile_size // max(projection.pre.size, 1))
+
+    def _connect_tile(self, projection, parameter_space, presynaptic_indices,
+                      postsynaptic_indices, local, streams=None):
+        """
+        Evaluate the synaptic parameters for the given (pre, post) index pairs and create the
+        connections whose post-synaptic neuron exists on the local MPI node.
+
+        `local` is a boolean array with one element per pair. `streams` is a dict, as returned by
+        `_column_streams()`, for those parameters whose values are drawn from a splittable RNG.
+        """
+        if presynaptic_indices.size == 0:
+            return
+        streams = streams or {}
+        connection_parameters = {}
+        for name, map in parameter_space.items():
+            if map.is_homogeneous:
+                connection_parameters[name] = map.evaluate(simplify=True)
+            elif name in streams:
+                continue  # evaluated below, for the local connections only
+            else:
+                connection_parameters[name] = numpy.atleast_1d(
+                    map[presynaptic_indices, postsynaptic_indices])
+
+        if not local.all():
+            presynaptic_indices = presynaptic_indices[local]
+            postsynaptic_indices = postsynaptic_indices[local]
+            for name, value in connection_parameters.items():
+                if isinstance(value, numpy.ndarray):
+                    connection_parameters[name] = value[local]
+        for name, stream in streams.items():
+            # the values for each post-synaptic neuron come from its own substream, so they
+            # do not depend on which neurons are on this MPI node
+            map = parameter_space[name]
+            order = numpy.argsort(postsynaptic_indices, kind='mergesort')
+            columns, counts = numpy.unique(postsynaptic_indices[order], return_counts=True)
+            drawn = map.base_value.next_by_column(counts, columns, stream)
+            values = numpy.empty_like(drawn)
+            values[order] = drawn
+            connection_parameters[name] = map._apply_operations(
+                values, (presynaptic_indices, postsynaptic_indices))
+        if presynaptic_indices.size > 0:
+            projection._connect_batch(presynaptic_indices, postsynaptic_indices,
+                                      **connection_parameters)
 
     def _standard_connect(self, projection, connection_map_generator, distance_map=None):
         """
@@ -163,8 +272,7 @@ class MapConnector(Connector):
 
         column_indices = numpy.arange(projection.post.size)
 
-        if (projection.synapse_type.native_parameters.parallel_safe
-            or hasattr(self, "rng") and self.rng.parallel_safe):
+        if self._is_parallel_safe(projection):
 
             # If any of the synapse parameters are based on parallel-safe random number generators,
             # we need to iterate over all post-synaptic cells, so we can generate then
@@ -183,53 +291,46 @@ class MapConnector(Connector):
                 connection_map_generator(mask))
 
         parameter_space = self._parameters_from_synapse_type(projection, distance_map)
-
-        # Loop over columns of the connection_map array (equivalent to looping over post-synaptic neurons)
-        for count, (col, local, source_mask) in enumerate(izip(*components)):
+        streams = self._column_streams(parameter_space)
+        rngs = _get_rngs(parameter_space)
+        if hasattr(self, "rng"):
+            rngs.append(self.rng)
+        if isinstance(getattr(self, "n", None), RandomDistribution):
+            rngs.append(self.n.rng)
+        columns_per_tile = self._columns_per_tile(projection, rngs)
+        n_columns = len(components[0])
+
+        # Loop over columns of the connection_map array (equivalent to looping over post-synaptic neurons),
+        # gathering them into tiles
+        tile = []
+        for count, (col, local, source_mask) in enumerate(izip(*components), 1):
             # `col`: index of the post-synaptic neuron
             # `local`: boolean - does the post-synaptic neuron exist on this MPI node
             # `source_mask` - boolean numpy array, indicating which of the pre-synaptic neurons should be connected to,
             #                 or a single boolean, meaning connect to all/none of the pre-synaptic neurons
             #                 It can also be an array of addresses
-            _proceed = False 
-            if source_mask is True or source_mask.any():
-                _proceed = True
-            elif type(source_mask) == numpy.ndarray:
+            # Convert from boolean to integer mask, if necessary
+            if source_mask is True:
+                sources = numpy.arange(projection.pre.size, dtype=int)
+            elif source_mask is False:
+                sources = numpy.array([], dtype=int)
+            else:
+                source_mask = numpy.asarray(source_mask)
                 if source_mask.dtype == bool:
-                    if source_mask.any():
-                        _proceed = True
-                elif len(source_mask) > 0:
-                    _proceed = True
-            if _proceed:
-                # Convert from boolean to integer mask, if necessary
-                if source_mask is True:
-                    source_mask = numpy.arange(projection.pre.size, dtype=int)
-                elif source_mask.dtype == bool:
-                    source_mask = source_mask.nonzero()[0]
-            
-                # Evaluate the lazy arrays containing the synaptic parameters
-                connection_parameters = {}
-                for name, map in parameter_space.items():
-                    if map.is_homogeneous:
-                        connection_parameters[name] = map.evaluate(simplify=True)
-                    else:
-                        connection_parameters[name] = map[source_mask, col]
-
-#                # Check that parameter values are valid
-#                if self.safe:
-#                    # (might be cheaper to do the weight and delay check before evaluating the larray)
-#                    weights = check_weights(weights, projection.synapse_type, is_conductance(projection.post.local_cells[0]))
-#                    delays = check_delays(delays,
-#                                          projection._simulator.state.min_delay,
-#                                          projection._simulator.state.max_delay)
-#                    # TODO: add checks for plasticity parameters
-
-                if local:
-                    # Connect the neurons
-                    #logger.debug("Connecting to %d from %s" % (col, source_mask))
-                    projection._convergent_connect(source_mask, col, **connection_parameters)
-                    if self.callback:
-                        self.callback(count / projection.post.local_size)
+                    sources = source_mask.nonzero()[0]
+                else:
+                    sources = source_mask.astype(int)
+            tile.append((col, local, sources))
+            if len(tile) == columns_per_tile or count == n_columns:
+                sizes = [sources.size for (col, local, sources) in tile]
+                self._connect_tile(projection, parameter_space,
+                                   numpy.hstack([sources for (col, local, sources) in tile]).astype(int),
+                                   numpy.repeat([col for (col, local, sources) in tile], sizes),
+                                   numpy.repeat([local for (col, local, sources) in tile], sizes).astype(bool),
+                                   streams)
+                tile = []
+                if self.callback:
+                    self.callback(count / n_columns)
 
     def _connect_with_map(self, projection, connection_map, distance_map=None):
         """
@@ -245,7 +346,40 @@ class MapConnector(Connector):
                 TODO
         """
         logger.debug("Connecting %s using a connection map" % projection.label)
-        self._standard_connect(projection, connection_map.by_column, distance_map)
+        if self._is_parallel_safe(projection, _get_rngs(connection_map)):
+            # see comment in _standard_connect()
+            logger.debug("Parallel-safe iteration.")
+            mask = None
+            n_columns = projection.post.size
+        else:
+            mask = projection.post._mask_local
+            n_columns = projection.post._mask_local.sum()
+        parameter_space = self._parameters_from_synapse_type(projection, distance_map)
+        streams = self._column_streams(parameter_space)
+        rngs = _get_rngs(parameter_space) + _get_rngs(connection_map)
+        columns_per_tile = self._columns_per_tile(projection, rngs)
+        count = 0
+        for columns, block in connection_map.by_column_block(columns_per_tile, mask):
+            # `columns`: indices of the post-synaptic neurons in this tile
+            # `block`: boolean array with one column per post-synaptic neuron, indicating which of
+            #          the pre-synaptic neurons should be connected to, or a single boolean,
+            #          meaning connect to all/none of the pre-synaptic neurons
+            block = numpy.asarray(block)
+            if block.ndim == 0:
+                if block:
+                    block = numpy.ones((projection.pre.size, columns.size), dtype=bool)
+                else:
+                    block = numpy.zeros((projection.pre.size, columns.size), dtype=bool)
+            # transposing gives us the pairs in column order, i.e. sorted by post-synaptic index
+            column_positions, presynaptic_indices = block.T.astype(bool).nonzero()
+            postsynaptic_indices = columns[column_positions]
+            self._connect_tile(projection, parameter_space,
+                               presynaptic_indices, postsynaptic_indices,
+                               projection.post._mask_local[postsynaptic_indices],
+                               streams)
+            count += columns.size
+            if self.callback:
+                self.callback(count / n_columns)
 
 
 class AllToAllConnector(MapConnector):
@@ -341,11 +475,17 @@ class DistanceDependentProbabilityConnector(MapConnector):
             or only to other neurons in the Population.
         `rng`:
             an :class:`RNG` instance used to evaluate whether connections exist
+        `max_distance`:
+            if given, the connection probability is taken to be zero for all
+            pairs of cells separated by more than this distance. Only the
+            pairs within range are then considered, which is much faster
+            than evaluating `d_expression` for every pair when the
+            probability falls off quickly with distance.
     """
-    parameter_names = ('allow_self_connections', 'd_expression')
+    parameter_names = ('allow_self_connections', 'd_expression', 'max_distance')
 
     def __init__(self, d_expression, allow_self_connections=True,
-                 rng=None, safe=True, callback=None):
+                 rng=None, safe=True, callback=None, max_distance=None):
         """
         Create a new connector.
         """
@@ -362,8 +502,13 @@ class DistanceDependentProbabilityConnector(MapConnector):
         self.allow_self_connections = allow_self_connections
         self.distance_function = eval("lambda d: %s" % self.d_expression)
         self.rng = _get_rng(rng)
+        if max_distance is not None and max_distance < 0:
+            raise ValueError("max_distance must be non-negative")
+        self.max_distance = max_distance
 
     def connect(self, projection):
+        if self.max_distance is not None:
+            return self._connect_within_distance(projection)
         distance_map = self._generate_distance_map(projection)
         probability_map = self.distance_function(distance_map)
         random_map = LazyArray(RandomDistribution('uniform', (0, 1), rng=self.rng),
@@ -376,6 +521,61 @@ class DistanceDependentProbabilityConnector(MapConnector):
                 connection_map *= LazyArray(lambda i, j: i > j, shape=projection.shape)
         self._connect_with_map(projection, connection_map, distance_map)
 
+    def _connect_within_distance(self, projection):
+        """
+        Create connections considering only those pairs of cells separated by
+        no more than `max_distance`, which are found using a spatial index.
+
+        One random number is drawn for each such pair, in order of post-
+        synaptic then pre-synaptic index.
+        """
+        logger.debug("Connecting %s using pairs within %g" % (projection.label, self.max_distance))
+        distance_map = self._generate_distance_map(projection)
+        if self.rng.splittable:
+            # draw the numbers for each post-synaptic neuron from a separate substream
+            stream = self.rng.split()
+            parallel_safe = self._is_parallel_safe(projection, [self.rng])
+        else:
+            parallel_safe = self._is_parallel_safe(projection)
+        if parallel_safe:
+            # see comment in _standard_connect()
+            columns = numpy.arange(projection.post.size)
+        else:
+            columns = numpy.arange(projection.post.size)[projection.post._mask_local]
+        parameter_space = self._parameters_from_synapse_type(projection, distance_map)
+        streams = self._column_streams(parameter_space)
+        rngs = _get_rngs(parameter_space) + [self.rng]
+        columns_per_tile = self._columns_per_tile(projection, rngs)
+        presynaptic_positions = projection.pre.positions.T
+        postsynaptic_positions = projection.post.positions.T
+        for start in range(0, columns.size, columns_per_tile):
+            tile = columns[start:start + columns_per_tile]
+            presynaptic_indices, column_positions, distances = \
+                projection.space.pairs_within_distance(presynaptic_positions,
+                                                       postsynaptic_positions[tile],
+                                                       self.max_distance)
+            postsynaptic_indices = tile[column_positions]
+            probabilities = self.distance_function(distances)
+            if self.rng.splittable:
+                counts = numpy.bincount(column_positions, minlength=tile.size)
+                random_values = self.rng.next_by_column(counts, tile, 'uniform', {'low': 0.0, 'high': 1.0},
+                                                        stream=stream)
+            else:
+                random_values = self.rng.next(distances.size, 'uniform', {'low': 0.0, 'high': 1.0},
+                                              mask_local=False)
+            connect = random_values < probabilities
+            if projection.pre == projection.post:
+                if not self.allow_self_connections:
+                    connect &= presynaptic_indices != postsynaptic_indices
+                elif self.allow_self_connections == 'NoMutual':
+                    connect &= presynaptic_indices > postsynaptic_indices
+            self._connect_tile(projection, parameter_space,
+                               presynaptic_indices[connect], postsynaptic_indices[connect],
+                               projection.post._mask_local[postsynaptic_indices[connect]],
+                               streams)
+            if self.callback:
+                self.callback((start + tile.size) / columns.size)
+
 
 class IndexBasedProbabilityConnector(MapConnector):
     """
@@ -443,7 +643,8 @@ class DisplacementDependentProbabilityConnector(IndexBasedProbabilityConnector):
             self._disp_function = disp_function
 
         def __call__(self, i, j):
-            disp = (self.projection.post.positions.T[j] - self.projection.pre.positions.T[i]).T
+            disp = self.projection.post.positions.T[j] - self.projection.pre.positions.T[i]
+            disp = numpy.rollaxis(disp, -1)  # put the x, y, z axis first, whatever the shape of i and j
             return self._disp_function(disp)
 
     def __init__(self, disp_function, allow_self_connections=True,
@@ -518,26 +719,27 @@ class FromListConnector(Connector):
                            assume_unique=True)
         local_targets = targets[local]
         self.conn_list = self.conn_list[idx]
-        left = numpy.searchsorted(self.conn_list[:, 1], local_targets, 'left')
-        right = numpy.searchsorted(self.conn_list[:, 1], local_targets, 'right')
         logger.debug("idx = %s", idx)
         logger.debug("targets = %s", targets)
         logger.debug("local_targets = %s", local_targets)
         logger.debug("conn_list (sorted by target) = \n%s", self.conn_list)
-        logger.debug("left = %s", left)
-        logger.debug("right = %s", right)
-
-        for tgt, l, r in zip(local_targets, left, right):
-            sources = self.conn_list[l:r, 0].astype(numpy.int)
-            connection_parameters = deepcopy(projection.synapse_type.parameter_space)
-            connection_parameters.shape = (r - l,)
-            for col, name in enumerate(self.column_names, 2):
-                connection_parameters.update(**{name: self.conn_list[l:r, col]})
-            if isinstance(projection.synapse_type, StandardSynapseType):
-                connection_parameters = projection.synapse_type.translate(
-                                            connection_parameters)
-            connection_parameters.evaluate()
-            projection._convergent_connect(sources, tgt, **connection_parameters)
+
+        # the parameters of all the local connections are translated and
+        # evaluated together, rather than once per target
+        local_conn_list = self.conn_list[numpy.in1d(self.conn_list[:, 1], local_targets)]
+        if local_conn_list.shape[0] == 0:
+            return
+        connection_parameters = deepcopy(projection.synapse_type.parameter_space)
+        connection_parameters.shape = (local_conn_list.shape[0],)
+        for col, name in enumerate(self.column_names, 2):
+            connection_parameters.update(**{name: local_conn_list[:, col]})
+        if isinstance(projection.synapse_type, StandardSynapseType):
+            connection_parameters = projection.synapse_type.translate(
+                                        connection_parameters)
+        connection_parameters.evaluate()
+        projection._connect_batch(local_conn_list[:, 0].astype(numpy.int),
+                                  local_conn_list[:, 1].astype(numpy.int),
+                                  **connection_parameters)
 
 
 class FromFileConnector(FromListConnector):
@@ -658,43 +860,94 @@ class FixedNumberPostConnector(FixedNumberConnector):
             are created.
     """
 
-    def _get_num_post(self):
+    def _get_num_post(self, size):
         if isinstance(self.n, int):
-            n_post = self.n
+            n_post = numpy.repeat(self.n, size)
         else:
-            n_post = self.n.next()
+            n_post = numpy.atleast_1d(self.n.next(size, mask_local=False)).astype(int)
         return n_post
 
-    def connect(self, projection):
-        connections = [[] for i in range(projection.post.size)]
-        for source_index in range(projection.pre.size):
-            n = self._get_num_post()
+    def _draw_targets(self, projection, source_indices, n_post):
+        """
+        Choose the post-synaptic neurons for each of the given pre-synaptic
+        neurons. `n_post` gives the number of targets of each source.
+
+        Returns a flat array of targets, in order of source.
+        """
+        exclude_self = not self.allow_self_connections and projection.pre == projection.post
+        if self.with_replacement and not exclude_self:
+            # all the targets are drawn in one go
+            return self.rng.next(n_post.sum(), 'uniform_int', {"low": 0, "high": projection.post.size},
+                                 mask_local=False).astype(int)
+        target_sets = []
+        all_cells = numpy.arange(projection.post.size)
+        for source_index, n in zip(source_indices, n_post):
             if self.with_replacement:
-                if not self.allow_self_connections and projection.pre == projection.post:
-                    targets = self._rng_uniform_int_exclude(n, projection.post.size, source_index)
-                else:
-                    targets = self.rng.next(n, 'uniform_int', {"low": 0, "high": projection.post.size}, mask_local=False)
+                targets = self._rng_uniform_int_exclude(n, projection.post.size, source_index)
             else:
-                all_cells = numpy.arange(projection.post.size)
-                if not self.allow_self_connections and projection.pre == projection.post:
-                    all_cells = all_cells[all_cells != source_index]
-                full_sets = n // all_cells.size
-                remainder = n % all_cells.size
-                target_sets = []
-                if full_sets > 0:
-                    target_sets = [all_cells] * full_sets
+                allowed_cells = all_cells
+                if exclude_self:
+                    allowed_cells = all_cells[all_cells != source_index]
+                full_sets = n // allowed_cells.size
+                remainder = n % allowed_cells.size
+                targets = [allowed_cells] * full_sets
                 if remainder > 0:
-                    target_sets.append(self.rng.permutation(all_cells)[:remainder])
-                targets = numpy.hstack(target_sets)
+                    targets.append(self.rng.permutation(allowed_cells)[:remainder])
+                targets = numpy.hstack(targets) if targets else numpy.array([], dtype=int)
             assert targets.size == n
-            for target_index in targets:
-                connections[target_index].append(source_index)
+            target_sets.append(targets)
+        return numpy.hstack(target_sets).astype(int)
 
-        def build_source_masks(mask=None):
-            if mask is None:
-                return [numpy.array(x) for x in connections]
+    def connect(self, projection):
+        # Targets are drawn for batches of pre-synaptic neurons, then the
+        # (source, target) pairs are sorted by target to give the sources of
+        # each post-synaptic neuron, in compressed sparse column form.
+        # Random numbers are drawn for every pre-synaptic neuron on every MPI
+        # node, but we only keep the connections to local post-synaptic neurons,
+        # unless the synapse parameters require parallel-safe iteration over
+        # all connections.
+        keep_all = self._is_parallel_safe(projection, rngs=[])
+        mask_local = projection.post._mask_local
+        shared_rng = isinstance(self.n, RandomDistribution) and self.n.rng is self.rng
+        if shared_rng:
+            # preserve the order in which random numbers are consumed
+            batches = [(i, i + 1) for i in range(projection.pre.size)]
+        else:
+            n_post = self._get_num_post(projection.pre.size)
+            # split the sources into batches of about `tile_size` connections
+            batch_ends = numpy.searchsorted(numpy.cumsum(n_post),
+                                            numpy.arange(self.tile_size, n_post.sum(), self.tile_size),
+                                            side='right')
+            boundaries = numpy.unique(numpy.hstack((0, batch_ends, projection.pre.size)))
+            batches = zip(boundaries[:-1], boundaries[1:])
+        sources = [numpy.array([], dtype=int)]
+        targets = [numpy.array([], dtype=int)]
+        for start, stop in batches:
+            source_indices = numpy.arange(start, stop)
+            if shared_rng:
+                n = self._get_num_post(1)
             else:
-                return [numpy.array(x) for x in numpy.array(connections)[mask]]
+                n = n_post[start:stop]
+            batch_targets = self._draw_targets(projection, source_indices, n)
+            batch_sources = numpy.repeat(source_indices, n)
+            if not keep_all:
+                local = mask_local[batch_targets]
+                batch_sources = batch_sources[local]
+                batch_targets = batch_targets[local]
+            sources.append(batch_sources)
+            targets.append(batch_targets)
+        sources = numpy.hstack(sources).astype(int)
+        targets = numpy.hstack(targets).astype(int)
+        # a stable sort keeps the sources of each target in the order they were drawn
+        order = numpy.argsort(targets, kind='mergesort')
+        sources = sources[order]
+        column_pointers = numpy.hstack((0, numpy.cumsum(numpy.bincount(targets, minlength=projection.post.size))))
+
+        def build_source_masks(mask=None):
+            columns = numpy.arange(projection.post.size)
+            if mask is not None:
+                columns = columns[mask]
+            return (sources[column_pointers[j]:column_pointers[j + 1]] for j in columns)
         self._standard_connect(projection, build_source_masks)
 
 
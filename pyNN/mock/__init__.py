@@ -34,6 +34,7 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
     max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
     common.setup(timestep, min_delay, **extra_params)
     simulator.state.clear()
+    simulator.state.cache_memory_limit = extra_params.get('cache_memory_limit', None)
     simulator.state.dt = timestep  # move to common.setup?
     simulator.state.min_delay = min_delay
     simulator.state.max_delay = max_delay
@@ -48,6 +49,9 @@ def end(compatible_output=True):
         io = get_io(filename)
         population.write_data(io, variables)
     simulator.state.write_on_end = []
+    for handler in simulator.state.stream_handlers:
+        handler.close()
+    simulator.state.stream_handlers = []
     # should have common implementation of end()
 
 run, run_until = common.build_run(simulator)
@@ -20,16 +20,16 @@ class PopulationView(common.PopulationView):
         """
         parameter_dict = {}
         for name in names:
-            value = self.parent._parameters[name]
+            value = self.grandparent._parameters[name]
             if isinstance(value, numpy.ndarray):
-                value = value[self.mask]
+                value = value[self._index_in_grandparent]
             parameter_dict[name] = simplify(value)
         return ParameterSpace(parameter_dict, shape=(self.size,))  # or local size?
 
     def _set_parameters(self, parameter_space):
         """parameter_space should contain native parameters"""
         for name, value in parameter_space.items():
-            self.parent._parameters[name][self.mask] = value.evaluate(simplify=True)
+            self.grandparent._parameters[name][self._index_in_grandparent] = value.evaluate(simplify=True)
 
     def _set_initial_value_array(self, variable, initial_values):
         pass
@@ -45,14 +45,12 @@ class Population(common.Population):
     _assembly_class = Assembly
 
     def _create_cells(self):
-        id_range = numpy.arange(simulator.state.id_counter,
-                                simulator.state.id_counter + self.size)
-        self.all_cells = numpy.array([simulator.ID(id) for id in id_range],
-                                     dtype=simulator.ID)
+        self._all_ids = numpy.arange(simulator.state.id_counter,
+                                     simulator.state.id_counter + self.size)
 
         def is_local(id):
             return (id % simulator.state.num_processes) == simulator.state.mpi_rank
-        self._mask_local = is_local(self.all_cells)
+        self._mask_local = is_local(self._all_ids)
         
         if isinstance(self.celltype, StandardCellType):
             parameter_space = self.celltype.native_parameters
@@ -62,8 +60,6 @@ class Population(common.Population):
         parameter_space.evaluate(mask=self._mask_local, simplify=False)
         self._parameters = parameter_space.as_dict()
         
-        for id in self.all_cells:
-            id.parent = self
         simulator.state.id_counter += self.size
 
     def _set_initial_value_array(self, variable, initial_values):
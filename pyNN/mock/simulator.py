@@ -30,6 +30,7 @@ class State(common.control.BaseState):
 
     def clear(self):
         self.recorders = set([])
+        self.stream_handlers = []
         self.id_counter = 42
         self.segment_counter = -1
         self.reset()
@@ -115,14 +115,22 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
         a list of seeds, one for each thread on each MPI process
     `rng_seeds_seed`:
         a single seed that will be used to generate random values for `rng_seeds`
+    `native_connection_rules`:
+        if True (default), connectors which have an equivalent among NEST's
+        built-in connection rules use it when possible, drawing random numbers
+        with NEST's own generators rather than with the connector's `rng`. Set
+        to False to obtain reproducible connections, identical to those
+        created by the other backends.
     """
     max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
     common.setup(timestep, min_delay, **extra_params)
     simulator.state.clear()
+    simulator.state.cache_memory_limit = extra_params.get('cache_memory_limit', None)
     for key in ("verbosity", "spike_precision", "recording_precision",
                 "threads"):
         if key in extra_params:
             setattr(simulator.state, key, extra_params[key])
+    simulator.state.native_connection_rules = extra_params.get('native_connection_rules', True)
     # set kernel RNG seeds
     simulator.state.num_threads = extra_params.get('threads') or 1
     if 'grng_seed' in extra_params:
@@ -151,6 +159,9 @@ def end():
         shutil.rmtree(tempdir)
     simulator.state.tempdirs = []
     simulator.state.write_on_end = []
+    for handler in simulator.state.stream_handlers:
+        handler.close()
+    simulator.state.stream_handlers = []
 
 run, run_until = common.build_run(simulator)
 run_for = run
@@ -13,7 +13,7 @@ try:
     haveCSA = True
 except ImportError:
     haveCSA = False
-from pyNN import random
+from pyNN import random, errors
 from pyNN.connectors import (Connector,
                              AllToAllConnector,
                              FixedProbabilityConnector,
@@ -30,7 +30,9 @@ from pyNN.connectors import (Connector,
                              ArrayConnector,
                              FixedTotalNumberConnector)
 
+from . import simulator
 from .random import NativeRNG, NEST_RDEV_TYPES
+from .synapses import NativeSynapseType
 
 
 logger = logging.getLogger("PyNN")
@@ -79,8 +81,8 @@ else:
         def connect(self, projection):
             """Connect-up a Projection."""
 
-            presynaptic_cells = projection.pre.all_cells.astype('int64')
-            postsynaptic_cells = projection.post.all_cells.astype('int64')
+            presynaptic_cells = projection.pre._all_ids.astype('int64')
+            postsynaptic_cells = projection.post._all_ids.astype('int64')
 
             if csa.arity(self.cset) == 2:
                 param_map = {'weight': 0, 'delay': 1}
@@ -95,6 +97,62 @@ else:
 
 
 class NESTConnectorMixin(object):
+    """
+    Mixin for connectors which can be implemented using one of NEST's built-in
+    connection rules, so that the connections are created in C++ by a single
+    call to `nest.Connect()`, rather than by PyNN's column-wise Python loop.
+
+    The native rule is used when all synapse parameters are either homogeneous
+    or random distributions using a :class:`NativeRNG`. Since NEST uses its own
+    random number generators, the connector's `rng` (a Python RNG, or the
+    default one) is then not used, and the resulting connectivity will differ
+    from that created by the Python implementation. To obtain reproducible
+    connections, identical to those created by the other backends, call
+    ``setup(native_connection_rules=False)``.
+    """
+    nest_rule = None
+
+    def connect(self, projection):
+        if self._use_native_rule(projection):
+            return self.native_connect(projection)
+        else:
+            return super(NESTConnectorMixin, self).connect(projection)
+
+    def _use_native_rule(self, projection):
+        """
+        Determine whether the projection should be built using NEST's native
+        connection rule.
+        """
+        parameter_space = projection.synapse_type.native_parameters
+        native_rngs = (parameter_space.has_native_rngs
+                       or isinstance(getattr(self, "rng", None), NativeRNG))
+        if native_rngs:
+            # random numbers can only be drawn by NEST in this case
+            if not self._native_rule_supported(projection):
+                raise errors.ConnectionError(
+                    "%s with these arguments cannot be used with NativeRNG" % self.__class__.__name__)
+            return True
+        if not simulator.state.native_connection_rules:
+            return False
+        if isinstance(projection.synapse_type, NativeSynapseType):
+            return False  # native synapse models may have common properties, which cannot be set by nest.Connect()
+        if not hasattr(projection.post, "celltype"):
+            return False  # an Assembly may contain several cell types
+        if not all(value.is_homogeneous for name, value in parameter_space.items()):
+            return False  # array-valued parameters, or random values drawn by a Python RNG
+        return self._native_rule_supported(projection)
+
+    def _native_rule_supported(self, projection):
+        """
+        Return True if the connector's arguments can be expressed using the
+        parameters of NEST's connection rule.
+        """
+        return isinstance(getattr(self, "allow_self_connections", True), bool)
+
+    def rule_parameters(self, projection):
+        return {'rule': self.nest_rule,
+                'autapses': getattr(self, "allow_self_connections", True),
+                'multapses': getattr(self, "with_replacement", False)}
 
     def synapse_parameters(self, projection):
         params = {'model': projection.nest_synapse_model}
@@ -111,115 +169,87 @@ class NESTConnectorMixin(object):
                     params[name] = value.evaluate()
             else:                                             # explicit values given
                 if value.is_homogeneous:
-                    params[name] = value.evaluate(simplify=True)
+                    params[name] = float(value.evaluate(simplify=True))  # NEST chokes on numpy's float types
                 elif value.shape:
                     params[name] = value.evaluate().flatten()  # If parameter is given as an array or function
                 else:
                     value.shape = (1, 1)
                     params[name] = float(value.evaluate())  # If parameter is given as a single number. Checking of the dimensions should be done in NEST
-                if name == "weight" and projection.receptor_type == 'inhibitory' and self.post.conductance_based:
-                    params[name] *= -1  # NEST wants negative values for inhibitory weights, even if these are conductances
+                if name == "weight":
+                    if projection.receptor_type == 'inhibitory' and projection.post.conductance_based:
+                        params[name] *= -1  # NEST wants negative values for inhibitory weights, even if these are conductances
+                    if hasattr(projection.post, "celltype") and hasattr(projection.post.celltype, "receptor_scale"):
+                        params[name] *= projection.post.celltype.receptor_scale  # needed for the Izhikevich model
+        if hasattr(projection.post, "celltype") and not projection.post.celltype.standard_receptor_type:
+            params['receptor_type'] = projection.post.celltype.get_receptor_type(projection.receptor_type)
         return params
 
-
-class FixedProbabilityConnector(FixedProbabilityConnector, NESTConnectorMixin):
-
-    def connect(self, projection):
-        if projection.synapse_type.native_parameters.has_native_rngs or isinstance(self.rng, NativeRNG):
-            return self.native_connect(projection)
-        else:
-            return super(FixedProbabilityConnector, self).connect(projection)
-
     def native_connect(self, projection):
         syn_params = self.synapse_parameters(projection)
-        rule_params = {'autapses': self.allow_self_connections,
-                       'multapses': False,
-                       'rule': 'pairwise_bernoulli',
-                       'p': self.p_connect}
+        rule_params = self.rule_parameters(projection)
         projection._connect(rule_params, syn_params)
+        if self.callback:
+            self.callback(1.0)
 
 
-class AllToAllConnector(AllToAllConnector, NESTConnectorMixin):
+class AllToAllConnector(NESTConnectorMixin, AllToAllConnector):
+    __doc__ = AllToAllConnector.__doc__
+    nest_rule = 'all_to_all'
 
-    def connect(self, projection):
-        if projection.synapse_type.native_parameters.has_native_rngs:  # or projection.synapse_type.native_parameters.non_random:  TODO
-            return self.native_connect(projection)
-        else:
-            return super(AllToAllConnector, self).connect(projection)
 
-    def native_connect(self, projection):
-        syn_params = self.synapse_parameters(projection)
-        rule_params = {'autapses': self.allow_self_connections,
-                       'multapses': False,
-                       'rule': 'all_to_all'}
-        projection._connect(rule_params, syn_params)
+class OneToOneConnector(NESTConnectorMixin, OneToOneConnector):
+    __doc__ = OneToOneConnector.__doc__
+    nest_rule = 'one_to_one'
+
+
+class FixedProbabilityConnector(NESTConnectorMixin, FixedProbabilityConnector):
+    __doc__ = FixedProbabilityConnector.__doc__
+    nest_rule = 'pairwise_bernoulli'
+
+    def rule_parameters(self, projection):
+        rule_params = super(FixedProbabilityConnector, self).rule_parameters(projection)
+        rule_params['p'] = self.p_connect
+        return rule_params
+
+
+class FixedNumberPreConnector(NESTConnectorMixin, FixedNumberPreConnector):
+    __doc__ = FixedNumberPreConnector.__doc__
+    nest_rule = 'fixed_indegree'
+
+    def _native_rule_supported(self, projection):
+        return (isinstance(self.n, int)
+                and super(FixedNumberPreConnector, self)._native_rule_supported(projection))
+
+    def rule_parameters(self, projection):
+        rule_params = super(FixedNumberPreConnector, self).rule_parameters(projection)
+        rule_params['indegree'] = self.n
+        return rule_params
+
+
+class FixedNumberPostConnector(NESTConnectorMixin, FixedNumberPostConnector):
+    __doc__ = FixedNumberPostConnector.__doc__
+    nest_rule = 'fixed_outdegree'
+
+    def _native_rule_supported(self, projection):
+        return (isinstance(self.n, int)
+                and super(FixedNumberPostConnector, self)._native_rule_supported(projection))
+
+    def rule_parameters(self, projection):
+        rule_params = super(FixedNumberPostConnector, self).rule_parameters(projection)
+        rule_params['outdegree'] = self.n
+        return rule_params
+
+
+class FixedTotalNumberConnector(NESTConnectorMixin, FixedTotalNumberConnector):
+    __doc__ = FixedTotalNumberConnector.__doc__
+    nest_rule = 'fixed_total_number'
 
+    def _native_rule_supported(self, projection):
+        # NEST does not support suppression of multapses with this rule
+        return (isinstance(self.n, int) and self.with_replacement
+                and super(FixedTotalNumberConnector, self)._native_rule_supported(projection))
 
-#class OneToOneConnector():
-#
-#    def __init__(self, allow_self_connections=True, with_replacement=True, safe=True,
-#                 callback=None):
-#        self.allow_self_connections = allow_self_connections
-#        self.with_replacement = with_replacement
-#
-#    def connect(self, projection):
-#        syn_params = projection.synapse_parameters()
-#        rule_params = {'autapses': self.allow_self_connections,
-#                       'multapses': self.with_replacement,
-#                       'rule': 'one_to_one'}
-#
-#        projection._connect(rule_params, syn_params)
-#
-#
-#class FixedNumberPreConnector():
-#
-#    def __init__(self, n, allow_self_connections=True, with_replacement=True, safe=True,
-#                 callback=None, rng=None):
-#        self.allow_self_connections = allow_self_connections
-#        self.with_replacement = with_replacement
-#        self.n = n
-#
-#    def connect(self, projection):
-#        syn_params = projection.synapse_parameters()
-#        rule_params = {'autapses': self.allow_self_connections,
-#                       'multapses': self.with_replacement,
-#                       'rule': 'fixed_indegree',
-#                       'indegree': self.n }
-#
-#        projection._connect(rule_params, syn_params)
-#
-#
-#class FixedNumberPostConnector():
-#
-#    def __init__(self, n, allow_self_connections=True, with_replacement=True, safe=True,
-#                 callback=None, rng=None):
-#        self.allow_self_connections = allow_self_connections
-#        self.with_replacement = with_replacement
-#        self.n = n
-#
-#    def connect(self, projection):
-#        syn_params = projection.synapse_parameters()
-#        rule_params = {'autapses': self.allow_self_connections,
-#                       'multapses': self.with_replacement,
-#                       'rule': 'fixed_outdegree',
-#                       'outdegree': self.n }
-#
-#        projection._connect(rule_params, syn_params)
-#
-#
-#class FixedTotalNumberConnector():
-#
-#    def __init__(self, n, allow_self_connections=True, with_replacement=True, safe=True,
-#                 callback=None):
-#        self.allow_self_connections = allow_self_connections
-#        self.with_replacement = with_replacement
-#        self.n = n
-#
-#    def connect(self, projection):
-#        syn_params = projection.synapse_parameters()
-#        rule_params = {'autapses': self.allow_self_connections,
-#                       'multapses': self.with_replacement,
-#                       'rule': 'fixed_total_number',
-#                       'N': self.n
-#                   }
-#        projection._connect(rule_params, syn_params)
+    def rule_parameters(self, projection):
+        rule_params = super(FixedTotalNumberConnector, self).rule_parameters(projection)
+        rule_params['N'] = self.n
+        return rule_params
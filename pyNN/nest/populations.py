@@ -29,19 +29,23 @@ class PopulationMixin(object):
         """
         parameter_space should contain native parameters
         """
-        param_dict = _build_params(parameter_space, numpy.where(self._mask_local)[0])
-        ids = self.local_cells.tolist()
+        param_dict, inhomogeneous_parameters = _split_params(parameter_space)
         if hasattr(self.celltype, "uses_parrot") and self.celltype.uses_parrot:
-            ids = [id.source for id in ids]
-        nest.SetStatus(ids, param_dict)
+            ids = [id.source for id in self.local_cells]
+        else:
+            ids = self._all_ids[self._mask_local].tolist()
+        if param_dict:
+            nest.SetStatus(ids, param_dict)
+        _set_inhomogeneous_params(ids, inhomogeneous_parameters,
+                                  numpy.where(self._mask_local)[0])
 
     def _get_parameters(self, *names):
         """
         return a ParameterSpace containing native parameters
         """
-        ids = self.local_cells.tolist()
+        ids = self._all_ids[self._mask_local].tolist()
         if hasattr(self.celltype, "uses_parrot") and self.celltype.uses_parrot:
-            ids = [id.source for id in ids]
+            ids = [id.source for id in self.local_cells]
 
         if "spike_times" in names:
             parameter_dict = {"spike_times": [Sequence(value) for value in nest.GetStatus(ids, names)]}
@@ -63,47 +67,70 @@ class PopulationView(common.PopulationView, PopulationMixin):
     _assembly_class = Assembly
 
 
-def _build_params(parameter_space, mask_local, size=None, extra_parameters=None):
+# The GIF model takes its adaptation parameters as arrays of three elements,
+# which PyNN handles as three separate parameters.
+GIF_PARAMETER_GROUPS = (
+    ('tau_sfa', ('tau_sfa1', 'tau_sfa2', 'tau_sfa3')),
+    ('q_sfa', ('q_sfa1', 'q_sfa2', 'q_sfa3')),
+    ('tau_stc', ('tau_stc1', 'tau_stc2', 'tau_stc3')),
+    ('q_stc', ('q_stc1', 'q_stc2', 'q_stc3')),
+)
+
+
+def _split_params(parameter_space, size=None, extra_parameters=None):
     """
-    Return either a single parameter dict or a list of dicts, suitable for use
-    in Create or SetStatus.
+    Split the parameters into those with the same value for all cells,
+    returned as a single parameter dict suitable for use in Create or
+    SetStatus, and those whose values differ between cells, returned,
+    unevaluated, as a ParameterSpace.
     """
     if "UNSUPPORTED" in parameter_space.keys():
         parameter_space.pop("UNSUPPORTED")
     if size:
         parameter_space.shape = (size,)
-    if parameter_space.is_homogeneous:
-        parameter_space.evaluate(simplify=True)
-        cell_parameters = parameter_space.as_dict()
-        if extra_parameters:
-            cell_parameters.update(extra_parameters)
-        for name, val in cell_parameters.items():
-            if isinstance(val, Sequence):
-                cell_parameters[name] = val.value
-        # The following is a temporary hack to get the gif_cond_exp model working.
-        # Longer-term, an extension to lazyarray would be the best approach
-        if 'tau_sfa1' in cell_parameters:
-            cell_parameters['tau_sfa'] = (cell_parameters.pop('tau_sfa1'), cell_parameters.pop('tau_sfa2'), cell_parameters.pop('tau_sfa3'))
-            cell_parameters['q_sfa'] = (cell_parameters.pop('q_sfa1'), cell_parameters.pop('q_sfa2'), cell_parameters.pop('q_sfa3'))
-            cell_parameters['tau_stc'] = (cell_parameters.pop('tau_stc1'), cell_parameters.pop('tau_stc2'), cell_parameters.pop('tau_stc3'))
-            cell_parameters['q_stc'] = (cell_parameters.pop('q_stc1'), cell_parameters.pop('q_stc2'), cell_parameters.pop('q_stc3'))
-    else:
-        parameter_space.evaluate(mask=mask_local)
-        cell_parameters = list(parameter_space)  # may not be the most efficient way.
-        # Might be best to set homogeneous parameters on creation,
-        # then inhomogeneous ones using SetStatus. Need some timings.
-        for D in cell_parameters:
-            if 'tau_sfa1' in D:  # temporary hack
-                D['tau_sfa'] = (D.pop('tau_sfa1'), D.pop('tau_sfa2'), D.pop('tau_sfa3'))
-                D['q_sfa'] = (D.pop('q_sfa1'), D.pop('q_sfa2'), D.pop('q_sfa3'))
-                D['tau_stc'] = (D.pop('tau_stc1'), D.pop('tau_stc2'), D.pop('tau_stc3'))
-                D['q_stc'] = (D.pop('q_stc1'), D.pop('q_stc2'), D.pop('q_stc3'))
-            for name, val in D.items():
-                if isinstance(val, Sequence):
-                    D[name] = val.value
-            if extra_parameters:
-                D.update(extra_parameters)
-    return cell_parameters
+    inhomogeneous = set(name for name, value in parameter_space.items()
+                        if not value.is_homogeneous)
+    for nest_name, names in GIF_PARAMETER_GROUPS:
+        if inhomogeneous.intersection(names):
+            inhomogeneous.update(names)
+    cell_parameters = {}
+    for name, value in parameter_space.items():
+        if name not in inhomogeneous:
+            value = value.evaluate(simplify=True)
+            if isinstance(value, Sequence):
+                value = value.value
+            cell_parameters[name] = value
+    for nest_name, names in GIF_PARAMETER_GROUPS:
+        if names[0] in cell_parameters:
+            cell_parameters[nest_name] = tuple(cell_parameters.pop(name) for name in names)
+    if extra_parameters:
+        cell_parameters.update(extra_parameters)
+    inhomogeneous_parameters = ParameterSpace(dict((name, parameter_space[name])
+                                                   for name in inhomogeneous),
+                                              shape=parameter_space.shape)
+    return cell_parameters, inhomogeneous_parameters
+
+
+def _set_inhomogeneous_params(ids, parameter_space, mask_local):
+    """
+    Set the parameters whose values differ between cells, with one
+    SetStatus call per parameter. `ids` should contain the local cells
+    selected by `mask_local`.
+    """
+    if not parameter_space.keys():
+        return
+    parameter_space.evaluate(mask=mask_local)
+    values = parameter_space.as_dict()
+    for nest_name, names in GIF_PARAMETER_GROUPS:
+        if names[0] in values:
+            components = numpy.broadcast_arrays(*(values.pop(name) for name in names))
+            values[nest_name] = numpy.column_stack(components)
+    for name, value in values.items():
+        if value.dtype == object:  # e.g. spike_times
+            value = [val.value if isinstance(val, Sequence) else val for val in value]
+        else:
+            value = value.tolist()
+        nest.SetStatus(ids, name, value)
 
 
 class Population(common.Population, PopulationMixin):
@@ -128,16 +155,23 @@ class Population(common.Population, PopulationMixin):
         nest_model = self.celltype.nest_name[simulator.state.spike_precision]
         if isinstance(self.celltype, StandardCellType):
             self.celltype.parameter_space.shape = (self.size,)  # should perhaps do this on a copy?
-            params = _build_params(self.celltype.native_parameters,
-                                   None,
-                                   size=self.size,
-                                   extra_parameters=self.celltype.extra_parameters)
+            params, inhomogeneous_parameters = _split_params(
+                self.celltype.native_parameters,
+                size=self.size,
+                extra_parameters=self.celltype.extra_parameters)
         else:
-            params = _build_params(self.celltype.parameter_space,
-                                   None,
-                                   size=self.size)
+            params, inhomogeneous_parameters = _split_params(self.celltype.parameter_space,
+                                                             size=self.size)
+        # create the cells with the parameters that are the same for all cells, then
+        # set the others one parameter at a time, which is much faster than passing
+        # a parameter dict for each cell
         try:
-            self.all_cells = nest.Create(nest_model, self.size, params=params)
+            gids = nest.Create(nest_model, self.size, params=params)
+            if inhomogeneous_parameters.keys():
+                mask_local = numpy.array(nest.GetStatus(gids, 'local'))
+                _set_inhomogeneous_params(numpy.array(gids)[mask_local].tolist(),
+                                          inhomogeneous_parameters,
+                                          numpy.where(mask_local)[0])
         except nest.NESTError as err:
             if "UnknownModelName" in err.args[0] and "cond" in err.args[0]:
                 raise errors.InvalidModelError("%s Have you compiled NEST with the GSL (Gnu Scientific Library)?" % err)
@@ -146,23 +180,24 @@ class Population(common.Population, PopulationMixin):
             raise  # errors.InvalidModelError(err)
         # create parrot neurons if necessary
         if hasattr(self.celltype, "uses_parrot") and self.celltype.uses_parrot:
-            self.all_cells_source = numpy.array(self.all_cells)        # we put the parrots into all_cells, since this will
+            self.all_cells_source = numpy.array(gids)                  # we put the parrots into all_cells, since this will
             parrot_model = simulator.state.spike_precision == "off_grid" and "parrot_neuron_ps" or "parrot_neuron"
-            self.all_cells = nest.Create(parrot_model, self.size)      # be used for connections and recording. all_cells_source
+            gids = nest.Create(parrot_model, self.size)                # be used for connections and recording. all_cells_source
                                                                        # should be used for setting parameters
             self._deferred_parrot_connections = True
             # connecting up the parrot neurons is deferred until we know the value of min_delay
             # which could be 'auto' at this point.
-        self._mask_local = numpy.array(nest.GetStatus(self.all_cells, 'local'))
-        self.all_cells = numpy.array([simulator.ID(gid) for gid in self.all_cells], simulator.ID)
-        for gid in self.all_cells:
-            gid.parent = self
+        self._mask_local = numpy.array(nest.GetStatus(gids, 'local'))
+        self._all_ids = numpy.array(gids, int)
+
+    def _make_id(self, index):
+        id = common.Population._make_id(self, index)
         if hasattr(self.celltype, "uses_parrot") and self.celltype.uses_parrot:
-            for gid, source in zip(self.all_cells, self.all_cells_source):
-                gid.source = source
+            id.source = self.all_cells_source[index]
+        return id
 
     def _connect_parrot_neurons(self):
-        nest.Connect(self.all_cells_source, numpy.array(self.all_cells, int), 'one_to_one',
+        nest.Connect(self.all_cells_source, self._all_ids, 'one_to_one',
                      syn_spec={'delay': simulator.state.min_delay})
         self._deferred_parrot_connections = False
 
@@ -173,7 +208,7 @@ class Population(common.Population, PopulationMixin):
         else:
             local_values = value._partially_evaluate(self._mask_local, simplify=True)
         try:
-            nest.SetStatus(self.local_cells.tolist(), variable, local_values)
+            nest.SetStatus(self._all_ids[self._mask_local].tolist(), variable, local_values)
         except nest.NESTError as e:
             if "Unused dictionary items" in e.args[0]:
                 logger.warning("NEST does not allow setting an initial value for %s" % variable)
@@ -34,6 +34,52 @@ def listify(obj):
         return obj
 
 
+def _one_to_one_value(value):
+    """
+    Convert a connection parameter to a form accepted in the `syn_spec` of
+    `nest.Connect()` with the 'one_to_one' rule.
+    """
+    if isinstance(value, numpy.ndarray):
+        return value.astype(float)
+    else:
+        return float(value)  # NEST chokes on numpy's float types
+
+
+def _select_new_connections(connections, sources, targets):
+    """
+    Select, from `connections` as returned by `nest.GetConnections()`, the
+    connections created for the (source, target) pairs given by the arrays
+    `sources` and `targets`, which may contain repeated pairs.
+
+    Where a pair has more connections than it appears in the arrays, the most
+    recently created are selected (NEST numbers the connections of each
+    source in order of creation). Returns an array with one row per selected
+    connection, sorted by source and target, and in order of creation for
+    repeated pairs, i.e. in the order given by
+    `numpy.lexsort((targets, sources))`.
+    """
+    connections = numpy.array(connections, dtype=int).reshape((-1, 5))
+    n_targets = max(targets.max(), connections[:, 1].max() if connections.size else 0) + 1
+    pair_keys = sources.astype(numpy.int64) * n_targets + targets
+    connection_keys = connections[:, 0].astype(numpy.int64) * n_targets + connections[:, 1]
+    # order connections by pair, then by connection number ("port")
+    order = numpy.lexsort((connections[:, 4], connection_keys))
+    connections = connections[order]
+    connection_keys = connection_keys[order]
+    # number of connections wanted for each pair
+    unique_keys, counts = numpy.unique(pair_keys, return_counts=True)
+    position = numpy.searchsorted(unique_keys, connection_keys)
+    position[position == unique_keys.size] = 0
+    wanted = numpy.where(unique_keys[position] == connection_keys, counts[position], 0)
+    # keep the last `wanted` connections of each pair
+    group_ends = numpy.searchsorted(connection_keys, connection_keys, side='right')
+    selected = connections[group_ends - numpy.arange(connection_keys.size) <= wanted]
+    if selected.shape[0] != pair_keys.size:
+        raise errors.ConnectionError(
+            "Expected %d connections, found %d" % (pair_keys.size, selected.shape[0]))
+    return selected
+
+
 class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
@@ -47,7 +93,7 @@ class Projection(common.Projection):
                                    space, label)
         self.nest_synapse_model = self.synapse_type._get_nest_synapse_model()
         self.nest_synapse_label = Projection._nProj
-        self.synapse_type._set_tau_minus(self.post.local_cells)
+        self.synapse_type._set_tau_minus(self.post._all_ids[self.post._mask_local])
         self._sources = []
         self._connections = None
         # This is used to keep track of common synapse properties (to my
@@ -122,12 +168,23 @@ class Projection(common.Projection):
         with the parameters provided by params.
         """
         syn_params.update({'synapse_label': self.nest_synapse_label})
-        nest.Connect(self.pre.all_cells.astype(int).tolist(),
-                     self.post.all_cells.astype(int).tolist(),
+        nest.Connect(self.pre._all_ids.tolist(),
+                     self.post._all_ids.tolist(),
                      rule_params, syn_params)
+        self._connections = None  # reset the caching of the connection list, since this will have to be recalculated
         self._sources = [cid[0] for cid in nest.GetConnections(synapse_model=self.nest_synapse_model,
                                                                synapse_label=self.nest_synapse_label)]
 
+    def _native_weights(self, weights):
+        """
+        Convert weights to the sign and scale expected by NEST.
+        """
+        if self.receptor_type == 'inhibitory' and self.post.conductance_based:
+            weights = -1 * weights  # NEST wants negative values for inhibitory weights, even if these are conductances
+        if hasattr(self.post, "celltype") and hasattr(self.post.celltype, "receptor_scale"):  # this is a bit of a hack
+            weights = weights * self.post.celltype.receptor_scale                             # needed for the Izhikevich model
+        return weights
+
     def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
                             **connection_parameters):
         """
@@ -139,16 +196,12 @@ class Projection(common.Projection):
         TO UPDATE
         """
         #logger.debug("Connecting to index %s from %s with %s" % (postsynaptic_index, presynaptic_indices, connection_parameters))
-        presynaptic_cells = self.pre.all_cells[presynaptic_indices]
+        presynaptic_cells = self.pre._all_ids[presynaptic_indices]
         postsynaptic_cell = self.post[postsynaptic_index]
         assert presynaptic_cells.size == presynaptic_indices.size
         assert len(presynaptic_cells) > 0, presynaptic_cells
 
-        weights = connection_parameters.pop('weight')
-        if self.receptor_type == 'inhibitory' and self.post.conductance_based:
-            weights *= -1  # NEST wants negative values for inhibitory weights, even if these are conductances
-        if hasattr(self.post, "celltype") and hasattr(self.post.celltype, "receptor_scale"):  # this is a bit of a hack
-            weights *= self.post.celltype.receptor_scale                                      # needed for the Izhikevich model
+        weights = self._native_weights(connection_parameters.pop('weight'))
         delays = connection_parameters.pop('delay')
 
         # Create connections, with weights and delays
@@ -178,7 +231,7 @@ class Projection(common.Projection):
             if numpy.isscalar(delays):
                 delays = repeat(delays)
             for pre, w, d in zip(presynaptic_cells, weights, delays):
-                nest.Connect([pre], [postsynaptic_cell],
+                nest.Connect([int(pre)], [int(postsynaptic_cell)],
                              'one_to_one',
                              {'weight': w, 'delay': d, 'receptor_type': receptor_type,
                               'model': self.nest_synapse_model,
@@ -218,6 +271,76 @@ class Projection(common.Projection):
                 else:
                     self._set_common_synapse_property(name, value)
 
+    def _connect_batch(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Create a block of connections with a single call to `nest.Connect()`,
+        using the 'one_to_one' rule with array-valued weights and delays.
+        Other synapse parameters are then set with one `nest.SetStatus()` call
+        per parameter.
+
+        `presynaptic_indices` and `postsynaptic_indices` are flat arrays with
+        one element per connection.
+        """
+        presynaptic_cells = self.pre._all_ids[presynaptic_indices]
+        postsynaptic_cells = self.post._all_ids[postsynaptic_indices]
+        celltype = self.post[postsynaptic_indices[0]].celltype
+
+        weights = self._native_weights(connection_parameters.pop('weight'))
+        delays = connection_parameters.pop('delay')
+
+        # Create connections, with weights and delays
+        # Setting other connection parameters is done afterwards
+        syn_dict = {'model': self.nest_synapse_model,
+                    'weight': _one_to_one_value(weights),
+                    'delay': _one_to_one_value(delays),
+                    'synapse_label': self.nest_synapse_label}
+        if not celltype.standard_receptor_type:
+            syn_dict['receptor_type'] = celltype.get_receptor_type(self.receptor_type)
+        try:
+            nest.Connect(presynaptic_cells.tolist(), postsynaptic_cells.tolist(),
+                         'one_to_one', syn_dict)
+        except nest.NESTError as e:
+            errmsg = "%s. presynaptic_cells=%s, postsynaptic_cells=%s, weights=%s, delays=%s, synapse model='%s'" % (
+                        e, presynaptic_cells, postsynaptic_cells,
+                        weights, delays, self.nest_synapse_model)
+            raise errors.ConnectionError(errmsg)
+
+        # Book-keeping
+        self._connections = None  # reset the caching of the connection list, since this will have to be recalculated
+        self._sources.extend(presynaptic_cells)
+
+        # Clean the connection parameters
+        connection_parameters.pop('tau_minus', None)  # TODO: set tau_minus on the post-synaptic cells
+        connection_parameters.pop('dendritic_delay_fraction', None)
+        connection_parameters.pop('w_min_always_zero_in_NEST', None)
+
+        if self._common_synapse_property_names is None:
+            self._identify_common_synapse_properties()
+
+        local_parameters = {}
+        for name, value in connection_parameters.items():
+            if name in self._common_synapse_property_names:
+                self._set_common_synapse_property(name, make_sli_compatible(value))
+            else:
+                local_parameters[name] = value
+
+        # Set connection parameters other than weight and delay
+        if local_parameters:
+            connections = nest.GetConnections(source=numpy.unique(presynaptic_cells).tolist(),
+                                              target=numpy.unique(postsynaptic_cells).tolist(),
+                                              synapse_model=self.nest_synapse_model,
+                                              synapse_label=self.nest_synapse_label)
+            # there may also be connections between these cells from earlier blocks
+            connections = _select_new_connections(connections, presynaptic_cells, postsynaptic_cells).tolist()
+            block_order = numpy.lexsort((postsynaptic_cells, presynaptic_cells))
+            for name, value in local_parameters.items():
+                if isinstance(value, numpy.ndarray):
+                    # the str() is to work around a bug handling unicode names in SetStatus in NEST 2.4.1 when using Python 2
+                    nest.SetStatus(connections, str(name), value[block_order].tolist())
+                else:
+                    nest.SetStatus(connections, str(name), make_sli_compatible(value))
+
     def _identify_common_synapse_properties(self):
         """
             Use the connection between the sample indices to distinguish
@@ -237,7 +360,7 @@ class Projection(common.Projection):
         sources = numpy.unique(self._sources).tolist()
         if self._common_synapse_property_names is None:
             self._identify_common_synapse_properties()
-        for postsynaptic_cell, connection_parameters in zip(self.post.local_cells,
+        for postsynaptic_cell, connection_parameters in zip(self.post._all_ids[self.post._mask_local].tolist(),
                                                             parameter_space.columns()):
             connections = nest.GetConnections(source=sources,
                                               target=[postsynaptic_cell],
@@ -310,6 +433,13 @@ class Projection(common.Projection):
     #        file.close()
 
     def _get_attributes_as_list(self, names):
+        columns = self._get_attributes_as_columns(names)
+        return [tuple(row) for row in numpy.array(columns).T.tolist()]
+
+    def _get_attributes_as_columns(self, names):
+        __doc__ = common.Projection._get_attributes_as_columns.__doc__
+        if len(self.nest_connections) == 0:
+            return [numpy.array([]) for name in names]
         nest_names = []
         for name in names:
             if name == 'presynaptic_index':
@@ -318,45 +448,22 @@ class Projection(common.Projection):
                 nest_names.append('target')
             else:
                 nest_names.append(name)
-        values = numpy.array(nest.GetStatus(self.nest_connections, nest_names))  # ought to preserve int type for source, target
-        if 'weight' in names:  # other attributes could also have scale factors - need to use translation mechanisms
-            scale_factors = numpy.ones(len(names))
-            scale_factors[names.index('weight')] = 0.001
-            if self.receptor_type == 'inhibitory' and self.post.conductance_based:
-                scale_factors[names.index('weight')] *= -1  # NEST uses negative values for inhibitory weights, even if these are conductances
-            values *= scale_factors
-        if 'presynaptic_index' in names:
-            values[:, names.index('presynaptic_index')] -= self.pre.first_id
-        if 'postsynaptic_index' in names:
-            values[:, names.index('postsynaptic_index')] -= self.post.first_id
-        values = values.tolist()
-        for i in xrange(len(values)):
-            values[i] = tuple(values[i])
-        return values
-
-    def _get_attributes_as_arrays(self, names, multiple_synapses='sum'):
-        multi_synapse_operation = Projection.MULTI_SYNAPSE_OPERATIONS[multiple_synapses]
-        all_values = []
-        for attribute_name in names:
-            if attribute_name[-1] == "s":  # weights --> weight, delays --> delay
-                attribute_name = attribute_name[:-1]
-            value_arr = numpy.nan * numpy.ones((self.pre.size, self.post.size))
-            connection_attributes = nest.GetStatus(self.nest_connections,
-                                                   ('source', 'target', attribute_name))
-            for conn in connection_attributes:
-                # (offset is always 0,0 for connections created with connect())
-                src, tgt, value = conn
-                addr = self.pre.id_to_index(src), self.post.id_to_index(tgt)
-                if numpy.isnan(value_arr[addr]):
-                    value_arr[addr] = value
-                else:
-                    value_arr[addr] = multi_synapse_operation(value_arr[addr], value)
-            if attribute_name == 'weight':
-                value_arr *= 0.001
+        # a single call to GetStatus for all the attributes
+        values = numpy.array(nest.GetStatus(self.nest_connections, nest_names), dtype=float)
+        values = values.reshape((-1, len(names)))
+        columns = []
+        for i, name in enumerate(names):
+            column = values[:, i]
+            if name == 'presynaptic_index':
+                column = self.pre.id_to_index(column.astype(int))
+            elif name == 'postsynaptic_index':
+                column = self.post.id_to_index(column.astype(int))
+            elif name == 'weight':  # other attributes could also have scale factors - need to use translation mechanisms
+                column = 0.001 * column
                 if self.receptor_type == 'inhibitory' and self.post.conductance_based:
-                    value_arr *= -1  # NEST uses negative values for inhibitory weights, even if these are conductances
-            all_values.append(value_arr)
-        return all_values
+                    column *= -1  # NEST uses negative values for inhibitory weights, even if these are conductances
+            columns.append(column)
+        return columns
 
     def _set_initial_value_array(self, variable, value):
         local_value = value.evaluate(simplify=True)
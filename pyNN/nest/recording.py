@@ -46,6 +46,25 @@ class RecordingDevice(object):
         assert not self._connected
         self._all_ids = self._all_ids.union(new_ids)
 
+    def _events_by_sender(self, nest_variable, desired_ids):
+        """
+        Read the recorded events once and group them by sender.
+
+        Returns an array containing the values of the given variable, sorted
+        by sender (keeping the order of recording for each sender), and two
+        arrays containing the start and stop positions within this array of
+        the values for each of `desired_ids`.
+        """
+        events = nest.GetStatus(self.device, 'events')[0]
+        senders = numpy.asarray(events['senders'])
+        order = numpy.argsort(senders, kind='mergesort')
+        sorted_senders = senders[order]
+        values = numpy.asarray(events[nest_variable])[order]
+        ids = numpy.fromiter((int(id) for id in desired_ids), dtype=int)
+        starts = numpy.searchsorted(sorted_senders, ids, side='left')
+        stops = numpy.searchsorted(sorted_senders, ids, side='right')
+        return values, starts, stops
+
     def get_data(self, variable, desired_ids, clear=False):
         """
         Return recorded data as a dictionary containing one numpy array for
@@ -53,12 +72,13 @@ class RecordingDevice(object):
         """
         scale_factor = SCALE_FACTORS.get(variable, 1)
         nest_variable = VARIABLE_MAP.get(variable, variable)
-        events = nest.GetStatus(self.device, 'events')[0]
-        ids = events['senders']
-        values = events[nest_variable] * scale_factor  # I'm hoping numpy optimises for the case where scale_factor = 1, otherwise should avoid this multiplication in that case
+        desired_ids = list(desired_ids)
+        values, starts, stops = self._events_by_sender(nest_variable, desired_ids)
+        if scale_factor != 1:
+            values = values * scale_factor
         data = {}
-        for id in desired_ids:
-            data[id] = values[ids == id]
+        for id, start, stop in zip(desired_ids, starts, stops):
+            data[id] = values[start:stop]
             if variable != 'times':
                 # NEST does not record values at the zeroth time step, so we
                 # add them here.
@@ -104,13 +124,22 @@ class SpikeDetector(RecordingDevice):
         """
         return self.get_data('times', desired_ids)
 
+    def get_spike_arrays(self, desired_ids):
+        """
+        Return the number of spikes of each neuron in `desired_ids`, which must
+        be sorted, and the spike times of all of these neurons, grouped by
+        neuron.
+        """
+        values, starts, stops = self._events_by_sender('times', desired_ids)
+        counts = stops - starts
+        offsets = numpy.cumsum(counts) - counts
+        positions = numpy.arange(counts.sum()) + numpy.repeat(starts - offsets, counts)
+        return counts, values[positions]
+
     def get_spike_counts(self, desired_ids):
-        events = nest.GetStatus(self.device, 'events')[0]
-        N = {}
-        for id in desired_ids:
-            mask = events['senders'] == int(id)
-            N[int(id)] = len(events['times'][mask])
-        return N
+        desired_ids = list(desired_ids)
+        values, starts, stops = self._events_by_sender('times', desired_ids)
+        return dict((int(id), int(n)) for id, n in zip(desired_ids, stops - starts))
 
 
 class Multimeter(RecordingDevice):
@@ -424,12 +453,18 @@ class Recorder(recording.Recorder):
         self._spike_detector = SpikeDetector()
 
     def _get_spiketimes(self, id):
-        return self._spike_detector.get_spiketimes([id])[id]  # hugely inefficient - to be optimized later
+        return self._spike_detector.get_spiketimes([id])[id]
+
+    def _get_all_spiketimes(self, ids):
+        return self._spike_detector.get_spiketimes(ids)
+
+    def _get_spike_arrays(self, ids):
+        return self._spike_detector.get_spike_arrays(ids)
 
     def _get_all_signals(self, variable, ids, clear=False):
         data = self._multimeter.get_data(variable, ids, clear=clear)
         if len(ids) > 0:
-            return numpy.vstack([data[i] for i in ids]).T
+            return numpy.array([data[i] for i in ids], dtype=self.signal_dtype).T
         else:
             return numpy.array([])
 
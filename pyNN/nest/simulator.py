@@ -57,6 +57,7 @@ class _State(common.control.BaseState):
         self.optimize = False
         self.spike_precision = "off_grid"
         self.verbosity = "warning"
+        self.native_connection_rules = True
         self._cache_num_processes = nest.GetKernelStatus()['num_processes']  # avoids blocking if only some nodes call num_processes
                                                                              # do the same for rank?
         # allow NEST to erase previously written files (defaut with all the other simulators)
@@ -151,6 +152,7 @@ class _State(common.control.BaseState):
         self.populations = []
         self.recording_devices = []
         self.recorders = set()
+        self.stream_handlers = []
         # clear the sli stack, if this is not done --> memory leak cause the stack increases
         nest.sr('clear')
         # reset the simulation kernel
@@ -82,6 +82,7 @@ class State(common.control.BaseState):
         self.running = True
     def clear(self):
         self.recorders = set([])
+        self.stream_handlers = []
         self.id_counter = 42
         self.segment_counter = -1
         self.reset()
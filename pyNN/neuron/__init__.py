@@ -67,6 +67,15 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY, **extra_params
 
     native_rng_baseseed - added to MPI.rank to form seed for SpikeSourcePoisson, etc.
     default_maxstep - TODO
+    compact_connections - store the connections of static synapses as arrays
+                          of indices and parameter values, rather than as one
+                          Connection object per synapse. This greatly reduces
+                          memory use for large networks. Defaults to False.
+    batched_recording - record the state variables of each population using a
+                        single PtrVector per variable, which fills a 2D numpy
+                        array, rather than one Vector per cell. This reduces
+                        memory use and retrieval time when recording from many
+                        cells. Requires a fixed time step. Defaults to False.
 
     returns: MPI rank
 
@@ -74,6 +83,7 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY, **extra_params
     common.setup(timestep, min_delay, **extra_params)
     simulator.initializer.clear()
     simulator.state.clear()
+    simulator.state.cache_memory_limit = extra_params.get('cache_memory_limit', None)
     simulator.state.dt = timestep
     simulator.state.min_delay = min_delay
     simulator.state.max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
@@ -87,6 +97,8 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY, **extra_params
         simulator.state.native_rng_baseseed = int(extra_params['native_rng_baseseed'])
     if 'default_maxstep' in extra_params:
         simulator.state.default_maxstep = float(extra_params['default_maxstep'])
+    simulator.state.compact_connections = extra_params.get('compact_connections', False)
+    simulator.state.batched_recording = extra_params.get('batched_recording', False)
     return rank()
 
 
@@ -96,6 +108,9 @@ def end(compatible_output=True):
         io = get_io(filename)
         population.write_data(io, variables)
     simulator.state.write_on_end = []
+    for handler in simulator.state.stream_handlers:
+        handler.close()
+    simulator.state.stream_handlers = []
     #simulator.state.finalize()
 
 run, run_until = common.build_run(simulator)
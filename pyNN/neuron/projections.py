@@ -27,6 +27,119 @@ _projections = []  # if a Projection is created but not assigned to a variable,
                    # the connections will not exist, so we store a reference here
 
 
+class CompactConnectionStore(object):
+    """
+    Store the static connections of a Projection as contiguous arrays of pre-
+    and post-synaptic indices and parameter values, with the NEURON NetCon
+    objects held in a parallel list, rather than as one Connection object per
+    synapse.
+    """
+
+    def __init__(self):
+        self.netcons = []
+        self._chunks = []
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.netcons)
+
+    def append(self, projection, presynaptic_indices, postsynaptic_indices,
+               connection_parameters):
+        """
+        Create one NetCon for each (pre, post) pair and store the connection
+        parameters, each of which is either a single value or an array with one
+        value per pair.
+        """
+        n = presynaptic_indices.size
+        chunk = {"presynaptic_index": presynaptic_indices.astype(int),
+                 "postsynaptic_index": postsynaptic_indices.astype(int)}
+        for name, value in connection_parameters.items():
+            chunk[name] = numpy.ones((n,), dtype=float) * value
+        targets = {}
+        for pre_idx, post_idx, weight, delay in izip(chunk["presynaptic_index"],
+                                                     chunk["postsynaptic_index"],
+                                                     chunk["weight"], chunk["delay"]):
+            postsynaptic_cell = projection.post[post_idx]
+            if post_idx not in targets:
+                targets[post_idx] = simulator.synaptic_target(postsynaptic_cell,
+                                                              projection.receptor_type)
+            self.netcons.append(
+                simulator.create_netcon(projection.pre[pre_idx], postsynaptic_cell,
+                                        targets[post_idx], projection.receptor_type,
+                                        weight, delay))
+        self._chunks.append(chunk)
+
+    @property
+    def columns(self):
+        """
+        A dict containing one array per connection attribute, including the
+        pre- and post-synaptic indices.
+        """
+        if self._chunks:
+            if self._columns:
+                self._chunks.insert(0, self._columns)
+            self._columns = dict((name, numpy.hstack([chunk[name] for chunk in self._chunks]))
+                                 for name in self._chunks[0])
+            self._chunks = []
+        return self._columns
+
+    def get(self, name):
+        if name not in self.columns:
+            return numpy.array([], dtype=float)
+        return self.columns[name]
+
+    def set(self, name, values, index=slice(None)):
+        """
+        Set the values of the attribute `name` for the connections selected by
+        `index`, updating both the stored arrays and the NetCons.
+        """
+        column = self.columns[name]
+        column[index] = values
+        selected = numpy.arange(column.size)[index]
+        if name == "weight":
+            for i in numpy.atleast_1d(selected):
+                self.netcons[i].weight[0] = column[i]
+        elif name == "delay":
+            for i in numpy.atleast_1d(selected):
+                self.netcons[i].delay = column[i]
+        else:
+            raise errors.NonExistentParameterError(name, "StaticSynapse", ["weight", "delay"])
+
+
+class CompactConnection(object):
+    """
+    A view of a single connection within a CompactConnectionStore, providing
+    the same interface as a Connection object.
+    """
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    presynaptic_index = property(lambda self: self._store.columns["presynaptic_index"][self._index])
+    postsynaptic_index = property(lambda self: self._store.columns["postsynaptic_index"][self._index])
+
+    def _get_weight(self):
+        """Synaptic weight in nA or µS."""
+        return self._store.columns["weight"][self._index]
+
+    def _set_weight(self, w):
+        self._store.set("weight", w, self._index)
+
+    def _get_delay(self):
+        """Connection delay in ms."""
+        return self._store.columns["delay"][self._index]
+
+    def _set_delay(self, d):
+        self._store.set("delay", d, self._index)
+
+    weight = property(_get_weight, _set_weight)
+    delay = property(_get_delay, _set_delay)
+
+    def as_tuple(self, *attribute_names):
+        return tuple(getattr(self, name) for name in attribute_names)
+
+
 class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
@@ -39,7 +152,13 @@ class Projection(common.Projection):
         common.Projection.__init__(self, presynaptic_population, postsynaptic_population,
                                    connector, synapse_type, source, receptor_type,
                                    space, label)
-        self._connections = dict((index, defaultdict(list)) for index in self.post._mask_local.nonzero()[0])
+        self._compact = (simulator.state.compact_connections
+                         and getattr(self.synapse_type, "model", None) is None
+                         and not getattr(self.synapse_type, "presynaptic_type", None))
+        if self._compact:
+            self._connections = CompactConnectionStore()
+        else:
+            self._connections = dict((index, defaultdict(list)) for index in self.post._mask_local.nonzero()[0])
         connector.connect(self)
         self._presynaptic_components = dict((index, {}) for index in 
                                             self.pre._mask_local.nonzero()[0])
@@ -50,6 +169,10 @@ class Projection(common.Projection):
 
     @property
     def connections(self):
+        if self._compact:
+            for i in range(len(self._connections)):
+                yield CompactConnection(self._connections, i)
+            return
         for x in self._connections.values():
             for y in x.values():
                 for z in y:
@@ -57,6 +180,15 @@ class Projection(common.Projection):
 
     def __getitem__(self, i):
         __doc__ = common.Projection.__getitem__.__doc__
+        if self._compact:
+            if isinstance(i, int):
+                if i < len(self):
+                    return CompactConnection(self._connections, i)
+                else:
+                    raise IndexError("%d > %d" % (i, len(self) - 1))
+            elif isinstance(i, slice):
+                return [CompactConnection(self._connections, j)
+                        for j in range(*i.indices(len(self)))]
         if isinstance(i, int):
             if i < len(self):
                 return self.connections[i]
@@ -70,6 +202,8 @@ class Projection(common.Projection):
 
     def __len__(self):
         """Return the number of connections on the local MPI node."""
+        if self._compact:
+            return len(self._connections)
         return len(list(self.connections))
 
     def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
@@ -88,16 +222,36 @@ class Projection(common.Projection):
         if not isinstance(postsynaptic_cell, int) or not (0 <= postsynaptic_cell <= simulator.state.gid_counter):
             errmsg = "Invalid post-synaptic cell: %s (gid_counter=%d)" % (postsynaptic_cell, simulator.state.gid_counter)
             raise errors.ConnectionError(errmsg)
+        assert postsynaptic_cell.local
+        if self._compact:
+            presynaptic_indices = numpy.asarray(presynaptic_indices, dtype=int)
+            self._connections.append(self, presynaptic_indices,
+                                     numpy.repeat(postsynaptic_index, presynaptic_indices.size),
+                                     connection_parameters)
+            return
         for name, value in connection_parameters.items():
             if isinstance(value, (float, int)):
                 connection_parameters[name] = repeat(value)
-        assert postsynaptic_cell.local
         for pre_idx, values in core.ezip(presynaptic_indices, *connection_parameters.values()):
             parameters = dict(zip(connection_parameters.keys(), values))
             #logger.debug("Connecting neuron #%s to neuron #%s with synapse type %s, receptor type %s, parameters %s", pre_idx, postsynaptic_index, self.synapse_type, self.receptor_type, parameters)
             self._connections[postsynaptic_index][pre_idx].append(
                 self.synapse_type.connection_type(self, pre_idx, postsynaptic_index, **parameters))
 
+    def _connect_batch(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        In compact mode, add a block of connections to the compact connection
+        store without creating a Python object per connection. Otherwise,
+        create the connections one post-synaptic cell at a time.
+        """
+        if self._compact:
+            self._connections.append(self, presynaptic_indices, postsynaptic_indices,
+                                     connection_parameters)
+        else:
+            super(Projection, self)._connect_batch(presynaptic_indices, postsynaptic_indices,
+                                                   **connection_parameters)
+
     def _configure_presynaptic_components(self):
         """
         For gap junctions potentially other complex synapse types the presynaptic side of the 
@@ -119,7 +273,30 @@ class Projection(common.Projection):
             self._presynaptic_components[pre_idx][post_idx] = \
                                 self.synapse_type.presynaptic_type(self, pre_idx, post_idx, **params)
 
+    def _get_attributes_as_list(self, names):
+        if self._compact:
+            return list(izip(*self._get_attributes_as_columns(names)))
+        return super(Projection, self)._get_attributes_as_list(names)
+
+    def _get_attributes_as_columns(self, names):
+        __doc__ = common.Projection._get_attributes_as_columns.__doc__
+        if self._compact:
+            return [self._connections.get(name) for name in names]
+        return super(Projection, self)._get_attributes_as_columns(names)
+
     def _set_attributes(self, parameter_space):
+        if self._compact:
+            pre = self._connections.get("presynaptic_index")
+            post = self._connections.get("postsynaptic_index")
+            if pre.size == 0:
+                return
+            for name, map in parameter_space.items():
+                if map.is_homogeneous:
+                    values = map.evaluate(simplify=True)
+                else:
+                    values = map[pre, post]
+                self._connections.set(name, values)
+            return
         # If synapse has pre-synaptic components evaluate the parameters for them
         if self.synapse_type.presynaptic_type:
             presyn_param_space = deepcopy(parameter_space)
@@ -140,3 +317,4 @@ class Projection(common.Projection):
 
     def _set_initial_value_array(self, variable, value):
         raise NotImplemented
+
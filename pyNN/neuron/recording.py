@@ -14,10 +14,95 @@ from neuron import h
 recordable_pattern = re.compile(r'((?P<section>\w+)(\((?P<location>[-+]?[0-9]*\.?[0-9]+)\))?\.)?(?P<var>\w+)')
 
 
+class BatchedSignals(object):
+    """
+    Record a state variable from many cells at once.
+
+    Rather than each cell having its own `Vector`, a single `PtrVector`
+    gathers the values from all the cells after every sampling step, into a
+    row of a preallocated 2D numpy array, which grows as needed. This requires
+    a fixed time step.
+    """
+
+    def __init__(self, sampling_interval, dtype=float):
+        if simulator.state.cvode.active():
+            raise NotImplementedError("Batched recording is not available with variable time step integration")
+        self.interval_steps = int(round(sampling_interval / simulator.state.dt))
+        self.ids = []
+        self.hoc_vars = []
+        self.columns = {}
+        self.buffer = numpy.empty((0, 0), dtype=dtype)
+        self.n_samples = 0
+        self.step = 0
+        self._ptrvector = None
+        self._fih = h.FInitializeHandler(2, self._initialize)
+        simulator.state.cvode.extra_scatter_gather(0, self._sample)
+
+    def add(self, ids, hoc_vars):
+        """Add the cells in `ids`, with the given pointers to the variable."""
+        for id, hoc_var in zip(ids, hoc_vars):
+            self.columns[id] = len(self.ids)
+            self.ids.append(id)
+            self.hoc_vars.append(hoc_var)
+        self._ptrvector = None
+        if self.buffer.shape[1] < len(self.ids):
+            # cells added during a simulation have no data for earlier samples
+            buffer = numpy.empty((self.buffer.shape[0], len(self.ids)), dtype=self.buffer.dtype)
+            buffer[:, :self.buffer.shape[1]] = self.buffer
+            buffer[:, self.buffer.shape[1]:] = numpy.nan
+            self.buffer = buffer
+
+    def _initialize(self):
+        self.n_samples = 0
+        self.step = 0
+        self._store()
+
+    def _sample(self):
+        self.step += 1
+        if self.step % self.interval_steps == 0:
+            self._store()
+
+    def _store(self):
+        if self._ptrvector is None:
+            self._ptrvector = h.PtrVector(len(self.hoc_vars))
+            for i, hoc_var in enumerate(self.hoc_vars):
+                self._ptrvector.pset(i, hoc_var)
+            self._values = h.Vector(len(self.hoc_vars))
+        if self.n_samples == self.buffer.shape[0]:
+            n_rows = max(2 * self.buffer.shape[0],
+                         int(round(simulator.state.tstop / (self.interval_steps * simulator.state.dt))) + 1,
+                         16)
+            buffer = numpy.empty((n_rows, len(self.ids)), dtype=self.buffer.dtype)
+            buffer[:self.n_samples] = self.buffer[:self.n_samples]
+            self.buffer = buffer
+        self._ptrvector.gather(self._values)
+        self.buffer[self.n_samples] = self._values.as_numpy()
+        self.n_samples += 1
+
+    def get(self, ids):
+        """Return the signals of the given cells, as a 2D array with one column per cell."""
+        columns = numpy.fromiter((self.columns[id] for id in ids), dtype=int, count=len(ids))
+        return self.buffer[:self.n_samples].take(columns, axis=1)
+
+    def clear(self):
+        """Delete the recorded data, keeping the buffer for later samples."""
+        self.n_samples = 0
+
+    def remove(self):
+        """Stop recording."""
+        simulator.state.cvode.extra_scatter_gather_remove(self._sample)
+        self._fih = None
+        self.buffer = numpy.empty((0, 0), dtype=self.buffer.dtype)
+
+
 class Recorder(recording.Recorder):
     """Encapsulates data and functions related to recording model variables."""
     _simulator = simulator
 
+    def __init__(self, population, file=None):
+        recording.Recorder.__init__(self, population, file)
+        self._batches = {}
+
     def _record(self, variable, new_ids, sampling_interval=None):
         """Add the cells in `new_ids` to the set of recorded cells."""
         if variable == 'spikes':
@@ -26,10 +111,17 @@ class Recorder(recording.Recorder):
                     id._cell.rec.record(id._cell.spike_times)
         else:
             self.sampling_interval = sampling_interval or self._simulator.state.dt
-            for id in new_ids:
-                self._record_state_variable(id._cell, variable)
+            if self._simulator.state.batched_recording:
+                if variable not in self._batches:
+                    self._batches[variable] = BatchedSignals(self.sampling_interval, self.signal_dtype)
+                new_ids = sorted(new_ids)
+                self._batches[variable].add(new_ids,
+                                            [self._get_hoc_variable(id._cell, variable) for id in new_ids])
+            else:
+                for id in new_ids:
+                    self._record_state_variable(id._cell, variable)
 
-    def _record_state_variable(self, cell, variable):
+    def _get_hoc_variable(self, cell, variable):
         if hasattr(cell, 'recordable') and variable in cell.recordable:
             hoc_var = cell.recordable[variable]
         elif variable == 'v':
@@ -41,6 +133,10 @@ class Recorder(recording.Recorder):
         else:
             source, var_name = self._resolve_variable(cell, variable)
             hoc_var = getattr(source, "_ref_%s" % var_name)
+        return hoc_var
+
+    def _record_state_variable(self, cell, variable):
+        hoc_var = self._get_hoc_variable(cell, variable)
         cell.traces[variable] = vec = h.Vector()
         if self.sampling_interval == self._simulator.state.dt:
             vec.record(hoc_var)
@@ -73,17 +169,25 @@ class Recorder(recording.Recorder):
 
     def _reset(self):
         """Reset the list of things to be recorded."""
+        self._remove_batches()
         for id in set.union(*self.recorded.values()):
             id._cell.traces = {}
             id._cell.spike_times = h.Vector(0)
         id._cell.recording_time == 0
         id._cell.record_times = None
 
+    def _remove_batches(self):
+        for batch in self._batches.values():
+            batch.remove()
+        self._batches = {}
+
     def _clear_simulator(self):
         """
         Should remove all recorded data held by the simulator and, ideally,
         free up the memory.
         """
+        for batch in self._batches.values():
+            batch.clear()
         for id in set.union(*self.recorded.values()):
             if hasattr(id._cell, "traces"):
                 for variable in id._cell.traces:
@@ -97,10 +201,26 @@ class Recorder(recording.Recorder):
         spikes = numpy.array(id._cell.spike_times)
         return spikes[spikes <= simulator.state.t + 1e-9]
 
+    def _get_spike_arrays(self, ids):
+        spiketimes = [numpy.array(id._cell.spike_times) for id in ids]
+        if spiketimes:
+            times = numpy.hstack(spiketimes)
+        else:
+            times = numpy.array([])
+        cell_index = numpy.repeat(numpy.arange(len(ids)), [spikes.size for spikes in spiketimes])
+        mask = times <= simulator.state.t + 1e-9
+        counts = numpy.bincount(cell_index[mask], minlength=len(ids))
+        return counts, times[mask]
+
     def _get_all_signals(self, variable, ids, clear=False):
         # assuming not using cvode, otherwise need to get times as well and use IrregularlySampledAnalogSignal
-        if len(ids) > 0:
-            signals = numpy.vstack((id._cell.traces[variable] for id in ids)).T
+        if variable in self._batches:
+            if len(ids) > 0:
+                signals = self._batches[variable].get(ids)
+            else:
+                signals = numpy.array([])
+        elif len(ids) > 0:
+            signals = numpy.array([id._cell.traces[variable] for id in ids], dtype=self.signal_dtype).T
             expected_length = numpy.rint(simulator.state.tstop / self.sampling_interval) + 1
             if signals.shape[0] != expected_length:  # generally due to floating point/rounding issues
                 signals = numpy.vstack((signals, signals[-1, :]))
@@ -169,6 +169,8 @@ class _State(common.control.BaseState):
         self.clear()
         self.default_maxstep = 10.0
         self.native_rng_baseseed = 0
+        self.compact_connections = False
+        self.batched_recording = False
 
     t = h_property('t')
 
@@ -210,9 +212,12 @@ class _State(common.control.BaseState):
                                         # method in ID, but this will do for now.
 
     def clear(self):
+        for recorder in self.recorders:
+            recorder._remove_batches()  # stop batched recording from cells which are about to be deleted
         self.parallel_context.gid_clear()
         self.gid_sources = []
         self.recorders = set([])
+        self.stream_handlers = []
         self.current_sources = []
         self.gid_counter = 0
         self.vargid_offsets = dict()  # Contains the start of the available "variable"-GID range for each projection (as opposed to "cell"-GIDs)
@@ -337,6 +342,33 @@ class ID(int, common.IDMixin):
         setattr(self._cell, "%s_init" % variable, value)
 
 
+def synaptic_target(postsynaptic_cell, receptor_type):
+    """
+    Return the NEURON object which receives synaptic input of the given
+    receptor type in the given post-synaptic cell.
+    """
+    if "." in receptor_type:
+        section, target = receptor_type.split(".")
+        return getattr(getattr(postsynaptic_cell._cell, section), target)
+    else:
+        return getattr(postsynaptic_cell._cell, receptor_type)
+
+
+def create_netcon(presynaptic_cell, postsynaptic_cell, target_object, receptor_type, weight, delay):
+    """
+    Create a NetCon from the cell with the given gid to `target_object`, which
+    should have been obtained from `synaptic_target()`.
+    """
+    nc = state.parallel_context.gid_connect(int(presynaptic_cell), target_object)
+    nc.weight[0] = weight
+    # if we have a mechanism (e.g. from 9ML) that includes multiple
+    # synaptic channels, need to set nc.weight[1] here
+    if nc.wcnt() > 1 and hasattr(postsynaptic_cell._cell, "type"):
+        nc.weight[1] = postsynaptic_cell._cell.type.receptor_types.index(receptor_type)
+    nc.delay = delay
+    return nc
+
+
 class Connection(common.Connection):
     """
     Store an individual plastic connection and information about it. Provide an
@@ -353,18 +385,10 @@ class Connection(common.Connection):
         self.postsynaptic_index = post
         self.presynaptic_cell = projection.pre[pre]
         self.postsynaptic_cell = projection.post[post]
-        if "." in projection.receptor_type:
-            section, target = projection.receptor_type.split(".")
-            target_object = getattr(getattr(self.postsynaptic_cell._cell, section), target)
-        else:
-            target_object = getattr(self.postsynaptic_cell._cell, projection.receptor_type)
-        self.nc = state.parallel_context.gid_connect(int(self.presynaptic_cell), target_object)
-        self.nc.weight[0] = parameters.pop('weight')
-        # if we have a mechanism (e.g. from 9ML) that includes multiple
-        # synaptic channels, need to set nc.weight[1] here
-        if self.nc.wcnt() > 1 and hasattr(self.postsynaptic_cell._cell, "type"):
-            self.nc.weight[1] = self.postsynaptic_cell._cell.type.receptor_types.index(projection.receptor_type)
-        self.nc.delay = parameters.pop('delay')
+        target_object = synaptic_target(self.postsynaptic_cell, projection.receptor_type)
+        self.nc = create_netcon(self.presynaptic_cell, self.postsynaptic_cell, target_object,
+                                projection.receptor_type, parameters.pop('weight'),
+                                parameters.pop('delay'))
         if projection.synapse_type.model is not None:
             self._setup_plasticity(projection.synapse_type, parameters)
         # nc.threshold is supposed to be set by ParallelContext.threshold, called in _build_cell(), above, but this hasn't been tested
@@ -47,6 +47,7 @@ class LazyArray(larray):
     """
     # most of the implementation moved to external lazyarray package
     # the plan is ultimately to move everything to lazyarray
+    _shared_base = False
 
     def __init__(self, value, shape=None, dtype=None):
         if isinstance(value, basestring):
@@ -60,6 +61,29 @@ class LazyArray(larray):
             except NameError as err:
                 raise errors.InvalidParameterValueError(errmsg + str(err))
         super(LazyArray, self).__init__(value, shape, dtype)
+        if isinstance(value, larray):
+            # the two arrays now share a base value, so neither may return
+            # it, or a view of it, when evaluated (see _unshare())
+            self._shared_base = value._shared_base = True
+
+    def _unshare(self, x):
+        """
+        Return a copy of the evaluated array `x` if it shares memory with a
+        base array which is shared with other lazy arrays, so that modifying
+        the result in place cannot modify the other arrays.
+        """
+        if (self._shared_base and isinstance(x, numpy.ndarray)
+                and isinstance(self.base_value, numpy.ndarray)
+                and numpy.may_share_memory(x, self.base_value)):
+            x = x.copy()
+        return x
+
+    def evaluate(self, simplify=False, empty_val=0):
+        return self._unshare(super(LazyArray, self).evaluate(simplify, empty_val))
+    evaluate.__doc__ = larray.evaluate.__doc__
+
+    def _partially_evaluate(self, addr, simplify=False):
+        return self._unshare(super(LazyArray, self)._partially_evaluate(addr, simplify))
 
     def __setitem__(self, addr, new_value):
         self.check_bounds(addr)
@@ -83,7 +107,14 @@ class LazyArray(larray):
         if mask is not None:
             assert len(mask) == self.ncols
             column_indices = column_indices[mask]
-        if isinstance(self.base_value, RandomDistribution) and self.base_value.rng.parallel_safe:
+        if isinstance(self.base_value, RandomDistribution) and self.base_value.rng.splittable:
+            # each column has its own random number stream, so we can jump directly to the
+            # local columns
+            stream = self.base_value.rng.split()
+            for j in column_indices:
+                yield self._apply_operations(self.base_value.next_by_column(self.nrows, [j], stream)[:, 0],
+                                             (slice(None), j))
+        elif isinstance(self.base_value, RandomDistribution) and self.base_value.rng.parallel_safe:
             if mask is None:
                 for j in column_indices:
                     yield self._apply_operations(self.base_value.next(self.nrows, mask_local=False),
@@ -98,6 +129,51 @@ class LazyArray(larray):
             for j in column_indices:
                 yield self._partially_evaluate((slice(None), j), simplify=True)
 
+    def by_column_block(self, block_size, mask=None):
+        """
+        Iterate over blocks of adjacent columns of the array. Each item is a
+        tuple `(column_indices, block)`, where `block` is either a 2D array
+        with one column per element of `column_indices` or a single value (for
+        a flat array).
+
+        `block_size`: the maximum number of columns in each block.
+        `mask`: either `None` or a boolean array indicating which columns should be included.
+
+        Random numbers are drawn column by column, in the same order as
+        :meth:`by_column`, so for a given seed both methods give the same values.
+        """
+        assert block_size > 0
+        column_indices = numpy.arange(self.ncols)
+        if mask is not None:
+            assert len(mask) == self.ncols
+        random_base = isinstance(self.base_value, RandomDistribution)
+        splittable = random_base and self.base_value.rng.splittable
+        if mask is not None and not (random_base and self.base_value.rng.parallel_safe and not splittable):
+            column_indices = column_indices[mask]
+        if splittable:
+            stream = self.base_value.rng.split()
+        for start in range(0, column_indices.size, block_size):
+            columns = column_indices[start:start + block_size]
+            if splittable:
+                # each column has its own random number stream, so we only
+                # generate the numbers for the requested columns
+                values = self.base_value.next_by_column(self.nrows, columns, stream)
+                block = self._apply_operations(values, (slice(None), columns))
+            elif random_base:
+                values = self.base_value.next(self.nrows * columns.size, mask_local=False)
+                values = values.reshape((columns.size, self.nrows)).T
+                block = self._apply_operations(values, (slice(None), columns))
+                if mask is not None and self.base_value.rng.parallel_safe:
+                    # the random numbers for non-local columns are thrown away
+                    local = mask[columns]
+                    if not local.any():
+                        continue
+                    columns = columns[local]
+                    block = block[:, local]
+            else:
+                block = self._partially_evaluate((slice(None), columns), simplify=True)
+            yield columns, block
+
 
 class Sequence(object):
     """
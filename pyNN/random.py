@@ -5,6 +5,8 @@ common interface so that they can be used interchangeably in PyNN.
 Classes:
     NumpyRNG           - uses the numpy.random.RandomState RNG
     GSLRNG             - uses the RNGs from the Gnu Scientific Library
+    PhiloxRNG          - uses the counter-based Philox RNG from numpy.random,
+                         whose output can be split into independent substreams
     NativeRNG          - indicates to the simulator that it should use it's own,
                          built-in RNG
     RandomDistribution - produces random numbers from a specific distribution
@@ -25,6 +27,7 @@ try:
     have_gsl = True
 except (ImportError, Warning):
     have_gsl = False
+have_philox = hasattr(numpy.random, "Philox")  # requires numpy >= 1.17
 import time
 
 logger = logging.getLogger("PyNN")
@@ -65,6 +68,7 @@ class AbstractRNG(object):
     standard Python rng, e.g. a numpy.random.RandomState object, which would
     allow the same random numbers to be used across different simulators, or
     simply to read externally-generated numbers from files."""
+    splittable = False  # see PhiloxRNG
 
     def __init__(self, seed=None):
         if seed is not None:
@@ -292,6 +296,125 @@ class GSLRNG(WrappedRNG):
         gen = lambda n: self.normal(mu, sigma, n)
         return self._clipped(gen, low=low, high=high, size=size)
 
+
+class PhiloxRNG(WrappedRNG):
+    """
+    Wrapper for the counter-based Philox RNG (:class:`numpy.random.Philox`).
+
+    As well as the usual sequential stream of random numbers returned by
+    :meth:`next`, the output of a counter-based RNG can be split into
+    independent substreams, each of which can be accessed directly without
+    generating the numbers that come before it. Each call to :meth:`split`
+    reserves a new family of substreams, with one substream per column index,
+    which is used by :meth:`next_by_column`.
+
+    Connectors use this to draw the random numbers for each post-synaptic
+    neuron from its own substream, so that each MPI node only has to generate
+    the numbers for its local neurons, while still obtaining the same results
+    as a single-process simulation. Note that all MPI nodes must call
+    :meth:`split` the same number of times.
+    """
+    splittable = True
+    translations = {
+        'binomial':       ('binomial',     {'n': 'n', 'p': 'p'}),
+        'gamma':          ('gamma',        {'k': 'shape', 'theta': 'scale'}),
+        'exponential':    ('exponential',  {'beta': 'scale'}),
+        'lognormal':      ('lognormal',    {'mu': 'mean', 'sigma': 'sigma'}),
+        'normal':         ('normal',       {'mu': 'loc', 'sigma': 'scale'}),
+        'normal_clipped': ('normal_clipped', {'mu': 'mu', 'sigma': 'sigma', 'low': 'low', 'high': 'high'}),
+        'normal_clipped_to_boundary':
+                          ('normal_clipped_to_boundary', {'mu': 'mu', 'sigma': 'sigma', 'low': 'low', 'high': 'high'}),
+        'poisson':        ('poisson',      {'lambda_': 'lam'}),
+        'uniform':        ('uniform',      {'low': 'low', 'high': 'high'}),
+        'uniform_int':    ('integers',     {'low': 'low', 'high': 'high'}),
+        'vonmises':       ('vonmises',     {'mu': 'mu', 'kappa': 'kappa'}),
+    }
+
+    def __init__(self, seed=None, parallel_safe=True):
+        if not have_philox:
+            raise ImportError("PhiloxRNG: requires numpy 1.17 or later")
+        WrappedRNG.__init__(self, seed, parallel_safe)
+        if self.seed is None:
+            self.key = numpy.random.SeedSequence().generate_state(2, numpy.uint64)
+        else:
+            self.key = self.seed
+        self.rng = self._generator(0, 0)  # the sequential stream
+        self.n_streams = 0
+
+    def __getattr__(self, name):
+        """
+        This is to give the PyNN RNGs the same methods as the wrapped RNGs
+        (:class:`numpy.random.Generator`.)
+        """
+        if name == "rng":  # avoid infinite recursion if `rng` is not yet set
+            raise AttributeError(name)
+        return getattr(self.rng, name)
+
+    def _generator(self, stream, index):
+        # the first word of the 256-bit counter is incremented as numbers are
+        # drawn, the others identify the substream
+        bit_generator = numpy.random.Philox(key=self.key, counter=[0, index, stream, 0])
+        return numpy.random.Generator(bit_generator)
+
+    def split(self):
+        """
+        Reserve a new family of substreams, and return its identifier, for
+        use with :meth:`next_by_column`.
+        """
+        self.n_streams += 1
+        return self.n_streams
+
+    def next_by_column(self, n, columns, distribution=None, parameters=None, stream=None):
+        """
+        Return random numbers from the specified distribution, drawing the
+        numbers for each column index in `columns` from a separate substream
+        of the family `stream` (obtained from :meth:`split`).
+
+        If `n` is an integer, return an array of shape `(n, len(columns))`.
+        If `n` is an array giving the number of values for each column,
+        return a 1D array containing the values for each column in turn.
+        """
+        if distribution is None:
+            distribution = 'uniform'
+            if parameters is None:
+                parameters = {"low": 0.0, "high": 1.0}
+        if stream is None:
+            stream = self.split()
+        columns = numpy.asarray(columns, dtype=int)
+        if numpy.isscalar(n):
+            counts = numpy.repeat(n, columns.size)
+        else:
+            counts = numpy.asarray(n, dtype=int)
+        values = [numpy.atleast_1d(self._draw(self._generator(stream, j), distribution, m, parameters))
+                  for j, m in zip(columns, counts)]
+        if values:
+            values = numpy.hstack(values)
+        else:
+            values = numpy.array([])
+        if numpy.isscalar(n):
+            values = values.reshape((columns.size, n)).T
+        return values
+
+    def _next(self, distribution, n, parameters):
+        return self._draw(self.rng, distribution, n, parameters)
+
+    def _draw(self, generator, distribution, n, parameters):
+        distribution_np, parameter_map = self.translations[distribution]
+        if set(parameters.keys()) != set(parameter_map.keys()):
+            # all parameters must be provided. We do not provide default values (this can be discussed).
+            errmsg = "Incorrect parameterization of random distribution. Expected %s, got %s."
+            raise KeyError(errmsg % (parameter_map.keys(), parameters.keys()))
+        parameters_np = dict((parameter_map[k], v) for k, v in parameters.items())
+        if distribution_np == 'normal_clipped':
+            gen = lambda m: generator.normal(loc=parameters_np['mu'], scale=parameters_np['sigma'], size=m)
+            return self._clipped(gen, low=parameters_np['low'], high=parameters_np['high'], size=n)
+        elif distribution_np == 'normal_clipped_to_boundary':
+            res = generator.normal(loc=parameters_np['mu'], scale=parameters_np['sigma'], size=n)
+            return numpy.maximum(numpy.minimum(res, parameters_np['high']), parameters_np['low'])
+        else:
+            return getattr(generator, distribution_np)(size=n, **parameters_np)
+
+
 # should add a wrapper for the built-in Python random module.
 
 
@@ -373,6 +496,17 @@ class RandomDistribution(VectorizedIterable):
                             mask_local=mask_local)
         return res
 
+    def next_by_column(self, n, columns, stream=None):
+        """
+        Return random numbers from the distribution, drawn separately for
+        each of the given column indices. Requires a splittable RNG, such as
+        :class:`PhiloxRNG`.
+        """
+        return self.rng.next_by_column(n, columns,
+                                       distribution=self.name,
+                                       parameters=self.parameters,
+                                       stream=stream)
+
     def __str__(self):
         return "RandomDistribution('%(name)s', %(parameters)s, %(rng)s)" % self.__dict__
 
@@ -13,8 +13,11 @@ internal use.
 import logging
 import numpy
 import os
+import shutil
+import tempfile
+import pickle
 from copy import copy
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from pyNN import errors
 import neo
 from datetime import datetime
@@ -34,7 +37,7 @@ def get_mpi_comm():
         from mpi4py import MPI
     except ImportError:
         raise Exception("Trying to gather data without MPI installed. If you are not running a distributed simulation, this is a bug in PyNN.")
-    return MPI.COMM_WORLD, {'DOUBLE': MPI.DOUBLE, 'SUM': MPI.SUM}
+    return MPI.COMM_WORLD, {'DOUBLE': MPI.DOUBLE, 'SUM': MPI.SUM, 'BYTE': MPI.BYTE}
 
 
 def rename_existing(filename):
@@ -61,7 +64,44 @@ def gather_array(data):
         return gdata
     else:
         num_columns = data.shape[1]
-        return gdata.reshape((gdata.size / num_columns, num_columns))
+        return gdata.reshape((gdata.size // num_columns, num_columns))
+
+
+def gather_structured(data, all=False):
+    """
+    Gather a 1D numpy array, typically a structured array, from all MPI nodes.
+
+    The data from each node are received directly into a single, preallocated
+    array on the root node (or on all nodes, if `all` is True), in order of
+    MPI rank, without pickling. All nodes must pass arrays with the same dtype,
+    which must not contain Python objects. On other nodes, an empty array is
+    returned.
+    """
+    mpi_comm, mpi_flags = get_mpi_comm()
+    assert isinstance(data, numpy.ndarray) and data.ndim == 1
+    assert not data.dtype.hasobject
+    data = numpy.ascontiguousarray(data)
+    # first we exchange the number of records on each node
+    if all:
+        sizes = mpi_comm.allgather(data.size)
+    else:
+        sizes = mpi_comm.gather(data.size, root=MPI_ROOT) or []
+    # now we pass the data. Counts and displacements are given in records,
+    # using an MPI datatype of the size of one record, so that they do not
+    # overflow when there are more than 2**31 bytes
+    record_type = mpi_flags['BYTE'].Create_contiguous(data.dtype.itemsize).Commit()
+    displacements = numpy.cumsum([0] + sizes[:-1]).tolist()
+    gdata = numpy.empty((sum(sizes),), dtype=data.dtype)
+    send_buffer = [data.view(numpy.uint8), data.size, record_type]
+    receive_buffer = [gdata.view(numpy.uint8), (sizes, displacements), record_type]
+    try:
+        if all:
+            mpi_comm.Allgatherv(send_buffer, receive_buffer)
+        else:
+            mpi_comm.Gatherv(send_buffer, receive_buffer, root=MPI_ROOT)
+    finally:
+        record_type.Free()
+    return gdata
 
 
 def gather_dict(D, all=False):
@@ -79,23 +119,89 @@ def gather_dict(D, all=False):
 
 
 def gather_blocks(data, ordered=True):
-    """Gather Neo Blocks"""
+    """
+    Gather Neo Blocks from all MPI nodes to the root node.
+
+    Each node packs the data of each segment into typed arrays: one record
+    per cell giving its index and number of spikes, one record per spike, and
+    for each signal one record per channel, containing its index and the
+    samples. These are gathered with `gather_structured()`, so only small
+    headers are pickled, and the root node then rebuilds each segment once,
+    with spike trains and channels sorted by index. On other nodes, `data` is
+    returned unchanged.
+    """
     mpi_comm, mpi_flags = get_mpi_comm()
     assert isinstance(data, neo.Block)
-    # for now, use gather_dict, which will probably be slow. Can optimize later
-    D = {mpi_comm.rank: data}
-    D = gather_dict(D)
-    blocks = D.values()
-    merged = data
-    if mpi_comm.rank == MPI_ROOT:    
-        merged = blocks[0]
-        for block in blocks[1:]:
-            merged.merge(block)
-    if ordered:
-        for segment in merged.segments:
-            ordered_spiketrains = sorted(segment.spiketrains, key=lambda s: s.annotations['source_id'])
-            segment.spiketrains = ordered_spiketrains
-    return merged
+    merged_segments = []
+    for segment in data.segments:
+        arrays = segment_to_arrays(segment)
+        headers = {}
+        for variable, values in arrays.items():
+            headers[variable] = dict((key, value) for key, value in values.items()
+                                     if key not in ('index', 'indptr', 'times', 'signal'))
+            if variable != 'spikes':
+                headers[variable]['n_samples'] = values['signal'].shape[0]
+                headers[variable]['dtype'] = values['signal'].dtype.str
+        all_headers = [h for h in mpi_comm.allgather(headers) if h]
+        gathered = {}
+        for variable in sorted(set().union(*all_headers)):
+            header = [h[variable] for h in all_headers if variable in h][0]
+            values = arrays.get(variable)
+            if variable == 'spikes':
+                cells = numpy.zeros((0,), dtype=[('index', numpy.int64), ('count', numpy.int64)])
+                times = numpy.zeros((0,), dtype=float)
+                if values is not None:
+                    cells = numpy.empty(values['index'].shape, dtype=cells.dtype)
+                    cells['index'] = values['index']
+                    cells['count'] = numpy.diff(values['indptr'])
+                    times = values['times']
+                cells = gather_structured(cells)
+                times = gather_structured(times)
+                if mpi_comm.rank == MPI_ROOT:
+                    gathered[variable] = dict(header,
+                                              index=cells['index'],
+                                              indptr=numpy.hstack(([0], numpy.cumsum(cells['count']))),
+                                              times=times)
+            else:
+                n_samples = max(h[variable]['n_samples'] for h in all_headers if variable in h)
+                channels = numpy.zeros((0,), dtype=[('index', numpy.int64),
+                                                    ('signal', numpy.dtype(header['dtype']), (n_samples,))])
+                if values is not None and values['signal'].size > 0:
+                    channels = numpy.empty(values['index'].shape, dtype=channels.dtype)
+                    channels['index'] = values['index']
+                    signal = values['signal']
+                    if signal.shape[0] < n_samples:
+                        # pad with NaN so the signals from all nodes have the same length
+                        logger.warning("Signal '%s' has %d samples on node %d, but %d on another node. "
+                                       "Padding with NaN.", variable, signal.shape[0], mpi_comm.rank, n_samples)
+                        signal = numpy.vstack((signal, numpy.full((n_samples - signal.shape[0], signal.shape[1]),
+                                                                  numpy.nan, dtype=signal.dtype)))
+                    channels['signal'] = signal.T
+                channels = gather_structured(channels)
+                if mpi_comm.rank == MPI_ROOT:
+                    header = dict((key, value) for key, value in header.items()
+                                  if key not in ('n_samples', 'dtype'))
+                    gathered[variable] = dict(header,
+                                              index=channels['index'],
+                                              signal=channels['signal'].T)
+        if mpi_comm.rank == MPI_ROOT:
+            # cells which exist on several nodes are included only once
+            merged = arrays_to_segment(merge_arrays([gathered], unique=True),
+                                       data.name, data.annotations['first_id'])
+            merged.name = segment.name
+            merged.description = segment.description
+            merged.rec_datetime = segment.rec_datetime
+            merged.annotate(**segment.annotations)
+            merged_segments.append(merged)
+    if mpi_comm.rank == MPI_ROOT:
+        data.segments = merged_segments
+        data.channel_indexes = [signal.channel_index
+                                for segment in merged_segments
+                                for signal in segment.analogsignals]
+    elif ordered:
+        for segment in data.segments:
+            segment.spiketrains = sorted(segment.spiketrains, key=lambda s: s.annotations['source_id'])
+    return data
 
 
 def mpi_sum(x):
@@ -146,6 +252,26 @@ def get_io(filename):
         raise Exception("file extension %s not supported" % extension)
 
 
+def downsample_signal(signal_array, factor, method='subsample'):
+    """
+    Reduce the sampling rate of the signals in `signal_array` (one column per
+    signal) by an integer `factor`.
+
+    If `method` is "subsample", every `factor`-th sample is kept. If it is
+    "mean", each sample is replaced by the mean of the block of `factor`
+    samples which it starts (a simple low-pass filter); the final block may be
+    shorter.
+    """
+    if method == 'subsample':
+        return signal_array[::factor]
+    elif method == 'mean':
+        starts = numpy.arange(0, signal_array.shape[0], factor)
+        block_sizes = numpy.diff(numpy.append(starts, signal_array.shape[0]))
+        return numpy.add.reduceat(signal_array, starts, axis=0) / block_sizes[:, numpy.newaxis]
+    else:
+        raise ValueError("Unknown downsampling method '%s'" % method)
+
+
 def filter_by_variables(segment, variables):
     """
     Return a new `Segment` containing only recordings of the variables given in
@@ -174,22 +300,210 @@ def remove_duplicate_spiketrains(data):
     return data
 
 
+def segment_to_arrays(segment, variables='all'):
+    """
+    Convert a Neo `Segment` to the "arrays" format returned by
+    `Recorder.get(format='arrays')`.
+    """
+    data = {}
+    if segment.spiketrains and (variables == 'all' or 'spikes' in variables):
+        spiketrains = segment.spiketrains
+        counts = numpy.array([spiketrain.size for spiketrain in spiketrains], dtype=int)
+        data['spikes'] = {
+            'index': numpy.array([spiketrain.annotations['source_index'] for spiketrain in spiketrains],
+                                 dtype=int),
+            'indptr': numpy.hstack(([0], numpy.cumsum(counts))),
+            'times': numpy.hstack([spiketrain.rescale(pq.ms).magnitude for spiketrain in spiketrains]),
+            't_start': float(spiketrains[0].t_start.rescale(pq.ms)),
+            't_stop': float(spiketrains[0].t_stop.rescale(pq.ms)),
+        }
+    for signal in segment.analogsignals:
+        if variables == 'all' or signal.name in variables:
+            data[signal.name] = {
+                'index': numpy.asarray(signal.channel_index.channel_ids, dtype=int),
+                'signal': signal.magnitude,
+                't_start': float(signal.t_start.rescale(pq.ms)),
+                'sampling_period': float(signal.sampling_period.rescale(pq.ms)),
+                'units': signal.units.dimensionality.string,
+            }
+    return data
+
+
+def merge_arrays(segments, offsets=None, unique=False):
+    """
+    Merge data in the "arrays" format (see `Recorder.get()`) from several
+    sources, e.g. from different MPI nodes or from the populations of an
+    Assembly, into a single dict, with cells sorted by index.
+
+    `offsets`, if given, contains a value to be added to the cell indices of
+    each source. If `unique` is True, cells which appear in several sources
+    are included only once.
+    """
+    if offsets is None:
+        offsets = [0] * len(segments)
+    merged = {}
+    for variable in set().union(*segments):
+        parts = [(segment[variable], offset)
+                 for segment, offset in zip(segments, offsets) if variable in segment]
+        index = numpy.hstack([part['index'] + offset for part, offset in parts]).astype(int)
+        order = numpy.argsort(index, kind='mergesort')
+        if unique:
+            index, first = numpy.unique(index, return_index=True)
+            order = order[numpy.in1d(order, first)]
+        else:
+            index = index[order]
+        merged[variable] = dict(parts[0][0])
+        merged[variable]['index'] = index
+        if variable == 'spikes':
+            counts = numpy.hstack([numpy.diff(part['indptr']) for part, offset in parts])
+            times = numpy.hstack([part['times'] for part, offset in parts])
+            # reorder the spike times so they are grouped in the new order of the cells
+            position = numpy.empty_like(counts)
+            position[order] = numpy.arange(order.size)
+            spike_cells = numpy.repeat(numpy.arange(counts.size), counts)
+            keep = numpy.in1d(spike_cells, order)
+            spike_order = numpy.argsort(position[spike_cells[keep]], kind='mergesort')
+            merged[variable]['times'] = times[keep][spike_order]
+            merged[variable]['indptr'] = numpy.hstack(([0], numpy.cumsum(counts[order])))
+        else:
+            signals = [part['signal'] for part, offset in parts if part['signal'].size > 0]
+            if signals:
+                merged[variable]['signal'] = numpy.hstack(signals)[:, order]
+    return merged
+
+
+def arrays_to_segment(data, label, first_id):
+    """
+    Convert data in the "arrays" format (see `Recorder.get()`) back into a
+    Neo `Segment`. This is the inverse of `segment_to_arrays()`, assuming that
+    the IDs of the recorded population are contiguous, starting at `first_id`.
+    """
+    segment = neo.Segment()
+    for variable in sorted(data):
+        values = data[variable]
+        index = numpy.asarray(values['index'], dtype=int)
+        if variable == 'spikes':
+            indptr = values['indptr']
+            segment.spiketrains = [
+                neo.SpikeTrain(values['times'][indptr[k]:indptr[k + 1]],
+                               t_start=values['t_start'],
+                               t_stop=values['t_stop'],
+                               units='ms',
+                               source_population=label,
+                               source_id=first_id + int(i),
+                               source_index=int(i))
+                for k, i in enumerate(index)]
+        elif values['signal'].size > 0:
+            signal = neo.AnalogSignal(
+                            values['signal'],
+                            units=str(values['units']),
+                            t_start=values['t_start'] * pq.ms,
+                            sampling_period=values['sampling_period'] * pq.ms,
+                            name=variable,
+                            source_population=label,
+                            source_ids=first_id + index)
+            signal.channel_index = neo.ChannelIndex(index=numpy.arange(index.size),
+                                                    channel_ids=index)
+            segment.analogsignals.append(signal)
+    return segment
+
+
+def select_cells(data, indices):
+    """
+    Return a copy of data in the "arrays" format (see `Recorder.get()`)
+    containing only the cells with the given indices.
+    """
+    selected = {}
+    for variable, values in data.items():
+        mask = numpy.in1d(values['index'], indices)
+        selected[variable] = dict(values, index=values['index'][mask])
+        if variable == 'spikes':
+            counts = numpy.diff(values['indptr'])
+            selected[variable]['times'] = values['times'][numpy.repeat(mask, counts)]
+            selected[variable]['indptr'] = numpy.hstack(([0], numpy.cumsum(counts[mask])))
+        elif values['signal'].size > 0:
+            selected[variable]['signal'] = values['signal'][:, mask]
+    return selected
+
+
+def segment_size(segment):
+    """Estimate the memory used by the data in a Neo `Segment`, in bytes."""
+    return (sum(signal.nbytes for signal in segment.analogsignals)
+            + sum(spiketrain.nbytes for spiketrain in segment.spiketrains))
+
+
 class DataCache(object):
-    # primitive implementation for now, storing in memory - later can consider caching to disk
+    """
+    Store of the segments recorded before the last reset().
+
+    If `memory_limit` (in bytes) is given, the segments which have been least
+    recently stored or accessed are written to a temporary directory, so that
+    the segments kept in memory use no more than this amount (although the
+    most recently used segment is always kept). Spilled segments are loaded
+    back transparently when the cache is iterated over. Since stored segments
+    do not change, each is written to disk at most once.
+    """
 
-    def __init__(self):
+    def __init__(self, memory_limit=None):
+        self.memory_limit = memory_limit
         self._data = []
+        self._in_memory = OrderedDict()  # position -> size, least recently used first
+        self._files = {}  # position -> file containing the spilled segment
+        self._dir = None
 
     def __iter__(self):
-        return iter(self._data)
+        for i in range(len(self._data)):
+            yield self._load(i)
+
+    def __len__(self):
+        return len(self._data)
 
     def store(self, obj):
-        if obj not in self._data:
+        if not any(item is obj for item in self._data):
             logger.debug("Adding %s to cache" % obj)
             self._data.append(obj)
+            self._in_memory[len(self._data) - 1] = segment_size(obj)
+            self._spill()
+
+    def _load(self, i):
+        if i in self._in_memory:
+            self._in_memory[i] = self._in_memory.pop(i)  # mark as most recently used
+        else:
+            with open(self._files[i], 'rb') as fp:
+                self._data[i] = pickle.load(fp)
+            self._in_memory[i] = segment_size(self._data[i])
+            logger.debug("Loaded segment %d from %s" % (i, fp.name))
+        obj = self._data[i]
+        self._spill()
+        return obj
+
+    def _spill(self):
+        """Write the least recently used segments to disk until within the memory limit."""
+        if self.memory_limit is None:
+            return
+        while len(self._in_memory) > 1 and sum(self._in_memory.values()) > self.memory_limit:
+            i, size = self._in_memory.popitem(last=False)
+            if i not in self._files:
+                if self._dir is None:
+                    self._dir = tempfile.mkdtemp(prefix="pyNN_cache_")
+                filename = os.path.join(self._dir, "segment%06d.pkl" % i)
+                with open(filename, 'wb') as fp:
+                    pickle.dump(self._data[i], fp, pickle.HIGHEST_PROTOCOL)
+                self._files[i] = filename
+                logger.debug("Spilled segment %d (%d bytes) to %s" % (i, size, filename))
+            self._data[i] = self._files[i]
 
     def clear(self):
         self._data = []
+        self._in_memory = OrderedDict()
+        self._files = {}
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def __del__(self):
+        if getattr(self, "_dir", None) is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
 
 
 class Recorder(object):
@@ -209,20 +523,37 @@ class Recorder(object):
         self.file = file
         self.population = population  # needed for writing header information
         self.recorded = defaultdict(set)
-        self.cache = DataCache()
+        self.cache = DataCache(self._simulator.state.cache_memory_limit)
         self._simulator.state.recorders.add(self)
         self.clear_flag = False
         self._recording_start_time = self._simulator.state.t * pq.ms
         self.sampling_interval = self._simulator.state.dt
+        self.signal_dtype = numpy.dtype(float)
+        self.downsampling = (1, 'subsample')
 
-    def record(self, variables, ids, sampling_interval=None):
+    def record(self, variables, ids, sampling_interval=None, dtype=None, downsample=None):
         """
         Add the cells in `ids` to the sets of recorded cells for the given variables.
+
+        `dtype` and `downsample` control how signals are stored once they have
+        been retrieved from the simulator (see `Population.record()`).
         """
         logger.debug('Recorder.record(<%d cells>)' % len(ids))
         if sampling_interval is not None:
             if sampling_interval != self.sampling_interval and len(self.recorded) > 0:
                 raise ValueError("All neurons in a population must be recorded with the same sampling interval.")
+        if dtype is not None:
+            self.signal_dtype = numpy.dtype(dtype)
+            if self.signal_dtype.kind != 'f':
+                raise ValueError("Recorded signals must be stored as floating-point numbers, not %s" % self.signal_dtype)
+        if downsample is not None:
+            if isinstance(downsample, (int, numpy.integer)):
+                downsample = (downsample, 'subsample')
+            else:
+                downsample = (downsample[1], downsample[0])
+            if downsample[1] not in ('subsample', 'mean') or downsample[0] < 1:
+                raise ValueError("Invalid value for `downsample`: %s" % (downsample,))
+            self.downsampling = downsample
 
         ids = set([id for id in ids if id.local])
         for variable in normalize_variables_arg(variables):
@@ -243,30 +574,121 @@ class Recorder(object):
         else:
             return self.recorded[variable]
 
+    def _get_all_spiketimes(self, ids):
+        """
+        Return the spike times of the given cells, as a dict containing one
+        numpy array per cell, with IDs as keys.
+
+        Backends for which retrieving the spikes of many cells at once is
+        cheaper than retrieving them cell by cell should override this method.
+        """
+        return dict((id, self._get_spiketimes(id)) for id in ids)
+
+    def _get_spike_arrays(self, ids):
+        """
+        Return the spike times of the given cells as two arrays: the number of
+        spikes of each cell, and the spike times of all the cells, grouped by
+        cell in the order given by `ids`.
+
+        Backends which can retrieve all the spike times in bulk should override
+        this method.
+        """
+        spiketimes = self._get_all_spiketimes(ids)
+        counts = numpy.array([spiketimes[id].size for id in ids], dtype=int)
+        if ids:
+            times = numpy.hstack([spiketimes[id] for id in ids])
+        else:
+            times = numpy.array([])
+        return counts, times
+
+    @property
+    def stored_sampling_interval(self):
+        """The sampling interval of the signals after downsampling."""
+        return self.sampling_interval * self.downsampling[0]
+
+    def _get_signals(self, variable, ids, clear=False, downsample=True):
+        """
+        Retrieve the signals recorded by the simulator for the given cells, as
+        a 2D array with one column per cell, downsampled and converted to the
+        storage type if necessary.
+
+        If `downsample` is False, the signals are returned as recorded.
+        """
+        signal_array = self._get_all_signals(variable, ids, clear=clear)
+        if not downsample:
+            return signal_array
+        factor, method = self.downsampling
+        if factor > 1 and signal_array.size > 0:
+            signal_array = downsample_signal(signal_array, factor, method)
+        return signal_array.astype(self.signal_dtype, copy=False)
+
+    def _get_current_arrays(self, filter_ids=None, variables='all', clear=False, downsample=True):
+        """
+        Return the data recorded since the last reset in the "arrays" format,
+        without creating any Neo objects.
+
+        If `downsample` is False, signals are returned as recorded, without
+        downsampling or conversion to the storage type.
+        """
+        data = {}
+        variables_to_include = set(self.recorded.keys())
+        if variables != 'all':
+            variables_to_include = variables_to_include.intersection(set(variables))
+        t_start = float(self._recording_start_time.rescale(pq.ms))
+        for variable in variables_to_include:
+            ids = sorted(self.filter_recorded(variable, filter_ids))
+            if ids:
+                index = self.population.id_to_index(numpy.array(ids, dtype=int))
+            else:
+                index = numpy.array([], dtype=int)
+            if variable == 'spikes':
+                counts, times = self._get_spike_arrays(ids)
+                data[variable] = {
+                    'index': index,
+                    'indptr': numpy.hstack(([0], numpy.cumsum(counts))).astype(int),
+                    'times': numpy.asarray(times, dtype=float),
+                    't_start': t_start,
+                    't_stop': self._simulator.state.t,
+                }
+            else:
+                signal_array = self._get_signals(variable, ids, clear=clear, downsample=downsample)
+                if signal_array.size == 0:
+                    signal_array = numpy.empty((0, 0))
+                data[variable] = {
+                    'index': index,
+                    'signal': signal_array,
+                    't_start': t_start,
+                    'sampling_period': downsample and self.stored_sampling_interval or self.sampling_interval,
+                    'units': self.population.find_units(variable),
+                }
+        return data
+
     def _get_current_segment(self, filter_ids=None, variables='all', clear=False):
         segment = neo.Segment(name="segment%03d" % self._simulator.state.segment_counter,
                               description=self.population.describe(),
                               rec_datetime=datetime.now())  # would be nice to get the time at the start of the recording, not the end
         variables_to_include = set(self.recorded.keys())
-        if variables is not 'all':
+        if variables != 'all':
             variables_to_include = variables_to_include.intersection(set(variables))
         for variable in variables_to_include:
             if variable == 'spikes':
                 t_stop = self._simulator.state.t * pq.ms  # must run on all MPI nodes
+                ids = sorted(self.filter_recorded('spikes', filter_ids))
+                spiketimes = self._get_all_spiketimes(ids)
                 segment.spiketrains = [
-                    neo.SpikeTrain(self._get_spiketimes(id),
+                    neo.SpikeTrain(spiketimes[id],
                                    t_start=self._recording_start_time,
                                    t_stop=t_stop,
                                    units='ms',
                                    source_population=self.population.label,
                                    source_id=int(id),
                                    source_index=self.population.id_to_index(id))
-                    for id in sorted(self.filter_recorded('spikes', filter_ids))]
+                    for id in ids]
             else:
                 ids = sorted(self.filter_recorded(variable, filter_ids))
-                signal_array = self._get_all_signals(variable, ids, clear=clear)
+                signal_array = self._get_signals(variable, ids, clear=clear)
                 t_start = self._recording_start_time
-                sampling_period = self.sampling_interval * pq.ms
+                sampling_period = self.stored_sampling_interval * pq.ms
                 current_time = self._simulator.state.t * pq.ms
                 mpi_node = self._simulator.state.mpi_rank  # for debugging
                 if signal_array.size > 0:  # may be empty if none of the recorded cells are on this MPI node
@@ -282,7 +704,7 @@ class Recorder(object):
                                     source_ids=source_ids)
                     signal.channel_index = neo.ChannelIndex(
                             index=numpy.arange(source_ids.size),
-                            channel_ids=numpy.array([self.population.id_to_index(id) for id in ids]))
+                            channel_ids=self.population.id_to_index(source_ids))
                     segment.analogsignals.append(signal)
                     logger.debug("%d **** ids=%s, channels=%s", mpi_node, source_ids, signal.channel_index)
                     assert segment.analogsignals[0].t_stop - current_time - 2 * sampling_period < 1e-10
@@ -290,9 +712,24 @@ class Recorder(object):
         return segment
 
     def get(self, variables, gather=False, filter_ids=None, clear=False,
-            annotations=None):
-        """Return the recorded data as a Neo `Block`."""
+            annotations=None, format='neo'):
+        """
+        Return the recorded data as a Neo `Block`, or, if `format` is "arrays",
+        as a list of dicts, one per segment, with one entry per variable.
+
+        For spikes, this entry is a dict containing the population indices of
+        the cells ("index"), the spike times of all cells in milliseconds
+        ("times"), in compressed sparse row form, i.e. the times of cell
+        ``index[k]`` are ``times[indptr[k]:indptr[k + 1]]``, and "t_start" and
+        "t_stop". For other variables, it contains "index", a 2D array
+        "signal" with one column per cell, "t_start", "sampling_period" and
+        "units".
+        """
         variables = normalize_variables_arg(variables)
+        if format == 'arrays':
+            return self._get_arrays(variables, gather, filter_ids, clear)
+        elif format != 'neo':
+            raise ValueError("format must be 'neo' or 'arrays'")
         data = neo.Block()
         data.segments = [filter_by_variables(segment, variables)
                          for segment in self.cache]
@@ -316,6 +753,22 @@ class Recorder(object):
             self.clear()
         return data
 
+    def _get_arrays(self, variables, gather=False, filter_ids=None, clear=False):
+        segments = [segment_to_arrays(segment, variables) for segment in self.cache]
+        if self._simulator.state.running:  # reset() has not been called, so current segment is not in cache
+            segments.append(self._get_current_arrays(filter_ids=filter_ids, variables=variables,
+                                                     clear=clear))
+        if gather and self._simulator.state.num_processes > 1:
+            all_segments = gather_dict({self._simulator.state.mpi_rank: segments})
+            if self._simulator.state.mpi_rank == MPI_ROOT:
+                always_local = getattr(self.population.celltype, "always_local", False)
+                segments = [merge_arrays([all_segments[rank][i] for rank in sorted(all_segments)],
+                                         unique=always_local)
+                            for i in range(len(segments))]
+        if clear:
+            self.clear()
+        return segments
+
     def clear(self):
         """
         Clear all recorded data, both from the cache and the simulator.
@@ -328,6 +781,9 @@ class Recorder(object):
     def write(self, variables, file=None, gather=False, filter_ids=None,
               clear=False, annotations=None):
         """Write recorded data to a Neo IO"""
+        if gather in ('by_rank', 'shards'):
+            self._write_arrays(variables, file, gather, filter_ids, clear, annotations)
+            return
         if isinstance(file, basestring):
             file = get_io(file)
         io = file or self.file
@@ -341,6 +797,15 @@ class Recorder(object):
             logger.debug("Writing data to file %s" % io)
             io.write_block(data)
 
+    def _write_arrays(self, variables, dirname, gather, filter_ids=None, clear=False, annotations=None):
+        from pyNN.recording.streaming import write_by_rank, write_shards
+        segments = self.get(variables, False, filter_ids, clear, format='arrays')
+        annotations = annotations or {}
+        if gather == 'by_rank' and self._simulator.state.num_processes > 1:
+            write_by_rank(segments, dirname, self, **annotations)
+        else:
+            write_shards(segments, dirname, self, **annotations)
+
     @property
     def metadata(self):
         metadata = {
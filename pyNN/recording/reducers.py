@@ -0,0 +1,266 @@
+"""
+Online reduction of recorded data.
+
+Reducers accumulate statistics, such as spike counts, firing rates or the
+mean membrane potential, from the chunks of data retrieved from the simulator
+during a run, so that the raw recordings need not be kept in memory.
+
+Classes:
+    SpikeCount
+    FiringRate
+    PSTH
+    SignalMean
+    SignalVariance
+    StreamReducer
+
+:copyright: Copyright 2006-2016 by the PyNN team, see AUTHORS.
+:license: CeCILL, see LICENSE for details.
+
+"""
+
+from copy import deepcopy
+import numpy
+from pyNN.recording import mpi_sum
+from pyNN.recording.streaming import StreamHandler
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+
+class Reducer(object):
+    """
+    Base class for reducers.
+
+    `size` is the size of the recorded population and `mask` a boolean array
+    of that size, selecting the cells whose data should be included.
+    """
+    variables = ()
+
+    def __init__(self, size, mask):
+        self.size = size
+        self.mask = mask
+        self.reset()
+
+    def reset(self):
+        """Discard the accumulated statistics, e.g. at the start of a segment."""
+        raise NotImplementedError
+
+    def update(self, values):
+        """
+        Update the statistics from a chunk of recorded data, given as a dict in
+        the "arrays" format (see `Recorder.get()`).
+        """
+        raise NotImplementedError
+
+    def result(self, gather=False):
+        """Return the statistics accumulated since the last reset."""
+        raise NotImplementedError
+
+
+class SpikeCount(Reducer):
+    """Number of spikes emitted by each cell."""
+    variables = ('spikes',)
+
+    def reset(self):
+        self.counts = numpy.zeros(self.size, dtype=int)
+
+    def update(self, values):
+        self.counts[values['index']] += numpy.diff(values['indptr'])
+
+    def result(self, gather=False):
+        counts = numpy.where(self.mask, self.counts, 0)
+        if gather:
+            counts = mpi_sum(counts)
+        return counts
+
+
+class FiringRate(SpikeCount):
+    """Mean firing rate of each cell, in spikes/second."""
+
+    def reset(self):
+        SpikeCount.reset(self)
+        self.t_start = None
+        self.t_stop = None
+
+    def update(self, values):
+        SpikeCount.update(self, values)
+        if self.t_start is None:
+            self.t_start = values['t_start']
+        self.t_stop = values['t_stop']
+
+    def result(self, gather=False):
+        counts = SpikeCount.result(self, gather)
+        if self.t_start is None or self.t_stop <= self.t_start:
+            return numpy.zeros(self.size)
+        return 1000.0 * counts / (self.t_stop - self.t_start)
+
+
+class PSTH(Reducer):
+    """
+    Peri-stimulus time histogram: the total number of spikes emitted by the
+    selected cells in each time bin of width `bin_width` (in ms), with the
+    first bin starting at the start of the segment.
+    """
+    variables = ('spikes',)
+
+    def __init__(self, size, mask, bin_width):
+        self.bin_width = bin_width
+        Reducer.__init__(self, size, mask)
+
+    def reset(self):
+        self.histogram = numpy.zeros(0, dtype=int)
+
+    def update(self, values):
+        n_bins = int(numpy.ceil(values['t_stop'] / self.bin_width))
+        counts = numpy.diff(values['indptr'])
+        include = numpy.repeat(self.mask[values['index']], counts)
+        bins = (values['times'][include] / self.bin_width).astype(int)
+        histogram = numpy.bincount(bins, minlength=n_bins)
+        histogram[:self.histogram.size] += self.histogram
+        self.histogram = histogram
+
+    def result(self, gather=False):
+        histogram = self.histogram
+        if gather:
+            # all nodes flush at the same times, so have the same number of bins
+            histogram = mpi_sum(histogram)
+        return histogram
+
+
+class SignalMean(Reducer):
+    """Time average of a recorded state variable, for each cell."""
+    variables = None  # any variable except spikes
+
+    def reset(self):
+        self.n = numpy.zeros(self.size, dtype=int)  # number of samples of each cell
+        self.mean = numpy.zeros(self.size)
+        self.m2 = numpy.zeros(self.size)  # sum of squared deviations from the mean
+
+    def update(self, values):
+        signal = values['signal']
+        n = signal.shape[0]
+        if n == 0 or signal.size == 0:
+            return
+        index = values['index']
+        mean = signal.mean(axis=0)
+        m2 = ((signal - mean)**2).sum(axis=0)
+        # combine with the previous chunks (Chan et al.'s parallel algorithm).
+        # Cells may have been recorded for different numbers of chunks, so
+        # each cell has its own count
+        n_previous = self.n[index]
+        n_total = n_previous + n
+        delta = mean - self.mean[index]
+        self.mean[index] += delta * n / n_total
+        self.m2[index] += m2 + delta**2 * n_previous * n / n_total
+        self.n[index] = n_total
+
+    def result(self, gather=False):
+        mean = numpy.where(self.mask, self.mean, 0.0)
+        if gather:
+            mean = mpi_sum(mean)
+        return mean
+
+
+class SignalVariance(SignalMean):
+    """Variance over time of a recorded state variable, for each cell."""
+
+    def result(self, gather=False):
+        variance = numpy.where(self.mask & (self.n > 0), self.m2 / numpy.maximum(self.n, 1), 0.0)
+        if gather:
+            variance = mpi_sum(variance)
+        return variance
+
+
+reducer_classes = {
+    'count': SpikeCount,
+    'rate': FiringRate,
+    'psth': PSTH,
+    'mean': SignalMean,
+    'var': SignalVariance,
+}
+
+
+def reducer_name(reduce):
+    """
+    Return the name of the reduction specified by `reduce`, which should be
+    either a name, or a tuple containing a name followed by parameters.
+    """
+    if isinstance(reduce, basestring):
+        return reduce
+    else:
+        return reduce[0]
+
+
+class StreamReducer(StreamHandler):
+    """
+    Periodically retrieve the data recorded by a `Recorder`, update a set of
+    reducers, and then delete the data from the simulator.
+    """
+
+    def __init__(self, recorder, flush_interval=None):
+        StreamHandler.__init__(self, recorder, flush_interval)
+        self.reducers = {}
+        self.segments = []
+
+    def add(self, variable, reduce, mask):
+        """
+        Reduce the recordings of `variable` using the reduction `reduce` (see
+        `Population.record()`), for the cells selected by the boolean array
+        `mask`.
+        """
+        name = reducer_name(reduce)
+        if name not in reducer_classes:
+            raise ValueError("Unknown reduction '%s'. Valid reductions are: %s"
+                             % (name, ", ".join(sorted(reducer_classes))))
+        reducer_class = reducer_classes[name]
+        if (reducer_class.variables is None) == (variable == 'spikes'):
+            raise ValueError("Reduction '%s' cannot be used for variable '%s'" % (name, variable))
+        key = (variable, name)
+        if key in self.reducers:
+            self.reducers[key].mask |= mask
+        else:
+            parameters = () if isinstance(reduce, basestring) else tuple(reduce[1:])
+            self.reducers[key] = reducer_class(mask.size, mask, *parameters)
+
+    @property
+    def variables(self):
+        return set(variable for variable, name in self.reducers)
+
+    def _process(self, data):
+        for (variable, name), reducer in self.reducers.items():
+            if variable in data:
+                reducer.update(data[variable])
+
+    def new_segment(self):
+        self.flush(final=True)
+        if self._chunk > 0:
+            self.segments.append(self.reducers)
+            self.reducers = deepcopy(self.reducers)
+            for reducer in self.reducers.values():
+                reducer.reset()
+        StreamHandler.new_segment(self)
+
+    def get(self, index, gather=False):
+        """
+        Return the statistics accumulated for the cells with the given indices,
+        as a list containing, for each segment, a dict of dicts, so that e.g.
+        the firing rates are in ``data[segment]['spikes']['rate']``.
+        """
+        self.flush()
+        state = self.recorder._simulator.state
+        gather = gather and state.num_processes > 1
+        all_reducers = list(self.segments)
+        if state.running:
+            all_reducers.append(self.reducers)
+        segments = []
+        for reducers in all_reducers:
+            results = {}
+            for (variable, name), reducer in reducers.items():
+                values = reducer.result(gather)
+                if name != 'psth':
+                    values = values[index]
+                results.setdefault(variable, {})[name] = values
+            segments.append(results)
+        return segments
@@ -0,0 +1,431 @@
+"""
+Support for streaming recorded data to disk during a simulation, so that the
+memory needed for recording does not grow with the length of the simulation.
+
+Data are written in fixed-length time chunks. Each chunk is saved in
+NumPy .npz format, in the "arrays" layout returned by
+`Recorder.get(format='arrays')`, within a directory which plays the role of
+the output file. Once a chunk has been written, the corresponding data are
+deleted from the simulator.
+
+The same format is used by `write_by_rank()` and `write_shards()` to write
+the data from all MPI nodes without gathering them all on the root node.
+
+Classes:
+    StreamHandler
+    StreamWriter
+    StreamReader
+
+:copyright: Copyright 2006-2016 by the PyNN team, see AUTHORS.
+:license: CeCILL, see LICENSE for details.
+
+"""
+
+import os
+import glob
+import json
+import logging
+import numpy
+import neo
+import quantities as pq
+from pyNN.recording import (safe_makedirs, arrays_to_segment, merge_arrays, select_cells,
+                             get_mpi_comm, gather_dict, downsample_signal, MPI_ROOT)
+
+logger = logging.getLogger("PyNN")
+
+
+class StreamHandler(object):
+    """
+    Base class for objects which periodically retrieve the data recorded by a
+    `Recorder`, process them, and then delete them from the simulator.
+
+    A StreamHandler is a valid `run()` callback: it accepts the current time,
+    processes the data recorded since the previous call, and returns the time
+    at which it wishes to be called again. If `flush_interval` is None, the
+    data are processed only at the start and end of each run.
+
+    Subclasses should implement `_process(data)`, which receives the data
+    recorded since the previous flush in the "arrays" format (see
+    `Recorder.get()`). Signals do not include samples already processed.
+    """
+
+    def __init__(self, recorder, flush_interval=None):
+        self.recorder = recorder
+        self.flush_interval = flush_interval
+        self._segment = 0
+        self._chunk = 0
+        self._last_flush_time = recorder._simulator.state.t
+        self._reset_signals()
+
+    def _reset_signals(self):
+        self._samples = {}  # number of samples of each signal retrieved so far in the segment
+        self._t_start = {}  # start time of each signal in the segment
+        self._pending = {}  # samples held back until they fill a block, when downsampling by the mean
+
+    def __call__(self, t):
+        if t > self._last_flush_time:
+            self.flush()
+        if self.flush_interval is None:
+            return float('inf')
+        return t + self.flush_interval
+
+    def flush(self, final=False):
+        """
+        Process the data recorded since the last flush, and delete them from
+        the simulator.
+
+        If `final` is True, the segment is complete, and any samples held back
+        for downsampling are also processed.
+        """
+        recorder = self.recorder
+        state = recorder._simulator.state
+        new_data = state.running and recorder.recorded and state.t > self._last_flush_time
+        if not (new_data or (final and self._pending)):
+            return
+        if new_data:
+            data = recorder._get_current_arrays(clear=True, downsample=False)
+        else:
+            data = {}
+        if final:
+            for variable, values in self._pending.items():
+                if variable not in data:
+                    data[variable] = dict(values, signal=values['signal'][:0], t_start=state.t)
+        for variable, values in data.items():
+            if variable != 'spikes':
+                self._downsample(variable, values, final)
+        self._process(data)
+        if new_data:
+            recorder._clear_simulator()
+            recorder.clear_flag = True  # so the processed data are not also stored in the cache
+            recorder._recording_start_time = state.t * pq.ms
+            self._last_flush_time = state.t
+        self._chunk += 1
+
+    def _downsample(self, variable, values, final):
+        """
+        Remove from the signal in `values` any samples which were already in
+        the previous chunk, then downsample it and convert it to the storage
+        type. Downsampling continues from where the previous chunk of the
+        segment finished, so that the samples of all chunks are evenly spaced.
+        """
+        recorder = self.recorder
+        factor, method = recorder.downsampling
+        dt = recorder.sampling_interval
+        signal = values['signal']
+        if variable in self._samples:
+            # depending on the backend, the signal may start with a
+            # repeat of the last sample of the previous chunk
+            n_new = int(round((recorder._simulator.state.t - values['t_start']) / dt))
+            signal = signal[signal.shape[0] - n_new:]
+        else:
+            self._samples[variable] = 0
+            self._t_start[variable] = values['t_start']
+        n_previous = self._samples[variable]
+        self._samples[variable] += signal.shape[0]
+        if method == 'subsample':
+            skip = -n_previous % factor
+            signal = signal[skip::factor]
+            t_start = self._t_start[variable] + (n_previous + skip) * dt
+        else:
+            n_previous -= n_previous % factor
+            if variable in self._pending:
+                pending = self._pending.pop(variable)['signal']
+                signal = numpy.vstack((pending, signal)) if signal.size > 0 else pending
+            n_blocks = signal.shape[0] // factor * factor
+            if n_blocks < signal.shape[0] and not final:
+                self._pending[variable] = dict(values, signal=signal[n_blocks:])
+                signal = signal[:n_blocks]
+            if signal.shape[0] > 0:
+                signal = downsample_signal(signal, factor, method)
+            t_start = self._t_start[variable] + n_previous * dt
+        values['signal'] = signal.astype(recorder.signal_dtype, copy=False)
+        values['t_start'] = t_start
+        values['sampling_period'] = recorder.stored_sampling_interval
+
+    def _process(self, data):
+        raise NotImplementedError
+
+    def new_segment(self):
+        """Flush any remaining data, and start a new segment, e.g. on reset()."""
+        self.flush(final=True)
+        if self._chunk > 0:
+            self._segment += 1
+            self._chunk = 0
+        self._last_flush_time = 0.0
+        self._reset_signals()
+
+    def close(self):
+        """Flush any remaining data."""
+        self.flush(final=True)
+
+
+class StreamWriter(StreamHandler):
+    """
+    Periodically write the data recorded by a `Recorder` to disk and then
+    delete them from the simulator.
+    """
+
+    def __init__(self, recorder, dirname, flush_interval):
+        StreamHandler.__init__(self, recorder, flush_interval)
+        simulator = recorder._simulator
+        if simulator.state.num_processes > 1:
+            dirname += '.%d' % simulator.state.mpi_rank
+        self.dirname = dirname
+        write_metadata(dirname, recorder, flush_interval=flush_interval)
+
+    def _process(self, data):
+        save_arrays(os.path.join(self.dirname, "segment%03d_chunk%06d.npz" % (self._segment, self._chunk)),
+                    data)
+
+
+def write_metadata(dirname, recorder, **extra):
+    """
+    Create the directory `dirname`, and write into it the metadata of the
+    population recorded by `recorder`.
+    """
+    safe_makedirs(dirname)
+    population = recorder.population
+    metadata = {
+        'label': population.label,
+        'first_id': int(population.first_id),
+        'size': population.size,
+        'simulator': recorder._simulator.name,
+    }
+    metadata.update(extra)
+    with open(os.path.join(dirname, "metadata.json"), "w") as fp:
+        json.dump(metadata, fp)
+
+
+def save_arrays(filename, data):
+    """Save data in the "arrays" format (see `Recorder.get()`) in a .npz file."""
+    arrays = {'variables': numpy.array(sorted(data), dtype=str)}
+    for k, variable in enumerate(sorted(data)):
+        for field, value in data[variable].items():
+            arrays["%d_%s" % (k, field)] = numpy.asarray(value)
+    numpy.savez(filename, **arrays)
+    logger.debug("Wrote recorded data to %s", filename)
+
+
+def write_shards(segments, dirname, recorder, **extra):
+    """
+    Write data in the "arrays" format from each MPI node, in parallel, to its
+    own files ("shards") in the directory `dirname`.
+
+    The root node also writes a manifest, listing for each node its files and
+    the range of cell indices they contain for each variable. The data can
+    then be read with `StreamReader`. Any additional keyword arguments are
+    added to the manifest.
+    """
+    state = recorder._simulator.state
+    safe_makedirs(dirname)
+    shard = {'rank': state.mpi_rank, 'files': [], 'index_ranges': []}
+    for i, data in enumerate(segments):
+        filename = "segment%03d_rank%04d.npz" % (i, state.mpi_rank)
+        save_arrays(os.path.join(dirname, filename), data)
+        shard['files'].append(filename)
+        shard['index_ranges'].append(
+            dict((variable, [int(values['index'].min()), int(values['index'].max())])
+                 for variable, values in data.items() if values['index'].size > 0))
+    if state.num_processes > 1:
+        # the gather also ensures that all shards have been written before the manifest
+        shards = gather_dict({state.mpi_rank: shard})
+    else:
+        shards = {state.mpi_rank: shard}
+    if state.mpi_rank == MPI_ROOT:
+        write_metadata(dirname, recorder, segments=len(segments),
+                       shards=[shards[rank] for rank in sorted(shards)], **extra)
+
+
+def write_by_rank(segments, dirname, recorder, **extra):
+    """
+    Write data in the "arrays" format from all MPI nodes to the directory
+    `dirname`, which can then be read with `StreamReader`. Any additional
+    keyword arguments are added to the metadata.
+
+    Only the root node writes. It receives the data from the other nodes one
+    node at a time, so never holds more than the data of a single node.
+    """
+    mpi_comm, mpi_flags = get_mpi_comm()
+    if mpi_comm.rank == MPI_ROOT:
+        write_metadata(dirname, recorder, **extra)
+        for rank in range(mpi_comm.size):
+            if rank != MPI_ROOT:
+                segments = recv_arrays(mpi_comm, mpi_flags, source=rank)
+            for i, data in enumerate(segments):
+                save_arrays(os.path.join(dirname, "segment%03d_rank%04d.npz" % (i, rank)), data)
+            segments = None
+    else:
+        send_arrays(mpi_comm, mpi_flags, segments, dest=MPI_ROOT)
+
+
+MAX_MESSAGE_SIZE = 2**30  # bytes, well within the range of MPI's int counts
+
+
+def send_arrays(mpi_comm, mpi_flags, segments, dest):
+    """
+    Send a list of segments in the "arrays" format to node `dest`.
+
+    Only a small header, describing the arrays, is pickled. The arrays
+    themselves are sent as raw buffers, in messages of at most
+    `MAX_MESSAGE_SIZE` bytes.
+    """
+    header = []
+    arrays = []
+    for data in segments:
+        segment_header = {}
+        for variable, values in sorted(data.items()):
+            scalars = {}
+            array_fields = []
+            for key, value in sorted(values.items()):
+                if isinstance(value, numpy.ndarray):
+                    assert not value.dtype.hasobject
+                    array_fields.append((key, value.dtype.str, value.shape))
+                    arrays.append(numpy.ascontiguousarray(value))
+                else:
+                    scalars[key] = value
+            segment_header[variable] = (scalars, array_fields)
+        header.append(segment_header)
+    mpi_comm.send(header, dest=dest)
+    for array in arrays:
+        buffer = array.reshape(-1).view(numpy.uint8)
+        for start in range(0, buffer.size, MAX_MESSAGE_SIZE):
+            mpi_comm.Send([buffer[start:start + MAX_MESSAGE_SIZE], mpi_flags['BYTE']], dest=dest)
+
+
+def recv_arrays(mpi_comm, mpi_flags, source):
+    """Receive a list of segments in the "arrays" format sent by `send_arrays()`."""
+    header = mpi_comm.recv(source=source)
+    segments = []
+    for segment_header in header:
+        data = {}
+        for variable, (scalars, array_fields) in sorted(segment_header.items()):
+            data[variable] = dict(scalars)
+            for key, dtype, shape in array_fields:
+                array = numpy.empty(shape, dtype=dtype)
+                buffer = array.reshape(-1).view(numpy.uint8)
+                for start in range(0, buffer.size, MAX_MESSAGE_SIZE):
+                    mpi_comm.Recv([buffer[start:start + MAX_MESSAGE_SIZE], mpi_flags['BYTE']], source=source)
+                data[variable][key] = array
+        segments.append(data)
+    return segments
+
+
+class StreamReader(object):
+    """
+    Read data written by a `StreamWriter`, `write_by_rank()` or
+    `write_shards()`.
+
+    Files are only loaded from disk when the data are requested, and only for
+    the requested variables. For data written by `write_shards()`, the
+    manifest is used to load only those shards which contain the requested
+    cells.
+    """
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        with open(os.path.join(dirname, "metadata.json")) as fp:
+            self.metadata = json.load(fp)
+
+    @property
+    def segments(self):
+        """A list containing, for each segment, a list of chunk or shard filenames."""
+        if 'shards' in self.metadata:
+            return [[os.path.join(self.dirname, shard['files'][i]) for shard in self.metadata['shards']]
+                    for i in range(self.metadata['segments'])]
+        filenames = sorted(glob.glob(os.path.join(self.dirname, "segment*_*.npz")))
+        segments = {}
+        for filename in filenames:
+            segment = int(os.path.basename(filename)[7:10])
+            segments.setdefault(segment, []).append(filename)
+        return [segments[i] for i in sorted(segments)]
+
+    def _read_chunk(self, filename, variables):
+        chunk = numpy.load(filename)
+        data = {}
+        for k, variable in enumerate(chunk['variables']):
+            variable = str(variable)
+            if variables == 'all' or variable in variables:
+                prefix = "%d_" % k
+                data[variable] = dict((key[len(prefix):], chunk[key][()] if chunk[key].ndim == 0 else chunk[key])
+                                      for key in chunk.files if key.startswith(prefix))
+        return data
+
+    def _shard_contains(self, index_ranges, variables, indices):
+        """
+        Use the index ranges given in the manifest to determine whether a
+        shard may contain data for any of the given cells.
+        """
+        return any(numpy.any((indices >= first) & (indices <= last))
+                   for variable, (first, last) in index_ranges.items()
+                   if variables == 'all' or variable in variables)
+
+    def read_arrays(self, variables='all', indices=None):
+        """
+        Return the data in the "arrays" format (see `Recorder.get()`), with
+        the chunks or shards of each segment joined together.
+
+        If `indices` is given, only the data for the cells with these indices
+        are returned.
+        """
+        if isinstance(variables, str) and variables != 'all':
+            variables = [variables]
+        if indices is not None:
+            indices = numpy.asarray(indices, dtype=int)
+        segments = []
+        for i, filenames in enumerate(self.segments):
+            if indices is not None and 'shards' in self.metadata:
+                filenames = [filename for filename, shard in zip(filenames, self.metadata['shards'])
+                             if self._shard_contains(shard['index_ranges'][i], variables, indices)]
+            parts = [self._read_chunk(filename, variables) for filename in filenames]
+            if indices is not None:
+                parts = [select_cells(part, indices) for part in parts]
+            if not parts:
+                segments.append({})
+            elif "_rank" in filenames[0]:  # written by write_by_rank() or write_shards()
+                segments.append(merge_arrays(parts, unique=True))
+            else:
+                segments.append(join_chunks(parts))
+        return segments
+
+    def read_block(self, variables='all', indices=None):
+        """
+        Return the data as a Neo `Block`. If `indices` is given, only the data
+        for the cells with these indices are included.
+        """
+        block = neo.Block(name=self.metadata['label'])
+        for i, data in enumerate(self.read_arrays(variables, indices)):
+            segment = arrays_to_segment(data, self.metadata['label'], self.metadata['first_id'])
+            segment.name = "segment%03d" % i
+            block.segments.append(segment)
+            for signal in segment.analogsignals:
+                block.channel_indexes.append(signal.channel_index)
+        block.annotate(**dict((key, value) for key, value in self.metadata.items()
+                              if key not in ('shards', 'segments')))
+        return block
+
+
+def join_chunks(chunks):
+    """
+    Join consecutive chunks of data in the "arrays" format into a single
+    chunk. All chunks should contain the same cells.
+    """
+    joined = {}
+    for variable in set().union(*chunks):
+        parts = [chunk[variable] for chunk in chunks if variable in chunk]
+        joined[variable] = dict(parts[0])
+        if variable == 'spikes':
+            # interleave the spike times of each cell
+            counts = numpy.vstack([numpy.diff(part['indptr']) for part in parts])
+            times = numpy.hstack([part['times'] for part in parts])
+            chunk_of_spike = numpy.repeat(numpy.arange(len(parts)), counts.sum(axis=1))
+            cell_of_spike = numpy.hstack([numpy.repeat(numpy.arange(counts.shape[1]), n)
+                                          for n in counts])
+            order = numpy.lexsort((chunk_of_spike, cell_of_spike))
+            joined[variable]['times'] = times[order]
+            joined[variable]['indptr'] = numpy.hstack(([0], numpy.cumsum(counts.sum(axis=0))))
+            joined[variable]['t_stop'] = parts[-1]['t_stop']
+        else:
+            signals = [part['signal'] for part in parts if part['signal'].size > 0]
+            if signals:
+                joined[variable]['signal'] = numpy.vstack(signals)
+    return joined
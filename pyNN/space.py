@@ -31,12 +31,15 @@ except NameError:
 import numpy
 import math
 from operator import and_
+from itertools import product
 from pyNN.random import NumpyRNG
 from pyNN import descriptions
 import logging
 
 logger = logging.getLogger("PyNN")
 
+MAX_GRID_CELLS = 2**20  # maximum number of grid cells per axis used by Space.pairs_within_distance()
+
 
 def distance(src, tgt, mask=None, scale_factor=1.0, offset=0.0,
              periodic_boundaries=None):  # may need to add an offset parameter
@@ -128,6 +131,124 @@ class Space(object):
         numpy.sqrt(d, d)
         return d.flatten()
 
+    def paired_distances(self, A, B):
+        """
+        Calculate the distances between corresponding rows of two equal-sized
+        sets of coordinates, given the topology of the current space.
+        """
+        assert A.shape == B.shape
+        assert A.shape[-1] == 3
+        B = self.scale_factor * (B + self.offset)
+        d = numpy.zeros(A.shape[:-1], dtype=float)
+        for axis in self.axes:
+            diff = A[..., axis] - B[..., axis]
+            if self.periodic_boundaries is not None:
+                boundaries = self.periodic_boundaries[axis]
+                if boundaries is not None:
+                    range = boundaries[1] - boundaries[0]
+                    ad = abs(diff)
+                    diff = numpy.minimum(ad, range - ad)
+            d += diff**2
+        return numpy.sqrt(d)
+
+    def pairs_within_distance(self, A, B, max_distance):
+        """
+        Find all pairs of points, one from each of two sets of coordinates,
+        which are separated by no more than `max_distance`, given the topology
+        of the current space.
+
+        Returns three arrays, `i`, `j` and `d`, such that the distance between
+        `A[i[k]]` and `B[j[k]]` is `d[k]`. The pairs are sorted by `j`, then
+        by `i`.
+
+        Rather than calculating the full distance matrix, the points are
+        bucketed into a grid with a cell size of at least `max_distance`, so
+        that only points in neighbouring cells need to be compared.
+        """
+        assert A.ndim == 2 and B.ndim == 2
+        assert A.shape[-1] == 3 and B.shape[-1] == 3
+        max_distance = float(max_distance)
+        Bs = self.scale_factor * (B + self.offset)
+        n_cells = []
+        cell_indices_A = []
+        cell_indices_B = []
+        periodic = []
+        for axis in self.axes:
+            a = A[:, axis]
+            b = Bs[:, axis]
+            if self.periodic_boundaries is not None and self.periodic_boundaries[axis] is not None:
+                lower, upper = self.periodic_boundaries[axis]
+                n = int((upper - lower) // max_distance) if max_distance > 0 else 1
+                n = min(max(n, 1), MAX_GRID_CELLS)
+                cell_size = (upper - lower) / float(n)
+                ca = numpy.floor((a - lower) / cell_size).astype(int) % n
+                cb = numpy.floor((b - lower) / cell_size).astype(int) % n
+                periodic.append(True)
+            else:
+                ab = numpy.hstack((a, b))
+                lower, upper = (ab.min(), ab.max()) if ab.size else (0.0, 0.0)
+                cell_size = max(max_distance, (upper - lower) / float(MAX_GRID_CELLS))
+                if cell_size > 0:
+                    n = int((upper - lower) // cell_size) + 1
+                    ca = numpy.floor((a - lower) / cell_size).astype(int)
+                    cb = numpy.floor((b - lower) / cell_size).astype(int)
+                else:  # all points have the same coordinate
+                    n = 1
+                    ca = numpy.zeros(a.shape, dtype=int)
+                    cb = numpy.zeros(b.shape, dtype=int)
+                periodic.append(False)
+            n_cells.append(n)
+            cell_indices_A.append(ca)
+            cell_indices_B.append(cb)
+        # offsets of the neighbouring cells along each axis. With fewer than
+        # three cells along a periodic axis, some neighbours coincide.
+        neighbour_offsets = [sorted(set(o % n for o in (-1, 0, 1))) if p else (-1, 0, 1)
+                             for n, p in zip(n_cells, periodic)]
+
+        def cell_key(cell_indices):
+            key = numpy.zeros(cell_indices[0].shape, dtype=numpy.int64)
+            for c, n in zip(cell_indices, n_cells):
+                key = key * n + c
+            return key
+
+        # sort the points of A by grid cell, so that the points in any given
+        # cell can be found with a binary search
+        keys_A = cell_key(cell_indices_A)
+        order_A = numpy.argsort(keys_A, kind='mergesort')
+        sorted_keys_A = keys_A[order_A]
+
+        candidates_i = []
+        candidates_j = []
+        for offset in product(*neighbour_offsets):
+            neighbour_cells = []
+            valid = numpy.ones(B.shape[0], dtype=bool)
+            for cb, o, n, p in zip(cell_indices_B, offset, n_cells, periodic):
+                c = cb + o
+                if p:
+                    c %= n
+                else:
+                    valid &= (c >= 0) & (c < n)
+                neighbour_cells.append(c)
+            keys = cell_key(neighbour_cells)[valid]
+            j = valid.nonzero()[0]
+            start = numpy.searchsorted(sorted_keys_A, keys, side='left')
+            stop = numpy.searchsorted(sorted_keys_A, keys, side='right')
+            counts = stop - start
+            j = numpy.repeat(j, counts)
+            # positions within sorted_keys_A of all the points in the neighbouring cells
+            positions = (numpy.arange(counts.sum())
+                         - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+                         + numpy.repeat(start, counts))
+            candidates_i.append(order_A[positions])
+            candidates_j.append(j)
+        i = numpy.hstack(candidates_i).astype(int)
+        j = numpy.hstack(candidates_j).astype(int)
+        d = self.paired_distances(A[i], B[j])
+        within = d <= max_distance
+        i, j, d = i[within], j[within], d[within]
+        order = numpy.lexsort((i, j))
+        return i[order], j[order], d[order]
+
     def distance_generator(self, f, g):
         def distance_map(i, j):
             shape = []
@@ -137,6 +258,10 @@ class Space(object):
             if isinstance(j, numpy.ndarray) and j.ndim == 2:
                 j = j[0, :]
                 shape.append(j.size)
+            if (not shape and isinstance(i, numpy.ndarray) and isinstance(j, numpy.ndarray)
+                    and i.ndim == 1 and j.ndim == 1):
+                # paired indices, i.e. the distances for the pairs (i[k], j[k])
+                return self.paired_distances(f(i), g(j))
             d = self.distances(f(i), g(j))
             if shape:
                 return d.reshape(shape)
@@ -5,6 +5,7 @@ that are available in multiple simulators:
 
 Functions:
     build_translations()
+    compile_transform()
 
 Classes:
     StandardModelType
@@ -18,11 +19,12 @@ Classes:
 
 """
 
+import re
+import operator
 from pyNN import errors, models
-from pyNN.parameters import ParameterSpace
+from pyNN.parameters import ParameterSpace, LazyArray
 import numpy
 from pyNN.core import is_listlike, itervalues
-from copy import deepcopy
 
 # ==============================================================================
 #   Standard cells
@@ -54,6 +56,78 @@ def build_translations(*translation_list):
     return translations
 
 
+_identifier = re.compile(r"^[A-Za-z_]\w*$")
+_scaling = re.compile(r"^float\(([^()]+)\)\*([A-Za-z_]\w*)$")
+_inverse_scaling = re.compile(r"^([A-Za-z_]\w*)/float\(([^()]+)\)$")
+_compiled_transforms = {}
+
+
+def compile_transform(transform):
+    """
+    Compile a parameter transformation, given as a string expression (as
+    produced by `build_translations()`) or as a function.
+
+    Returns a tuple `(kind, argument)`, where `kind` is one of:
+        "identity": `argument` is the name of the parameter to be copied;
+        "scale": `argument` is a tuple `(name, operator, factor)`;
+        "expression": `argument` is a code object;
+        "function": `argument` is the function itself.
+
+    String transformations are compiled only once, however many models and
+    model instances use them.
+    """
+    if callable(transform):
+        return "function", transform
+    if transform not in _compiled_transforms:
+        expression = transform.replace(" ", "")
+        if _identifier.match(expression):
+            compiled = ("identity", expression)
+        elif _scaling.match(expression):
+            factor, name = _scaling.match(expression).groups()
+            compiled = ("scale", (name, operator.mul, float(factor)))
+        elif _inverse_scaling.match(expression):
+            name, factor = _inverse_scaling.match(expression).groups()
+            compiled = ("scale", (name, operator.truediv, float(factor)))
+        else:
+            compiled = ("expression", compile(transform, "<transform>", "eval"))
+        _compiled_transforms[transform] = compiled
+    return _compiled_transforms[transform]
+
+
+def _apply_transform(compiled, parameters):
+    """
+    Apply a compiled transformation to the values in `parameters`, which may
+    be a `ParameterSpace` or a dict.
+
+    Lazy arrays are not evaluated. For the identity and scaling
+    transformations, the result shares the base value of the original lazy
+    array, so nothing is copied.
+    """
+    kind, argument = compiled
+    if kind == "identity" or kind == "scale":
+        if kind == "identity":
+            name, op = argument, None
+        else:
+            name, op, factor = argument
+        if name not in parameters.keys():
+            raise NameError("name '%s' is not defined" % name)
+        value = parameters[name]
+        if isinstance(value, LazyArray):
+            new_value = LazyArray(value)
+            new_value.operations = list(value.operations)
+            if op is not None:
+                new_value.operations.append((op, factor))
+            return new_value
+        elif op is None:
+            return value
+        else:
+            return op(value, factor)
+    elif kind == "expression":
+        return eval(argument, globals(), parameters)
+    else:
+        return argument(**parameters)
+
+
 class StandardModelType(models.BaseModelType):
     """Base class for standardized cell model and synapse model classes."""
 
@@ -71,7 +145,6 @@ class StandardModelType(models.BaseModelType):
 
     def translate(self, parameters):
         """Translate standardized model parameters to simulator-specific parameters."""
-        _parameters = deepcopy(parameters)
         cls = self.__class__
         if parameters.schema != self.get_schema():
             raise Exception("Schemas do not match: %s != %s" % (parameters.schema, self.get_schema()))  # should replace this with a PyNN-specific exception type
@@ -79,17 +152,11 @@ class StandardModelType(models.BaseModelType):
         for name in parameters.keys():
             D = self.translations[name]
             pname = D['translated_name']
-            if callable(D['forward_transform']):
-                pval = D['forward_transform'](**_parameters)
-            else:
-                try:
-                    pval = eval(D['forward_transform'], globals(), _parameters)
-                except NameError as errmsg:
-                    raise NameError("Problem translating '%s' in %s. Transform: '%s'. Parameters: %s. %s"
-                                    % (pname, cls.__name__, D['forward_transform'], parameters, errmsg))
-                except ZeroDivisionError:
-                    raise
-                    #pval = 1e30 # this is about the highest value hoc can deal with
+            try:
+                pval = _apply_transform(compile_transform(D['forward_transform']), parameters)
+            except NameError as errmsg:
+                raise NameError("Problem translating '%s' in %s. Transform: '%s'. Parameters: %s. %s"
+                                % (pname, cls.__name__, D['forward_transform'], parameters, errmsg))
             native_parameters[pname] = pval
         return ParameterSpace(native_parameters, schema=None, shape=parameters.shape)
 
@@ -100,14 +167,12 @@ class StandardModelType(models.BaseModelType):
         for name, D in self.translations.items():
             tname = D['translated_name']
             if tname in native_parameters.keys():
-                if callable(D['reverse_transform']):
-                    standard_parameters[name] = D['reverse_transform'](**native_parameters)
-                else:
-                    try:
-                        standard_parameters[name] = eval(D['reverse_transform'], {}, native_parameters)
-                    except NameError as errmsg:
-                        raise NameError("Problem translating '%s' in %s. Transform: '%s'. Parameters: %s. %s"
-                                        % (name, cls.__name__, D['reverse_transform'], native_parameters, errmsg))
+                try:
+                    standard_parameters[name] = _apply_transform(compile_transform(D['reverse_transform']),
+                                                                 native_parameters)
+                except NameError as errmsg:
+                    raise NameError("Problem translating '%s' in %s. Transform: '%s'. Parameters: %s. %s"
+                                    % (name, cls.__name__, D['reverse_transform'], native_parameters, errmsg))
         return ParameterSpace(standard_parameters, schema=self.get_schema(), shape=native_parameters.shape)
 
     def simple_parameters(self):
@@ -0,0 +1,84 @@
+"""
+Compare two strategies for creating NEST neurons with inhomogeneous
+parameter values:
+
+  "dicts"     - create the neurons with a list containing one parameter dict
+                per neuron (the approach previously used by PyNN)
+  "setstatus" - create the neurons with the homogeneous parameters only, then
+                call SetStatus once for each inhomogeneous parameter, with a
+                list of values
+
+and time the creation of the same population through PyNN.
+
+Usage: python nest_parameter_setting.py [-n N [N ...]] [--inhomogeneous K]
+
+:copyright: Copyright 2006-2016 by the PyNN team, see AUTHORS.
+:license: CeCILL, see LICENSE for details.
+"""
+
+from __future__ import print_function
+import argparse
+import numpy
+import nest
+import pyNN.nest as sim
+from pyNN.random import RandomDistribution, NumpyRNG
+from pyNN.utility import Timer
+
+parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+parser.add_argument("-n", "--size", type=int, nargs="+", default=[100000, 1000000],
+                    help="population sizes")
+parser.add_argument("--inhomogeneous", type=int, default=2,
+                    help="number of parameters with a different value for each neuron")
+args = parser.parse_args()
+
+model = "iaf_psc_exp"
+homogeneous = {"C_m": 250.0, "tau_m": 10.0, "t_ref": 2.0, "tau_syn_ex": 5.0,
+               "tau_syn_in": 5.0, "E_L": -70.0, "V_reset": -70.0}
+inhomogeneous_names = ["V_th", "I_e", "tau_m", "C_m"][:args.inhomogeneous]
+rng = numpy.random.RandomState(28347)
+timer = Timer()
+
+
+def create_with_dicts(n, values):
+    params = []
+    for i in range(n):
+        D = dict(homogeneous)
+        D.update((name, value[i]) for name, value in values.items())
+        params.append(D)
+    return nest.Create(model, n, params=params)
+
+
+def create_with_setstatus(n, values):
+    params = dict((name, value) for name, value in homogeneous.items()
+                  if name not in values)
+    gids = nest.Create(model, n, params=params)
+    for name, value in values.items():
+        nest.SetStatus(gids, name, value.tolist())
+    return gids
+
+
+print("%10s %12s %12s %12s" % ("size", "dicts (s)", "setstatus (s)", "PyNN (s)"))
+for n in args.size:
+    values = dict((name, homogeneous.get(name, -55.0) + rng.uniform(-1.0, 1.0, size=n))
+                  for name in inhomogeneous_names)
+    timings = []
+    for create in (create_with_dicts, create_with_setstatus):
+        nest.ResetKernel()
+        timer.start()
+        gids = create(n, values)
+        timings.append(timer.diff())
+        # check that both strategies give the same result
+        for name, value in values.items():
+            assert numpy.allclose(nest.GetStatus(gids[-10:], name), value[-10:])
+
+    sim.setup()
+    parameters = dict(homogeneous)
+    for name in inhomogeneous_names:
+        mean = homogeneous.get(name, -55.0)
+        parameters[name] = RandomDistribution("uniform", (mean - 1.0, mean + 1.0),
+                                              rng=NumpyRNG(seed=28347))
+    timer.start()
+    sim.Population(n, sim.native_cell_type(model)(**parameters))
+    timings.append(timer.diff())
+    sim.end()
+    print("%10d %12.3f %12.3f %12.3f" % ((n,) + tuple(timings)))
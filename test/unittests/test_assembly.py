@@ -327,6 +327,15 @@ class AssemblyTest(unittest.TestCase):
         a = sim.Assembly(p3, p1, p2)
         self.assertRaises(IndexError, a.id_to_index, p3.last_id + 1)
 
+    @register()
+    def test_id_to_index_after_adding_population(self, sim=sim):
+        p1 = sim.Population(11, sim.IF_cond_exp())
+        p2 = sim.Population(6, sim.IF_cond_alpha())
+        a = sim.Assembly(p2)
+        self.assertEqual(a.id_to_index(p2[3]), 3)
+        a += p1
+        assert_array_equal(a.id_to_index([p1[0], p2[3]]), [6, 3])
+
     @register()
     def test_getitem_int(self, sim=sim):
         p1 = sim.Population(11, sim.IF_cond_exp())
@@ -423,6 +432,23 @@ class AssemblyTest(unittest.TestCase):
         #assert_array_equal(seg1.spiketrains[7],
         #                   numpy.array([a.first_id+7, a.first_id+7+5]) % t3)
 
+    @register()
+    def test_get_data_as_arrays(self, sim=sim):
+        p1 = sim.Population(11, sim.IF_cond_exp())
+        p2 = sim.Population(6, sim.IF_cond_alpha())
+        a = sim.Assembly(p2, p1)
+        a.record('v')
+        p1.record('spikes')
+        sim.run(12.3)
+        data = a.get_data(format='arrays')
+        self.assertEqual(len(data), 1)
+        v = data[0]['v']
+        assert_array_equal(v['index'], numpy.arange(a.size))
+        self.assertEqual(v['signal'].shape, (int(round(12.3 / sim.get_time_step())) + 1, a.size))
+        spikes = data[0]['spikes']
+        assert_array_equal(spikes['index'], p2.size + numpy.arange(p1.size))
+        self.assertEqual(spikes['times'].size, spikes['indptr'][-1])
+
     @register()
     def test_printSpikes(self, sim=sim):
         # TODO: implement assert_deprecated
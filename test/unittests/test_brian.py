@@ -46,5 +46,23 @@ class TestProjection(unittest.TestCase):
         self.assertEqual(prj._localize_index(5), (1, 1))
         self.assertEqual(prj._localize_index(7), (1, 3))
 
+        groups, local_indices = prj._localize_indices(a, numpy.array([0, 3, 5, 7]))
+        assert_array_equal(groups, numpy.array([0, 0, 1, 1]))
+        assert_array_equal(local_indices, numpy.array([0, 3, 1, 3]))
+
+    def test_connect_batch(self):
+        p1 = sim.Population(5, sim.IF_cond_exp())
+        p2 = sim.Population(7, sim.IF_cond_exp())
+        prj = sim.Projection(p1, p2, MockConnector(), synapse_type=self.syn)
+        # includes two connections between the same pair of neurons
+        prj._connect_batch(numpy.array([0, 2, 2, 4]), numpy.array([1, 1, 1, 6]),
+                           weight=numpy.array([0.1, 0.2, 0.3, 0.4]), delay=0.5)
+        self.assertEqual(prj.size(), 4)
+        connections = prj.get(["weight", "delay"], format="list")
+        self.assertEqual(sorted((i, j) for i, j, w, d in connections),
+                         [(0, 1), (2, 1), (2, 1), (4, 6)])
+        assert_array_almost_equal(sorted(w for i, j, w, d in connections),
+                                  [0.1, 0.2, 0.3, 0.4])
+
 if __name__ == '__main__':
     unittest.main()
@@ -223,6 +223,26 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                           (2, 1, 0.0, 0.123),
                           (3, 1, 0.0, 0.123)])
 
+    @unittest.skipUnless(random.have_philox, "Requires numpy.random.Philox")
+    @register()
+    def test_connect_with_splittable_rng(self, sim=sim):
+        def connections():
+            C = connectors.FixedProbabilityConnector(p_connect=0.5, rng=random.PhiloxRNG(seed=7364))
+            syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0.1, 0.5),
+                                                                     rng=random.PhiloxRNG(seed=2783)))
+            p1 = sim.Population(4, sim.IF_cond_exp())
+            p2 = sim.Population(5, sim.HH_cond_exp())
+            prj = sim.Projection(p1, p2, C, syn)
+            return prj.get("weight", format='list', gather=False), p2._mask_local
+        # on two (fake) MPI nodes, only the random numbers for the local columns are drawn,
+        # but the connections are the same as for a single node
+        parallel_connections, mask_local = connections()
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        serial_connections, _ = connections()
+        self.assertGreater(len(parallel_connections), 0)
+        self.assertEqual(parallel_connections,
+                         [c for c in serial_connections if mask_local[c[1]]])
+
     @register()
     def test_connect_with_default_args_again(self, sim=sim):
         C = connectors.FixedProbabilityConnector(p_connect=0.5,
@@ -568,6 +588,35 @@ class TestFixedNumberPostConnector(unittest.TestCase):
                           (1, 3, 0.0, 0.123),
                           (2, 3, 0.0, 0.123)])
 
+    @register()
+    def test_with_replacement_with_small_tiles(self, sim=sim):
+        C = connectors.FixedNumberPostConnector(n=3, with_replacement=True, rng=MockRNG(delta=1))
+        C.tile_size = 4
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
+                         [(0, 1, 0.0, 0.123),
+                          (2, 1, 0.0, 0.123),
+                          (3, 1, 0.0, 0.123),
+                          (1, 3, 0.0, 0.123),
+                          (2, 3, 0.0, 0.123)])
+
+    @register()
+    def test_with_replacement_with_variable_n_sharing_rng(self, sim=sim):
+        rng = MockRNG(start=1, delta=1)
+        n = random.RandomDistribution('binomial', (5, 0.5), rng=rng)
+        C = connectors.FixedNumberPostConnector(n=n, with_replacement=True, rng=rng)
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        # n and the targets are drawn alternately from the same sequence:
+        # 0 - n=1: 2
+        # 1 - n=3: 4 0 1
+        # 2 - n=2: 3 4
+        # 3 - n=0
+        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
+                         [(1, 1, 0.0, 0.123),
+                          (2, 3, 0.0, 0.123)])
+
     @register()
     def test_with_replacement_with_variable_n(self, sim=sim):
         n = random.RandomDistribution('binomial', (5, 0.5), rng=MockRNG(start=1, delta=2))
@@ -801,7 +850,7 @@ class TestArrayConnector(unittest.TestCase):
             ], dtype=bool)
         C = connectors.ArrayConnector(connections, safe=False)
         prj = sim.Projection(self.p1, self.p2, C, syn)
-        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
+        assert_array_almost_equal(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
                          [(1, 0, 0.0, 1.0),
                           (0, 2, 3.0, 1.3),
                           (2, 2, 4.0, 1.4000000000000001)])  # better to do an "almost-equal" check
@@ -826,17 +875,23 @@ class TestCloneConnector(unittest.TestCase):
         syn = sim.StaticSynapse()
         self.ref_prj = sim.Projection(self.p1, self.p2, list_connector, syn)
         self.orig_gather_dict = recording.gather_dict  # create reference to original function
-        # The gather_dict function in recording needs to be temporarily replaced so it can work with
-        # a mock version of the function to avoid it throwing an mpi4py import error when setting
+        self.orig_gather_structured = recording.gather_structured
+        # The gather functions in recording need to be temporarily replaced so they can work with
+        # mock versions of the functions to avoid them throwing an mpi4py import error when setting
         # the rank in pyNN.mock by hand to > 1
 
         def mock_gather_dict(D, all=False):
             return D
+
+        def mock_gather_structured(data, all=False):
+            return data
         recording.gather_dict = mock_gather_dict
+        recording.gather_structured = mock_gather_structured
 
     def tearDown(self, sim=sim):
-        # restore original gather_dict function
+        # restore original gather functions
         recording.gather_dict = self.orig_gather_dict
+        recording.gather_structured = self.orig_gather_structured
 
     @register()
     def test_connect(self, sim=sim):
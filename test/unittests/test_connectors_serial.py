@@ -422,6 +422,34 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                                                [  1.2,   1.4,   nan,   nan,   2.8]]),
                                   9)
 
+    @register()
+    def test_connect_with_small_tiles(self, sim=sim):
+        weights = {}
+        for tile_size in (1, 8, 1000):
+            rng = random.NumpyRNG(seed=8364)
+            w_rng = random.NumpyRNG(seed=2368)
+            syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0, 1), rng=w_rng))
+            C = connectors.FixedProbabilityConnector(p_connect=0.5, rng=rng)
+            C.tile_size = tile_size
+            prj = sim.Projection(self.p1, self.p2, C, syn)
+            weights[tile_size] = prj.get("weight", format='array')
+        assert_array_equal(weights[1], weights[8])
+        assert_array_equal(weights[1], weights[1000])
+
+    @register()
+    def test_connect_with_shared_rng(self, sim=sim):
+        # when the connector and the synapse parameters share an RNG,
+        # the numbers must be consumed column by column
+        weights = {}
+        for tile_size in (1, 1000):
+            rng = random.NumpyRNG(seed=8364)
+            syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0, 1), rng=rng))
+            C = connectors.FixedProbabilityConnector(p_connect=0.5, rng=rng)
+            C.tile_size = tile_size
+            prj = sim.Projection(self.p1, self.p2, C, syn)
+            weights[tile_size] = prj.get("weight", format='array')
+        assert_array_equal(weights[1], weights[1000])
+
 
 @register_class()
 class TestDistanceDependentProbabilityConnector(unittest.TestCase):
@@ -455,6 +483,48 @@ class TestDistanceDependentProbabilityConnector(unittest.TestCase):
                           (3, 3, 0.0, 0.123),
                           (3, 4, 0.0, 0.123)])
 
+    @register()
+    def test_connect_with_max_distance(self, sim=sim):
+        C = connectors.DistanceDependentProbabilityConnector(d_expression="d<1.5",
+                                                             rng=MockRNG(delta=0.01),
+                                                             max_distance=1.5)
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(0, 0, 0.0, 0.123),
+                          (1, 0, 0.0, 0.123),
+                          (0, 1, 0.0, 0.123),
+                          (1, 1, 0.0, 0.123),
+                          (2, 1, 0.0, 0.123),
+                          (1, 2, 0.0, 0.123),
+                          (2, 2, 0.0, 0.123),
+                          (3, 2, 0.0, 0.123),
+                          (2, 3, 0.0, 0.123),
+                          (3, 3, 0.0, 0.123),
+                          (3, 4, 0.0, 0.123)])
+
+    @register()
+    def test_connect_with_max_distance_and_periodic_boundaries(self, sim=sim):
+        C = connectors.DistanceDependentProbabilityConnector(d_expression="exp(-d)",
+                                                             rng=MockRNG(delta=0.01),
+                                                             max_distance=1.0)
+        syn = sim.StaticSynapse(weight="0.5 + d")
+        prj = sim.Projection(self.p1, self.p2, C, syn,
+                             space=space.Space(periodic_boundaries=((0, 5), None, None)))
+        self.assertEqual(prj.get("weight", format='list'),
+                         [(0, 0, 0.5),
+                          (1, 0, 1.5),
+                          (0, 1, 1.5),
+                          (1, 1, 0.5),
+                          (2, 1, 1.5),
+                          (1, 2, 1.5),
+                          (2, 2, 0.5),
+                          (3, 2, 1.5),
+                          (2, 3, 1.5),
+                          (3, 3, 0.5),
+                          (0, 4, 1.5),
+                          (3, 4, 1.5)])
+
 
 @register_class()
 class TestFromListConnector(unittest.TestCase):
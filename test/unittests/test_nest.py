@@ -4,6 +4,7 @@ try:
 except ImportError:
     nest = False
 from pyNN.standardmodels import StandardCellType
+from pyNN import errors
 try:
     import unittest2 as unittest
 except ImportError:
@@ -80,6 +81,20 @@ class TestPopulation(unittest.TestCase):
     def test_set_parameters_scalar(self):
         self.p[0:1].set(tau_m=20.)
 
+    def test_set_homogeneous_and_inhomogeneous_parameters(self):
+        self.p.set(tau_m=15., cm=numpy.array([1.1, 1.2, 1.3, 1.4]))
+        ps = self.p._get_parameters('tau_m', 'C_m')
+        ps.evaluate(simplify=True)
+        self.assertAlmostEqual(ps['tau_m'], 15.0, places=12)
+        assert_array_almost_equal(ps['C_m'], numpy.array([1100, 1200, 1300, 1400], float),
+                                  decimal=9)
+
+    def test_create_gif_with_inhomogeneous_parameters(self):
+        p = sim.Population(3, sim.GIF_cond_exp(tau_gamma1=numpy.array([10.0, 20.0, 30.0])))
+        tau_sfa = numpy.array(nest.GetStatus(p.all_cells.tolist(), 'tau_sfa'))
+        assert_array_equal(tau_sfa[:, 0], numpy.array([10.0, 20.0, 30.0]))
+        self.assertEqual(tau_sfa[0, 1], tau_sfa[2, 1])
+
 
 @unittest.skipUnless(nest, "Requires NEST")
 class TestProjection(unittest.TestCase):
@@ -103,6 +118,60 @@ class TestProjection(unittest.TestCase):
         prj = sim.Projection(self.p1, self.p2, self.all2all,
                              synapse_type=sim.TsodyksMarkramSynapse())
 
+    def test_create_with_heterogeneous_synapse_parameters(self):
+        U = numpy.arange(28).reshape((7, 4)) / 28.0
+        weight = numpy.arange(28).reshape((7, 4)) / 10.0 + 0.1
+        prj = sim.Projection(self.p1, self.p2, self.all2all,
+                             synapse_type=sim.TsodyksMarkramSynapse(U=U, weight=weight))
+        assert_array_almost_equal(prj.get("U", format="array"), U)
+        assert_array_almost_equal(prj.get("weight", format="array"), weight)
+
+    def test_create_multapses_with_heterogeneous_synapse_parameters(self):
+        connections = [(0, 1, 0.1, 0.5, 0.1), (0, 1, 0.2, 0.5, 0.2),
+                       (3, 2, 0.3, 0.5, 0.3), (0, 1, 0.4, 0.5, 0.4)]
+        prj = sim.Projection(self.p1, self.p2,
+                             sim.FromListConnector(connections, column_names=["weight", "delay", "U"]),
+                             synapse_type=sim.TsodyksMarkramSynapse())
+        assert_array_almost_equal(sorted(prj.get(["weight", "U"], format="list", with_address=False)),
+                                  [(0.1, 0.1), (0.2, 0.2), (0.3, 0.3), (0.4, 0.4)])
+
+    def test_select_new_connections(self):
+        from pyNN.nest.projections import _select_new_connections
+        # connections (source, target, thread, synapse model, port); the last four are new
+        connections = [(1, 5, 0, 0, 0), (2, 5, 0, 0, 0), (1, 5, 0, 0, 1), (1, 6, 0, 0, 2),
+                       (1, 5, 0, 0, 3), (2, 6, 0, 0, 1), (3, 6, 0, 0, 0)]
+        sources = numpy.array([1, 2, 1, 1])
+        targets = numpy.array([5, 6, 6, 5])
+        assert_array_equal(_select_new_connections(connections, sources, targets),
+                           [(1, 5, 0, 0, 1), (1, 5, 0, 0, 3), (1, 6, 0, 0, 2), (2, 6, 0, 0, 1)])
+        self.assertRaises(errors.ConnectionError,
+                          _select_new_connections, connections[:2], sources, targets)
+
+    def test_create_with_native_rule(self):
+        prj = sim.Projection(self.p1, self.p2, sim.FixedNumberPreConnector(n=3),
+                             synapse_type=self.syn_rnd)
+        self.assertTrue(prj.connector._use_native_rule(prj))
+        self.assertEqual(len(prj), 3 * self.p2.size)
+        weights = numpy.array(prj.get("weight", format="list", with_address=False))
+        assert_array_almost_equal(weights, 0.123 * numpy.ones((len(prj),)))
+
+    def test_default_connector_uses_native_rule(self):
+        connector = sim.FixedProbabilityConnector(0.5)
+        prj = sim.Projection(self.p1, self.p2, connector, synapse_type=self.syn_rnd)
+        self.assertTrue(connector._use_native_rule(prj))
+        weights = numpy.array(prj.get("weight", format="list", with_address=False))
+        assert_array_almost_equal(weights, 0.123 * numpy.ones((len(prj),)))
+
+    def test_create_without_native_rule(self):
+        def connections():
+            sim.setup(native_connection_rules=False)
+            p1 = sim.Population(7, sim.IF_cond_exp())
+            p2 = sim.Population(4, sim.IF_cond_exp())
+            connector = sim.FixedProbabilityConnector(0.5, rng=sim.NumpyRNG(seed=9876))
+            prj = sim.Projection(p1, p2, connector, synapse_type=self.syn_rnd)
+            self.assertFalse(connector._use_native_rule(prj))
+            return sorted(prj.get("weight", format="list"))
+        self.assertEqual(connections(), connections())
 
     @unittest.skip("causes core dump with NEST master branch")
     def test_create_with_native_synapse(self):
@@ -198,5 +267,25 @@ class TestProjection(unittest.TestCase):
         self.assertEqual(intended_tau_minus, actual_tau_minus)
 
 
+@unittest.skipUnless(nest, "Requires NEST")
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        sim.setup()
+        self.spike_times = [[1.0, 5.0, 9.0], [], [2.0, 3.0], [4.0]]
+        self.p = sim.Population(4, sim.SpikeSourceArray(spike_times=self.spike_times))
+        self.p.record('spikes')
+        sim.run(10.0)
+
+    def test_get_spiketrains(self):
+        spiketrains = self.p.get_data().segments[0].spiketrains
+        for spiketrain, expected in zip(spiketrains, self.spike_times):
+            assert_array_almost_equal(spiketrain.magnitude, expected)
+
+    def test_get_spike_counts(self):
+        self.assertEqual(self.p.get_spike_counts(),
+                         dict((id, len(times)) for id, times in zip(self.p, self.spike_times)))
+
+
 if __name__ == '__main__':
     unittest.main()
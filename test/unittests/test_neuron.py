@@ -346,6 +346,28 @@ class TestProjection(unittest.TestCase):
         prj = sim.Projection(self.p1, self.p2, self.all2all,
                              synapse_type=sim.TsodyksMarkramSynapse())
 
+    def test_create_compact(self):
+        sim.setup(compact_connections=True)
+        p1 = sim.Population(7, sim.IF_cond_exp())
+        p2 = sim.Population(4, sim.IF_cond_exp())
+        prj = sim.Projection(p1, p2, self.all2all, self.syn2)
+        self.assertTrue(prj._compact)
+        self.assertEqual(len(prj), 28)
+        self.assertEqual(len(prj._connections.netcons), 28)
+        prj.set(weight=numpy.arange(28.0).reshape((7, 4)))
+        weights = prj.get("weight", format="array")
+        assert_array_almost_equal(weights, numpy.arange(28.0).reshape((7, 4)))
+        self.assertEqual(prj[5].weight, prj._connections.netcons[5].weight[0])
+        self.assertEqual(prj.get("delay", format="list")[0], (0, 0, 0.4))
+
+    def test_compact_not_used_for_plastic_synapses(self):
+        sim.setup(compact_connections=True)
+        p1 = sim.Population(7, sim.IF_cond_exp())
+        p2 = sim.Population(4, sim.IF_cond_exp())
+        prj = sim.Projection(p1, p2, self.all2all,
+                             synapse_type=sim.TsodyksMarkramSynapse())
+        self.assertFalse(prj._compact)
+
 
 @unittest.skipUnless(sim, "Requires NEURON")
 class TestCurrentSources(unittest.TestCase):
@@ -421,6 +443,20 @@ class TestRecorder(unittest.TestCase):
     #    assert_array_equal(numpy.array(gdata.analogsignals[1][:,0]),
     #                        cell._cell.gsyn_trace['inhibitory'])
     #
+    def test_batched_recording(self):
+        sim.setup(batched_recording=True)
+        p = sim.Population(3, sim.IF_cond_exp(i_offset=0.1))
+        p.record('v')
+        p[1:].record('gsyn_exc')
+        sim.run(10.0)
+        self.assertEqual(p.recorder._batches['v'].n_samples, 101)
+        self.assertEqual(p[0]._cell.traces, {})
+        data = p.get_data().segments[0]
+        self.assertEqual(data.filter(name='v')[0].shape, (101, 3))
+        self.assertEqual(data.filter(name='gsyn_exc')[0].shape, (101, 2))
+        assert_array_almost_equal(data.filter(name='v')[0].magnitude[0], p.initial_values['v'].evaluate())
+        sim.setup()
+
     def test__local_count(self):
         self.rec.recorded['spikes'] = self.cells
         self.cells[0]._cell.spike_times = h.Vector(numpy.arange(101.0, 111.0))
@@ -140,6 +140,41 @@ def test_columnwise_iteration_with_random_array_parallel_safe_with_mask():
     random.get_mpi_config = orig_get_mpi_config
 
 
+def test_blockwise_iteration_with_flat_array():
+    m = LazyArray(5, shape=(4, 3))  # 4 rows, 3 columns
+    blocks = [block for block in m.by_column_block(2)]
+    assert_equal(len(blocks), 2)
+    assert_array_equal(blocks[0][0], np.array([0, 1]))
+    assert_array_equal(blocks[1][0], np.array([2]))
+    assert_equal(blocks[0][1], 5)
+
+
+def test_blockwise_iteration_with_function_and_mask():
+    input = lambda i, j: 2 * i + j
+    m = LazyArray(input, shape=(4, 3))
+    mask = np.array([True, False, True])
+    blocks = [block for block in m.by_column_block(2, mask=mask)]
+    assert_equal(len(blocks), 1)
+    columns, block = blocks[0]
+    assert_array_equal(columns, np.array([0, 2]))
+    assert_array_equal(block, np.array([[0, 2], [2, 4], [4, 6], [6, 8]]))
+
+
+def test_blockwise_iteration_with_random_array_matches_columnwise():
+    orig_get_mpi_config = random.get_mpi_config
+    random.get_mpi_config = lambda: (0, 2)
+    mask = np.array([True, False, True, True, False])
+    m1 = LazyArray(random.RandomDistribution('uniform', (0, 1), rng=MockRNG(parallel_safe=True)),
+                   shape=(4, 5))
+    m2 = LazyArray(random.RandomDistribution('uniform', (0, 1), rng=MockRNG(parallel_safe=True)),
+                   shape=(4, 5))
+    cols = np.array([col for col in m1.by_column(mask=mask)]).T
+    blocks = [block for block in m2.by_column_block(2, mask=mask)]
+    assert_array_equal(np.hstack([columns for columns, block in blocks]), np.array([0, 2, 3]))
+    assert_array_equal(np.hstack([block for columns, block in blocks]), cols)
+    random.get_mpi_config = orig_get_mpi_config
+
+
 def test_evaluate_with_flat_array():
     m = LazyArray(5, shape=(4, 3))
     assert_array_equal(m.evaluate(), 5 * np.ones((4, 3)))
@@ -16,6 +16,9 @@ except NameError:
     basestring = str
 import numpy
 import sys
+import os
+import shutil
+import tempfile
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 import quantities as pq
 try:
@@ -121,7 +124,17 @@ class PopulationTest(unittest.TestCase):
         p = sim.Population(11, sim.IF_curr_alpha())
         self.assertRaises(ValueError, p.id_to_index, [p.first_id - 1] + p.all_cells[0:3].tolist())
 
-    #def test_id_to_local_index():
+    @register(exclude=['nest', 'neuron', 'brian', 'hardware.brainscales', 'spiNNaker'])
+    def test_id_to_local_index(self, sim=sim):
+        sim.simulator.state.num_processes = 2
+        sim.simulator.state.mpi_rank = 1
+        p = sim.Population(11, sim.IF_curr_alpha())
+        local_ids = p._all_ids[p._mask_local]
+        self.assertEqual(p.id_to_local_index(local_ids[2]), 2)
+        assert_array_equal(p.id_to_local_index(local_ids[::-1]), numpy.arange(local_ids.size)[::-1])
+        self.assertRaises(ValueError, p.id_to_local_index, p._all_ids[~p._mask_local][0])
+        sim.simulator.state.num_processes = 1
+        sim.simulator.state.mpi_rank = 0
 
     # test structure property
     @register()
@@ -217,6 +230,22 @@ class PopulationTest(unittest.TestCase):
         assert hasattr(itr, "next") or hasattr(itr, "__next__")
         self.assertEqual(len(list(itr)), 6)
 
+    def test_ids_created_lazily(self, sim=sim):
+        p = sim.Population(6, sim.IF_curr_exp())
+        pv = p[1:4]
+        self.assertIs(p._all_cells, None)
+        assert_array_equal(pv._all_ids, p._all_ids[1:4])
+        self.assertIsInstance(p[2], sim.simulator.ID)
+        self.assertIs(p[2].parent, p)
+        self.assertEqual(pv[1], p[2])
+        self.assertIs(pv[1].parent, p)
+        self.assertEqual([id.parent for id in p], [p] * 6)
+        self.assertIs(p._all_cells, None)
+        all_cells = p.all_cells
+        self.assertIs(p.all_cells, all_cells)
+        assert_array_equal(all_cells, p._all_ids)
+        self.assertIs(p[2], all_cells[2])
+
     @register()
     def test___add__two(self, sim=sim):
         # adding two populations should give an Assembly
@@ -549,6 +578,177 @@ class PopulationTest(unittest.TestCase):
         assert_array_equal(seg1.spiketrains[7],
                             numpy.array([p.first_id + 7, p.first_id + 7 + 5]) % t3)
 
+    @register(exclude=['hardware.brainscales'])
+    def test_get_data_as_arrays(self, sim=sim):
+        p = sim.Population(14, sim.EIF_cond_exp_isfa_ista())
+        p.record('v')
+        sim.run(12.3)
+        sim.reset()
+        p.record('spikes')
+        sim.run(14.5)
+        data = p.get_data(format='arrays')
+        block = p.get_data()
+        self.assertEqual(len(data), 2)
+        self.assertEqual(set(data[0]), set(['v']))
+        self.assertEqual(set(data[1]), set(['v', 'spikes']))
+        assert_array_equal(data[0]['v']['index'], numpy.arange(p.size))
+        assert_array_equal(data[0]['v']['signal'], block.segments[0].analogsignals[0].magnitude)
+        self.assertEqual(data[0]['v']['units'], 'mV')
+        spikes = data[1]['spikes']
+        assert_array_equal(spikes['index'], numpy.arange(p.size))
+        self.assertEqual(spikes['indptr'].size, p.size + 1)
+        for i, spiketrain in enumerate(block.segments[1].spiketrains):
+            assert_array_equal(spikes['times'][spikes['indptr'][i]:spikes['indptr'][i + 1]],
+                               spiketrain.magnitude)
+        self.assertEqual(spikes['t_stop'], 14.5)
+
+    @register()
+    def test_record_with_flush_interval(self, sim=sim):
+        from pyNN.recording.streaming import StreamReader
+        dirname = tempfile.mkdtemp()
+        try:
+            p = sim.Population(5, sim.IF_cond_alpha())
+            p.record(['v', 'spikes'], to_file=os.path.join(dirname, "stream"), flush_interval=5.0)
+            sim.run(12.0)
+            sim.reset()
+            sim.run(3.0)
+            sim.end()
+            reader = StreamReader(os.path.join(dirname, "stream"))
+            self.assertEqual([len(chunks) for chunks in reader.segments], [3, 1])
+            block = reader.read_block()
+            self.assertEqual(len(block.segments), 2)
+            signal = block.segments[0].filter(name='v')[0]
+            self.assertEqual(signal.shape, (121, 5))
+            self.assertEqual(signal.t_stop, 12.0 * pq.ms + signal.sampling_period)
+            assert_array_equal(signal.channel_index.channel_ids, numpy.arange(5))
+            self.assertEqual(len(block.segments[0].spiketrains), 5)
+            self.assertEqual(block.segments[0].spiketrains[0].t_stop, 12.0 * pq.ms)
+            self.assertEqual(block.segments[1].filter(name='v')[0].shape, (31, 5))
+            data = reader.read_arrays('spikes')
+            self.assertEqual(set(data[1]), set(['spikes']))
+        finally:
+            shutil.rmtree(dirname)
+
+    @register()
+    def test_record_with_reduce(self, sim=sim):
+        p = sim.Population(5, sim.IF_cond_alpha())
+        p.record('spikes', reduce='count')
+        p.record('spikes', reduce='rate')
+        p.record('spikes', reduce=('psth', 5.0))
+        p.record('v', reduce='mean')
+        p.record('v', reduce='var')
+        sim.run(10.0)
+        sim.run(10.0)
+        sim.reset()
+        sim.run(5.0)
+        data = p.get_statistics()
+        self.assertEqual(len(data), 2)
+        self.assertEqual(set(data[0]), set(['spikes', 'v']))
+        assert_array_equal(data[0]['spikes']['count'], 4 * numpy.ones((5,)))
+        assert_array_almost_equal(data[0]['spikes']['rate'], 200.0 * numpy.ones((5,)))
+        self.assertEqual(data[0]['spikes']['psth'].size, 4)
+        self.assertEqual(data[0]['spikes']['psth'].sum(), 20)
+        self.assertTrue(((data[0]['v']['mean'] > 0) & (data[0]['v']['mean'] < 1)).all())
+        self.assertTrue(((data[0]['v']['var'] > 0) & (data[0]['v']['var'] < 1)).all())
+        assert_array_equal(data[1]['spikes']['count'], 2 * numpy.ones((5,)))
+        assert_array_equal(p[1:3].get_statistics()[1]['spikes']['count'], [2, 2])
+
+    @register()
+    def test_record_with_reduce_mixed_with_full_recording(self, sim=sim):
+        p = sim.Population(5, sim.IF_cond_alpha())
+        p.record('v')
+        self.assertRaises(ValueError, p.record, 'spikes', reduce='count')
+
+    @register()
+    def test_record_with_invalid_reduce(self, sim=sim):
+        p = sim.Population(5, sim.IF_cond_alpha())
+        self.assertRaises(ValueError, p.record, 'v', reduce='spikes')
+        self.assertRaises(ValueError, p.record, 'v', reduce='count')
+        self.assertRaises(ValueError, p.record, 'spikes', reduce='mean')
+
+    @register()
+    def test_record_with_dtype_and_downsample(self, sim=sim):
+        p = sim.Population(3, sim.IF_cond_alpha())
+        p.record('v', dtype='float32', downsample=4)
+        sim.run(10.0)
+        signal = p.get_data().segments[0].analogsignals[0]
+        self.assertEqual(signal.dtype, numpy.float32)
+        self.assertEqual(signal.shape, (26, 3))
+        self.assertAlmostEqual(float(signal.sampling_period), 0.4)
+        data = p.get_data(format='arrays')
+        self.assertEqual(data[0]['v']['signal'].dtype, numpy.float32)
+        self.assertAlmostEqual(data[0]['v']['sampling_period'], 0.4)
+
+    @register()
+    def test_record_with_flush_interval_and_downsample(self, sim=sim):
+        from pyNN.recording.streaming import StreamReader
+        for downsample in (4, ('mean', 4)):
+            dirname = tempfile.mkdtemp()
+            try:
+                sim.setup(timestep=0.1)
+                p = sim.Population(3, sim.IF_cond_alpha())
+                p.record('v', to_file=os.path.join(dirname, "stream"), flush_interval=5.0,
+                         downsample=downsample)
+                sim.run(12.0)
+                sim.end()
+                reader = StreamReader(os.path.join(dirname, "stream"))
+                self.assertEqual(reader.read_arrays()[0]['v']['signal'].shape, (31, 3))
+                # the samples of each chunk follow on from those of the previous chunk
+                t_next = 0.0
+                for filename in reader.segments[0]:
+                    chunk = reader._read_chunk(filename, ['v'])['v']
+                    self.assertAlmostEqual(chunk['t_start'], t_next)
+                    self.assertAlmostEqual(chunk['sampling_period'], 0.4)
+                    t_next = chunk['t_start'] + chunk['signal'].shape[0] * chunk['sampling_period']
+                self.assertAlmostEqual(t_next, 12.4)
+            finally:
+                shutil.rmtree(dirname)
+
+    @register()
+    def test_write_data_by_rank(self, sim=sim):
+        from pyNN.recording.streaming import StreamReader
+        dirname = tempfile.mkdtemp()
+        try:
+            p = sim.Population(5, sim.IF_cond_alpha())
+            p.record(['v', 'spikes'])
+            sim.run(10.0)
+            p.write_data(os.path.join(dirname, "by_rank"), gather='by_rank',
+                         annotations={'script_name': "test"})
+            block = StreamReader(os.path.join(dirname, "by_rank")).read_block()
+            expected = p.get_data()
+            self.assertEqual(block.annotations['script_name'], "test")
+            self.assertEqual(block.segments[0].filter(name='v')[0].shape,
+                             expected.segments[0].filter(name='v')[0].shape)
+            self.assertEqual(len(block.segments[0].spiketrains), 5)
+        finally:
+            shutil.rmtree(dirname)
+
+    @register()
+    def test_write_data_as_shards(self, sim=sim):
+        from pyNN.recording.streaming import StreamReader
+        dirname = tempfile.mkdtemp()
+        try:
+            p = sim.Population(5, sim.IF_cond_alpha())
+            p.record(['v', 'spikes'])
+            sim.run(10.0)
+            sim.reset()
+            sim.run(5.0)
+            p.write_data(os.path.join(dirname, "shards"), gather='shards')
+            reader = StreamReader(os.path.join(dirname, "shards"))
+            self.assertEqual(reader.metadata['segments'], 2)
+            self.assertEqual(reader.metadata['shards'][0]['files'],
+                             ["segment000_rank0000.npz", "segment001_rank0000.npz"])
+            self.assertEqual(reader.metadata['shards'][0]['index_ranges'][0]['v'], [0, 4])
+            block = reader.read_block()
+            self.assertEqual(len(block.segments), 2)
+            self.assertEqual(block.segments[1].filter(name='v')[0].shape, (51, 5))
+            data = reader.read_arrays('spikes', indices=[1, 3])
+            assert_array_equal(data[0]['spikes']['index'], [1, 3])
+            self.assertEqual(data[0]['spikes']['times'].size, 4)
+            self.assertEqual(reader.read_arrays(indices=[7]), [{}, {}])
+        finally:
+            shutil.rmtree(dirname)
+
     #def test_get_data_no_gather(self, sim=sim):
     #    self.fail()
 
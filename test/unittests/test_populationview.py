@@ -132,11 +132,19 @@ class PopulationViewTest(unittest.TestCase):
         self.assertRaises(IndexError, pv.id_to_index, p[0])
         self.assertRaises(IndexError, pv.id_to_index, p[9])
 
-#    def test_id_to_index_with_invalid_ids(self, sim=sim):
-#        p = sim.Population(11, sim.IF_curr_alpha())
-#        pv = p[2, 5, 7, 8]
-#        self.assertRaises(IndexError, pv.id_to_index, p.all_cells[[2, 5, 6]])
-# currently failing
+    @register()
+    def test_id_to_index_with_invalid_ids(self, sim=sim):
+        p = sim.Population(11, sim.IF_curr_alpha())
+        pv = p[2, 5, 7, 8]
+        self.assertRaises(IndexError, pv.id_to_index, p.all_cells[[2, 5, 6]])
+
+    @register()
+    def test_id_to_index_unsorted(self, sim=sim):
+        p = sim.Population(11, sim.IF_curr_alpha())
+        pv = p[[8, 2, 7, 5]]
+        self.assertEqual(pv.id_to_index(p[7]), 2)
+        assert_array_equal(pv.id_to_index(p.all_cells[[5, 8, 2]]), [3, 0, 1])
+        self.assertRaises(IndexError, pv.id_to_index, p.all_cells[[2, 6]])
 
     ##def test_id_to_local_index():
 
@@ -597,6 +605,22 @@ class PopulationViewTest(unittest.TestCase):
         assert_array_equal(pv1.index_in_grandparent([2, 4, 6]), numpy.array([3, 6, 9]))
         assert_array_equal(pv2.index_in_grandparent([0, 1, 3]), numpy.array([3, 4, 9]))
 
+    @register()
+    def test_nested_views(self, sim=sim):
+        p = sim.Population(100, sim.IF_cond_exp(tau_m=lambda i: 10.0 + i))
+        p.positions = numpy.arange(300).reshape((3, 100))
+        mask = numpy.zeros((40,), bool)
+        mask[[1, 4, 7]] = True
+        pv = p[::2][10:50][mask]
+        self.assertIs(pv.grandparent, p)
+        assert_array_equal(pv.index_in_grandparent(numpy.arange(3)), [22, 28, 34])
+        assert_array_equal(pv.all_cells, p.all_cells[[22, 28, 34]])
+        assert_array_equal(pv.positions, p.positions[:, [22, 28, 34]])
+        self.assertEqual(pv[1], p[28])
+        assert_array_equal(pv.get('tau_m'), [32.0, 38.0, 44.0])
+        pv.set(tau_m=5.0)
+        assert_array_equal(p.get('tau_m')[[21, 22, 28]], [31.0, 5.0, 5.0])
+
     @register()
     def test_save_positions(self, sim=sim):
         import os
@@ -201,6 +201,49 @@ class ProjectionTest(unittest.TestCase):
         weights = prj.get("weight", format="array", gather=False, multiple_synapses='min')
         assert_array_equal(weights, target)
 
+    @register()
+    def test_get_weights_as_array_with_multapses_last(self, sim=sim):
+        prj = sim.Projection(self.p2, self.p3, sim.FromListConnector([(0, 1, 0.1, 0.5),
+                                                                      (0, 1, 0.3, 0.5),
+                                                                      (0, 1, 0.2, 0.5),
+                                                                      (2, 3, 0.4, 0.5)]),
+                             self.syn1)
+        target = numpy.nan * numpy.ones((self.p2.size, self.p3.size))
+        target[2, 3] = 0.4
+        for multiple_synapses, value in [('first', 0.1), ('last', 0.2), ('max', 0.3), ('min', 0.1)]:
+            target[0, 1] = value
+            weights = prj.get("weight", format="array", gather=False,
+                              multiple_synapses=multiple_synapses)
+            assert_array_equal(weights, target)
+
+    @register()
+    def test_get_weights_and_delays_as_structured(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all, synapse_type=self.syn2)
+        values = prj.get(["weight", "delay"], format="structured", gather=False)
+        self.assertEqual(values.dtype.names,
+                         ("presynaptic_index", "postsynaptic_index", "weight", "delay"))
+        self.assertEqual(values.size, self.p1.size * self.p2.size)
+        assert_array_equal(numpy.sort(values["presynaptic_index"][values["postsynaptic_index"] == 0]),
+                           numpy.arange(self.p1.size))
+        assert_array_equal(values["weight"], 0.007)
+        assert_array_equal(values["delay"], 0.4)
+        values = prj.get("weight", format="structured", gather=False, with_address=False)
+        self.assertEqual(values.dtype.names, ("weight",))
+
+    @register()
+    def test_get_weights_and_delays_as_sparse(self, sim=sim):
+        prj = sim.Projection(self.p2, self.p3, sim.FromListConnector([(0, 1, 0.1, 0.5),
+                                                                      (0, 1, 0.3, 0.5),
+                                                                      (2, 3, 0.0, 0.7)]),
+                             self.syn1)
+        weights, delays = prj.get(["weight", "delay"], format="sparse", gather=False)
+        self.assertEqual(weights.shape, (self.p2.size, self.p3.size))
+        self.assertEqual(weights.nnz, 2)  # the zero weight is stored explicitly
+        self.assertAlmostEqual(weights[0, 1], 0.4)
+        self.assertEqual(delays[2, 3], 0.7)
+        weights = prj.get("weight", format="sparse", gather=False, multiple_synapses="max")
+        self.assertEqual(weights[0, 1], 0.3)
+
     @register()
     def test_synapse_with_lambda_parameter(self, sim=sim):
         syn = sim.StaticSynapse(weight=lambda d: 0.01 + 0.001 * d)
@@ -261,6 +304,35 @@ class ProjectionTest(unittest.TestCase):
         assert os.path.exists(filename)
         os.remove(filename)
 
+    @register()
+    def test_save_sparse(self, sim=sim):
+        filename = "test.connections.sparse"
+        if os.path.exists(filename):
+            os.remove(filename)
+        prj = sim.Projection(self.p1, self.p2, connector=self.random_connect, synapse_type=self.syn2)
+        prj.save(["weight", "delay"], filename, format="sparse", gather=True)
+        prj2 = sim.Projection(self.p1, self.p2, sim.FromFileConnector(filename), self.syn1)
+        assert_array_equal(prj2.get(["weight", "delay"], format="array", gather=False),
+                           prj.get(["weight", "delay"], format="array", gather=False))
+        with open(filename) as f:
+            self.assertIn("# shape = (7, 4)", f.read())
+        os.remove(filename)
+
+    @register()
+    def test_save_sparse_with_multapses(self, sim=sim):
+        filename = "test.connections.sparse"
+        if os.path.exists(filename):
+            os.remove(filename)
+        C = sim.FixedNumberPreConnector(n=7, rng=MockRNG(delta=1))
+        prj = sim.Projection(self.p2, self.p3, C, synapse_type=self.syn2)
+        prj.save(["weight", "delay"], filename, format="sparse", gather=True)
+        prj2 = sim.Projection(self.p2, self.p3, sim.FromFileConnector(filename), self.syn1)
+        self.assertEqual(len(prj2), len(prj))
+        connections = sorted(prj.get(["weight", "delay"], format="list", gather=False))
+        assert_array_almost_equal(numpy.array(sorted(prj2.get(["weight", "delay"], format="list", gather=False))),
+                                  numpy.array(connections))
+        os.remove(filename)
+
     #def test_print_weights_as_list(self, sim=sim):
     #    filename = "test.weights"
     #    if os.path.exists(filename):
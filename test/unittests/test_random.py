@@ -31,6 +31,8 @@ class SimpleTests(unittest.TestCase):
 
     def setUp(self):
         self.rnglist = [random.NumpyRNG(seed=987)]
+        if random.have_philox:
+            self.rnglist.append(random.PhiloxRNG(seed=876))
         for rng in self.rnglist:
             rng.mpi_rank = 0; rng.num_processes = 1
         if random.have_gsl:
@@ -73,6 +75,8 @@ class ParallelTests(unittest.TestCase):
 
     def setUp(self):
         self.rng_types = [random.NumpyRNG]
+        if random.have_philox:
+            self.rng_types.append(random.PhiloxRNG)
         if random.have_gsl:
             self.rng_types.append(random.GSLRNG)
         if have_nrn:
@@ -132,6 +136,46 @@ class ParallelTests(unittest.TestCase):
         assert_arrays_almost_equal(perm0, perm1, 1e-99)
 
 
+@unittest.skipUnless(random.have_philox, "Requires numpy.random.Philox")
+class SplittableRNGTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.PhiloxRNG(seed=246)
+
+    def test_next_by_column_shape(self):
+        stream = self.rng.split()
+        values = self.rng.next_by_column(4, [0, 2, 7], 'uniform', {'low': 0, 'high': 1}, stream)
+        self.assertEqual(values.shape, (4, 3))
+        values = self.rng.next_by_column(numpy.array([2, 0, 3]), [0, 2, 7], 'normal',
+                                         {'mu': 0, 'sigma': 1}, stream)
+        self.assertEqual(values.shape, (5,))
+
+    def test_columns_are_independent_of_selection(self):
+        stream = self.rng.split()
+        all_columns = self.rng.next_by_column(5, numpy.arange(6), stream=stream)
+        some_columns = self.rng.next_by_column(5, [1, 4], stream=stream)
+        assert_arrays_almost_equal(all_columns[:, [1, 4]], some_columns, 1e-99)
+        fewer_values = self.rng.next_by_column(numpy.array([2, 3]), [1, 4], stream=stream)
+        assert_arrays_almost_equal(fewer_values, numpy.hstack((all_columns[:2, 1], all_columns[:3, 4])), 1e-99)
+
+    def test_split_gives_different_streams(self):
+        values1 = self.rng.next_by_column(5, [0], stream=self.rng.split())
+        values2 = self.rng.next_by_column(5, [0], stream=self.rng.split())
+        self.assertNotEqual(values1.tolist(), values2.tolist())
+
+    def test_same_seed_same_streams(self):
+        other_rng = random.PhiloxRNG(seed=246)
+        values1 = self.rng.next_by_column(5, [3, 4], stream=self.rng.split())
+        values2 = other_rng.next_by_column(5, [3, 4], stream=other_rng.split())
+        assert_arrays_almost_equal(values1, values2, 1e-99)
+
+    def test_random_distribution(self):
+        rd = random.RandomDistribution('uniform_int', (0, 10), rng=self.rng)
+        values = rd.next_by_column(3, [1, 2])
+        self.assertEqual(values.shape, (3, 2))
+        self.assertTrue(((values >= 0) & (values < 10)).all())
+
+
 class NativeRNGTests(unittest.TestCase):
 
     def test_create(self):
@@ -1,14 +1,16 @@
 from pyNN import recording, errors
+from pyNN.recording import streaming
 from nose.tools import assert_equal, assert_raises
 try:
-    from unittest.mock import Mock
+    from unittest.mock import Mock, patch
 except ImportError:
-    from mock import Mock
+    from mock import Mock, patch
 import numpy
+import quantities as pq
 import os
 from datetime import datetime
 from collections import defaultdict
-from pyNN.utility import assert_arrays_equal
+from pyNN.utility import assert_arrays_equal, assert_arrays_almost_equal
 
 #def test_rename_existing():
     
@@ -43,6 +45,7 @@ class MockState(object):
         self.running = True
         self.recorders = set([])
         self.t = 0.0
+        self.cache_memory_limit = None
 
 
 class MockSimulator(object):
@@ -198,3 +201,197 @@ def test_metadata_property():
 
 #def test_count__other():
 
+
+def test_downsample_signal():
+    signal = numpy.arange(10.0).reshape((5, 2))
+    assert_arrays_equal(recording.downsample_signal(signal, 2),
+                        numpy.array([[0.0, 1.0], [4.0, 5.0], [8.0, 9.0]]))
+    assert_arrays_equal(recording.downsample_signal(signal, 2, 'mean'),
+                        numpy.array([[1.0, 2.0], [5.0, 6.0], [8.0, 9.0]]))
+
+
+class ContiguousType(object):
+    """Stands in for an MPI datatype made of `size` bytes."""
+
+    def __init__(self, size=1):
+        self.size = size
+        self.committed = False
+
+    def Create_contiguous(self, count):
+        return ContiguousType(self.size * count)
+
+    def Commit(self):
+        self.committed = True
+        return self
+
+    def Free(self):
+        self.committed = False
+
+
+class SingleProcessComm(object):
+    """Stands in for an MPI communicator when there is only one process."""
+    rank = 0
+    size = 1
+
+    def allgather(self, obj):
+        return [obj]
+
+    def gather(self, obj, root=0):
+        return [obj]
+
+    def Gatherv(self, send_buffer, receive_buffer, root=0):
+        buffer, count, datatype = send_buffer
+        assert datatype.committed
+        # counts and displacements are in records, not in bytes
+        assert_equal(count * datatype.size, buffer.size)
+        (counts, displacements), receive_type = receive_buffer[1:]
+        assert_equal(counts, [count])
+        assert_equal(displacements, [0])
+        receive_buffer[0][:] = buffer
+
+
+def test_gather_structured():
+    data = numpy.zeros((3,), dtype=[('index', numpy.int64), ('signal', numpy.float32, (5,))])
+    data['index'] = [4, 2, 7]
+    data['signal'] = numpy.arange(15).reshape((3, 5))
+    with patch("pyNN.recording.get_mpi_comm", lambda: (SingleProcessComm(), {'BYTE': ContiguousType()})):
+        gathered = recording.gather_structured(data)
+    assert_arrays_equal(gathered['index'], data['index'])
+    assert_arrays_equal(gathered['signal'], data['signal'])
+
+
+def test_gather_blocks():
+    import pyNN.mock as sim
+    sim.setup()
+    p = sim.Population(4, sim.IF_cond_exp())
+    p.record(['spikes', 'v'], dtype='float32')
+    sim.run(10.0)
+    block = p.get_data()
+    spiketimes = [st.magnitude.copy() for st in block.segments[0].spiketrains]
+    v = block.segments[0].filter(name='v')[0].magnitude.copy()
+    block.segments[0].spiketrains.reverse()
+    with patch("pyNN.recording.get_mpi_comm", lambda: (SingleProcessComm(), {'BYTE': ContiguousType()})):
+        gathered = recording.gather_blocks(block)
+    segment = gathered.segments[0]
+    assert_equal([st.annotations['source_index'] for st in segment.spiketrains], [0, 1, 2, 3])
+    for st, times in zip(segment.spiketrains, spiketimes):
+        assert_arrays_equal(st.magnitude, times)
+    signal = segment.filter(name='v')[0]
+    assert_equal(signal.dtype, numpy.float32)
+    assert_arrays_equal(signal.magnitude, v)
+    assert_arrays_equal(signal.channel_index.channel_ids, numpy.arange(4))
+    assert_equal(len(gathered.channel_indexes), 1)
+    sim.end()
+
+
+class RaggedComm(SingleProcessComm):
+    """Pretends that another node recorded two more samples of each signal."""
+
+    def allgather(self, obj):
+        other = dict((variable, dict(header, n_samples=header['n_samples'] + 2))
+                     for variable, header in obj.items() if 'n_samples' in header)
+        return [obj, other]
+
+
+def test_gather_blocks_pads_shorter_signals():
+    import pyNN.mock as sim
+    sim.setup()
+    p = sim.Population(2, sim.IF_cond_exp())
+    p.record('v')
+    sim.run(1.0)
+    block = p.get_data()
+    v = block.segments[0].filter(name='v')[0].magnitude.copy()
+    with patch("pyNN.recording.get_mpi_comm", lambda: (RaggedComm(), {'BYTE': ContiguousType()})):
+        gathered = recording.gather_blocks(block)
+    signal = gathered.segments[0].filter(name='v')[0].magnitude
+    assert_equal(signal.shape, (v.shape[0] + 2, 2))
+    assert_arrays_equal(signal[:-2], v)
+    assert numpy.isnan(signal[-2:]).all()
+    sim.end()
+
+
+class MessageQueue(object):
+    """Stands in for a pair of MPI communicators exchanging point-to-point messages."""
+    rank = 0
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, obj, dest):
+        self.messages.append(obj)
+
+    def recv(self, source):
+        return self.messages.pop(0)
+
+    def Send(self, buffer, dest):
+        assert buffer[0].size <= streaming.MAX_MESSAGE_SIZE
+        self.messages.append(buffer[0].copy())
+
+    def Recv(self, buffer, source):
+        buffer[0][:] = self.messages.pop(0)
+
+
+def test_send_and_recv_arrays():
+    segments = [{'spikes': {'index': numpy.array([1, 3]), 'indptr': numpy.array([0, 2, 3]),
+                            'times': numpy.array([1.5, 2.5, 0.5]), 't_start': 0.0, 't_stop': 5.0},
+                 'v': {'index': numpy.array([1, 3]), 'signal': numpy.arange(6, dtype='float32').reshape((3, 2)),
+                       't_start': 0.0, 'sampling_period': 0.1, 'units': 'mV'}},
+                {}]
+    comm = MessageQueue()
+    with patch("pyNN.recording.streaming.MAX_MESSAGE_SIZE", 8):
+        streaming.send_arrays(comm, {'BYTE': None}, segments, dest=0)
+        received = streaming.recv_arrays(comm, {'BYTE': None}, source=1)
+    assert_equal(comm.messages, [])
+    assert_equal(len(received), 2)
+    assert_equal(received[1], {})
+    for variable in ('spikes', 'v'):
+        assert_equal(set(received[0][variable]), set(segments[0][variable]))
+        for key, value in segments[0][variable].items():
+            if isinstance(value, numpy.ndarray):
+                assert_equal(received[0][variable][key].dtype, value.dtype)
+                assert_arrays_equal(received[0][variable][key], value)
+            else:
+                assert_equal(received[0][variable][key], value)
+
+
+def test_SignalMean_with_cells_recorded_for_different_times():
+    from pyNN.recording.reducers import SignalMean, SignalVariance
+    mask = numpy.ones((3,), dtype=bool)
+    signal = numpy.arange(30.0).reshape((10, 3)) ** 2
+    mean, variance = SignalMean(3, mask), SignalVariance(3, mask)
+    for reducer in (mean, variance):
+        # cell 2 is only recorded from the second chunk onwards
+        reducer.update({'index': numpy.array([0, 1]), 'signal': signal[:4, :2]})
+        reducer.update({'index': numpy.array([0, 1, 2]), 'signal': signal[4:]})
+    expected_mean = [signal[:, 0].mean(), signal[:, 1].mean(), signal[4:, 2].mean()]
+    expected_variance = [signal[:, 0].var(), signal[:, 1].var(), signal[4:, 2].var()]
+    assert_arrays_almost_equal(mean.result(), numpy.array(expected_mean), 1e-9)
+    assert_arrays_almost_equal(variance.result(), numpy.array(expected_variance), 1e-9)
+
+
+def test_DataCache_spills_to_disk():
+    import neo
+    segments = []
+    for i in range(3):
+        segment = neo.Segment(name="segment%03d" % i)
+        segment.analogsignals.append(neo.AnalogSignal(numpy.ones((100, 2)) * i, units='mV',
+                                                      sampling_rate=10.0 * pq.kHz))
+        segments.append(segment)
+    cache = recording.DataCache(memory_limit=4000)
+    for segment in segments:
+        cache.store(segment)
+    assert_equal(len(cache), 3)
+    assert_equal(list(cache._in_memory), [1, 2])
+    assert isinstance(cache._data[0], str)
+    loaded = list(cache)
+    assert_equal([segment.name for segment in loaded], ["segment000", "segment001", "segment002"])
+    assert_arrays_equal(loaded[0].analogsignals[0].magnitude, numpy.zeros((100, 2)))
+    assert_equal(list(cache._in_memory), [1, 2])
+    # segments already on disk are not written again when evicted
+    with patch("pyNN.recording.pickle.dump") as dump:
+        loaded = list(cache)
+    assert_equal(dump.call_count, 0)
+    assert_equal(sorted(os.listdir(cache._dir)), ["segment000000.pkl", "segment000001.pkl", "segment000002.pkl"])
+    cache_dir = cache._dir
+    cache.clear()
+    assert not os.path.exists(cache_dir)
@@ -131,6 +131,19 @@ class TestSimulationControl(unittest.TestCase):
             for i in range(num_callbacks)))
         
         sim.end()
+
+    @register(exclude=['hardware.brainscales'])
+    def test_callbacks_as_tuple(self, sim=sim):
+        call_times = []
+
+        def callback(time):
+            call_times.append(time)
+            return time + 10.0
+
+        sim.setup(timestep=0.1, min_delay=0.1, **self.extra)
+        sim.run_until(30.0, callbacks=(callback,))
+        self.assertEqual(len(call_times), 4)
+        sim.end()
     
     @unittest.skipUnless(MPI, "test requires mpi4py")
     def test_num_processes(self, sim=sim):
@@ -94,6 +94,29 @@ class SpaceTest(unittest.TestCase):
                                          (sqrt(3), sqrt(12), 0.0, sqrt(50.0)),
                                          (sqrt(29), sqrt(14), sqrt(50.0), 0.0)]))
 
+    def test_generator_with_paired_indices(self):
+        s = space.Space()
+        f = lambda i: self.ABCD[i]
+        g = lambda j: self.ABCD[j]
+        self.assertArraysEqual(s.distance_generator(f, g)(numpy.array([0, 1, 3]), numpy.array([1, 2, 3])),
+                               numpy.array([sqrt(3), sqrt(12), 0.0]))
+
+    def test_pairs_within_distance(self):
+        s = space.Space()
+        i, j, d = s.pairs_within_distance(self.ABCD, self.ABCD, 2.0)
+        self.assertArraysEqual(i, numpy.array([0, 1, 2, 0, 1, 0, 2, 3]))
+        self.assertArraysEqual(j, numpy.array([0, 0, 0, 1, 1, 2, 2, 3]))
+        self.assertArraysEqual(d, numpy.array([0.0, sqrt(3), sqrt(3), sqrt(3), 0.0, sqrt(3), 0.0, 0.0]))
+
+    def test_pairs_within_distance_with_periodic_boundaries(self):
+        s = space.Space(periodic_boundaries=((-1.0, 4.0), (-1.0, 4.0), (-1.0, 4.0)))
+        i, j, d = s.pairs_within_distance(self.ABCD, self.ABCD, 3.0)
+        D = s.distances(self.ABCD, self.ABCD).reshape((4, 4))
+        jj, ii = (D.T <= 3.0).nonzero()
+        self.assertArraysEqual(i, ii)
+        self.assertArraysEqual(j, jj)
+        self.assertArraysEqual(d, D[ii, jj])
+
     def test_infinite_space_with_collapsed_axes(self):
         s_x = space.Space(axes='x')
         s_xy = space.Space(axes='xy')
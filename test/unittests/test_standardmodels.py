@@ -1,4 +1,4 @@
-from pyNN.standardmodels import build_translations, StandardModelType, \
+from pyNN.standardmodels import build_translations, compile_transform, StandardModelType, \
                                 STDPWeightDependence, STDPTimingDependence
 from pyNN.standardmodels.synapses import StaticSynapse, STDPMechanism
 from pyNN import errors
@@ -110,6 +110,65 @@ def test_translate_with_divide_by_zero_error():
                   simplify=True)
 
 
+def test_compile_transform():
+    assert_equal(compile_transform('a'), ('identity', 'a'))
+    kind, (name, op, factor) = compile_transform('float(1000)*b')
+    assert_equal((kind, name, factor), ('scale', 'b', 1000.0))
+    kind, (name, op, factor) = compile_transform('B/float(1000)')
+    assert_equal((kind, name, factor), ('scale', 'B', 1000.0))
+    assert_equal(compile_transform('c + a')[0], 'expression')
+    assert compile_transform('c + a') is compile_transform('c + a')
+
+
+def test_translate_does_not_evaluate_or_copy():
+    M = StandardModelType
+    M.default_parameters = {'a': 22.2, 'b': 33.3, 'c': 44.4}
+    M.translations = build_translations(
+            ('a', 'A'),
+            ('b', 'B', 1000.0),
+            ('c', 'C', 'c + a', 'C - A'),
+        )
+    m = M()
+    a = numpy.array([1.0, 2.0, 3.0])
+    calls = []
+
+    def b(i):
+        calls.append(i)
+        return 0.5 * i
+    parameters = ParameterSpace({'a': a, 'b': b, 'c': 45.6}, m.get_schema(), (3,))
+    native_parameters = m.translate(parameters)
+    assert native_parameters['A'].base_value is a
+    assert native_parameters['B'].base_value is b
+    assert_equal(calls, [])
+    native_parameters['A'][1] = 7.0  # should not modify the original array
+    assert_equal(a[1], 2.0)
+    assert_equal(list(_parameter_space_to_dict(native_parameters, 3)['B']), [0.0, 500.0, 1000.0])
+
+
+def test_modifying_translated_values_does_not_modify_original():
+    M = StandardModelType
+    M.default_parameters = {'a': 22.2, 'b': 33.3}
+    M.translations = build_translations(
+            ('a', 'A'),
+            ('b', 'B', 1000.0),
+        )
+    m = M()
+    a = numpy.array([1.0, 2.0, 3.0])
+    parameters = ParameterSpace({'a': a, 'b': 33.3}, m.get_schema(), (3,))
+    native_parameters = m.translate(parameters)
+    native_parameters.evaluate()
+    native_parameters['A'] *= 2
+    assert_equal(list(a), [1.0, 2.0, 3.0])
+    parameters.evaluate()
+    assert_equal(list(parameters['a']), [1.0, 2.0, 3.0])
+    parameters['a'] *= 3
+    assert_equal(list(native_parameters['A']), [2.0, 4.0, 6.0])
+    # evaluating part of the array must not return a view of the original either
+    view = m.translate(ParameterSpace({'a': a, 'b': 33.3}, m.get_schema(), (3,)))['A'][1:]
+    view *= 2
+    assert_equal(list(a), [1.0, 2.0, 3.0])
+
+
 def test_reverse_translate():
     M = StandardModelType
     M.default_parameters = {'a': 22.2, 'b': 33.3, 'c': 44.4}